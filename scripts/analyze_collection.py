@@ -8,13 +8,14 @@ and charts (using ASCII art and Mermaid diagrams for web viewing).
 
 import os
 import sys
-import yaml
 import argparse
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from collections import Counter, defaultdict
 
+from paper_store import PaperStore
+
 
 class CollectionAnalyzer:
     """Analyze and visualize paper collection data."""
@@ -28,11 +29,9 @@ class CollectionAnalyzer:
         """
         self.papers_yaml_path = papers_yaml_path
 
-        with open(papers_yaml_path, 'r', encoding='utf-8') as f:
-            self.data = yaml.safe_load(f)
-
-        self.papers = self.data.get('papers', [])
-        self.categories = self.data.get('categories', [])
+        with PaperStore(papers_yaml_path) as store:
+            self.papers = store.get_records()
+            self.categories = store.get_categories()
 
     def _create_bar_chart(self, data: Dict[str, int], title: str,
                          max_width: int = 50, top_n: int = 10) -> str:
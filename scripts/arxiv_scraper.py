@@ -2,24 +2,67 @@
 """
 arXiv Paper Scraper
 Fetches papers from arXiv based on categories and keywords
+
+By default each category is queried incrementally from a persisted cursor
+(see scraper_cursor.py), so a daily run only fetches papers submitted since
+the previous run. If a category has more new papers than its quota, the
+oldest are fetched and the rest wait for the next run. --ignore-cursor
+queries the plain --days window instead.
+
+Categories are fetched concurrently, one paged query each with its own
+quota, through a rate limiter shared by all clients; results are merged by
+arXiv ID. --fetch-mode combined runs the old single OR query instead.
+
+In the default keywords query mode, the research keywords are compiled into
+ti:/abs: clauses (split into several sub-queries to keep each query short)
+and the results unioned, so arXiv only returns papers that can match.
+--query-mode broad fetches whole categories, e.g. to check filter recall.
+
+Result pages are prefetched on a background thread (see prefetch.py): the
+next page is requested as soon as the rate limiter allows while the
+current one is converted, and every page's latency and size is logged.
+
+Papers already handled by an earlier run (see seen_set.py) are dropped
+before the candidates are written, so they never reach the filter, LLM or
+TTS stages again. --include-seen keeps them.
 """
 
 import arxiv
-import yaml
-import json
 import os
-from datetime import datetime, timedelta
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 import argparse
+import sys
 import time
 
+from http_cache import CACHE_MODES, install_cache
+from http_transport import ARXIV_REQUEST_INTERVAL, RateLimiter, RateLimitedAdapter, TransferStats
+from paper_store import PaperStore
+from pipeline_io import CANDIDATES_PATH, RecordWriter
+from prefetch import prefetch
+from scraper_backfill import (DEFAULT_BACKFILL_DIR, DEFAULT_PARTITION_MAX, PARTITION_SIZES,
+                              parse_day, run_backfill)
+from scraper_cursor import ScraperCursor, DEFAULT_CURSOR_PATH, DEFAULT_OVERLAP_HOURS
+from seen_set import SeenSet, DEFAULT_SEEN_PATH
+
+
+FETCH_MODES = ("per-category", "combined")
+QUERY_MODES = ("keywords", "broad")
+
+# Longest keyword clause appended to one query (longer lists are split)
+MAX_KEYWORD_CLAUSE_CHARS = 300
+
 
 class ArxivScraper:
     """Scrape papers from arXiv API"""
 
-    def __init__(self, config_path: str = "data/papers/papers.yaml"):
+    def __init__(self, config_path: str = "data/papers/papers.yaml", query_mode: str = "keywords",
+                 http_cache: Optional[str] = None):
         """Initialize scraper with configuration"""
         self.config_path = config_path
+        self.query_mode = query_mode
+        self.http_cache = http_cache  # see http_cache.py (None: PAPER_HTTP_CACHE)
         self.config = self.load_config()
 
         # Research keywords from your requirements
@@ -49,144 +92,477 @@ class ArxivScraper:
     def load_config(self) -> Dict:
         """Load configuration from YAML file"""
         if os.path.exists(self.config_path):
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            with PaperStore(self.config_path) as store:
+                return {
+                    'metadata': store.get_metadata(),
+                    'automation': store.get_section('automation', {}),
+                }
         return {}
 
-    def build_query(self, days_back: int = 7) -> str:
-        """Build arXiv query string with date constraint"""
+    def keyword_clauses(self) -> List[str]:
+        """
+        Compile the research keywords into title/abstract clauses
+
+        Returns:
+            Clauses like (ti:"nerf" OR abs:"nerf" OR ...), each at most
+            MAX_KEYWORD_CLAUSE_CHARS long; together they cover all keywords
+        """
+        terms = [f'ti:"{k}" OR abs:"{k}"' for k in (kw.replace('"', '') for kw in self.keywords)]
+        if not terms:
+            return []
+
+        # Fewest, evenly sized clauses that each fit the length limit
+        for count in range(1, len(terms) + 1):
+            size = -(-len(terms) // count)  # ceil
+            clauses = [f"({' OR '.join(terms[i:i + size])})" for i in range(0, len(terms), size)]
+            if all(len(clause) <= MAX_KEYWORD_CLAUSE_CHARS for clause in clauses):
+                return clauses
+        return [f"({term})" for term in terms]
+
+    def build_queries(self, days_back: int = 7, category: Optional[str] = None,
+                      start: Optional[datetime] = None,
+                      end: Optional[datetime] = None) -> List[str]:
+        """Queries whose union covers one fetch (several in keywords mode)"""
+        if self.query_mode == "broad":
+            return [self.build_query(days_back, category, start, end=end)]
+        return [self.build_query(days_back, category, start, clause, end)
+                for clause in self.keyword_clauses()]
+
+    def build_query(self, days_back: int = 7, category: Optional[str] = None,
+                    start: Optional[datetime] = None,
+                    keyword_clause: Optional[str] = None,
+                    end: Optional[datetime] = None) -> str:
+        """
+        Build arXiv query string with date constraint
+
+        Args:
+            days_back: Window size when no start time is given
+            category: Query a single category (default: all categories)
+            start: Exact start of the submittedDate range (UTC, minute precision)
+            keyword_clause: Extra clause the papers must match (see keyword_clauses)
+            end: Last day of the range (default: today)
+        """
         # Build category query
-        category_queries = [f"cat:{cat}" for cat in self.categories]
+        categories = [category] if category else self.categories
+        category_queries = [f"cat:{cat}" for cat in categories]
         category_str = " OR ".join(category_queries)
 
         # Important: Use submittedDate in query for better filtering
-        # arXiv format: YYYYMMDD0000 to YYYYMMDD2359
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days_back)
+        # arXiv format: YYYYMMDDHHMM (GMT), e.g. YYYYMMDD0000 to YYYYMMDD2359
+        end_date = end or datetime.now(timezone.utc)
+        if start is not None:
+            start_str = start.astimezone(timezone.utc).strftime("%Y%m%d%H%M")
+        else:
+            start_date = end_date - timedelta(days=days_back)
+            start_str = start_date.strftime("%Y%m%d") + "0000"
 
         # Format dates for arXiv API
-        start_str = start_date.strftime("%Y%m%d") + "0000"
         end_str = end_date.strftime("%Y%m%d") + "2359"
 
         # Build query with date range
         query = f"({category_str}) AND submittedDate:[{start_str} TO {end_str}]"
+        if keyword_clause:
+            query += f" AND {keyword_clause}"
 
         return query
 
-    def fetch_papers(self, max_results: int = 50, days_back: int = 7) -> List[Dict]:
-        """Fetch papers from arXiv"""
-        print(f"🔍 Fetching papers from last {days_back} day(s)...")
+    def _search_union(self, client: arxiv.Client, queries: List[str], max_results: int,
+                      log: List[str], strict: bool = False,
+                      capped: Optional[Dict[str, datetime]] = None,
+                      ascending: bool = False) -> List[Tuple[Dict, datetime]]:
+        """
+        Run each query and union the results by arXiv ID, newest first
+
+        Pages are prefetched while the results of the previous page are
+        converted to candidate dicts. Errors end the failing query only;
+        the results fetched so far are kept. With strict=True errors are
+        raised instead (partial results must not be mistaken for complete ones).
+
+        Args:
+            capped: Optional dict that receives, for each query cut off at
+                max_results, the submission time of its last result (older
+                papers of that query were not fetched, or newer ones with
+                ascending=True)
+            ascending: Ask arXiv for the oldest papers first, so max_results
+                cuts off the newest ones (the union is still returned newest first)
+
+        Returns:
+            (candidate paper, submission time) pairs
+        """
+        results = {}
+        for query in queries:
+            log.append(f"Query: {query}")
+            search = arxiv.Search(
+                query=query,
+                max_results=max_results,
+                sort_by=arxiv.SortCriterion.SubmittedDate,
+                sort_order=arxiv.SortOrder.Ascending if ascending else arxiv.SortOrder.Descending
+            )
+            returned = 0
+            try:
+                for result in prefetch(client.results(search), 2 * client.page_size):
+                    returned += 1
+                    arxiv_id = result.entry_id.split('/')[-1]
+                    if arxiv_id not in results:
+                        results[arxiv_id] = (self._to_candidate(result), result.published)
+                    if returned >= max_results and capped is not None:
+                        capped[query] = result.published
+            except arxiv.UnexpectedEmptyPageError:
+                # arXiv overstating totalResults; the results so far are complete
+                log.append(f"⚠️  Warning: Hit empty page after {len(results)} papers")
+            except Exception as e:
+                if strict:
+                    raise
+                log.append(f"⚠️  Warning: Error fetching papers: {str(e)}")
+                log.append(f"   Continuing with {len(results)} papers already fetched...")
+
+        return sorted(results.values(), key=lambda item: (item[1], item[0]["arxiv_id"]), reverse=True)
+
+    @staticmethod
+    def _transfer_log(label: str, stats: TransferStats) -> List[str]:
+        """Per-page latency/size lines and a summary for one fetch"""
+        lines = [f"📶 {label}: {stats.summary()}"]
+        for page, entry in enumerate(stats.requests, 1):
+            lines.append(f"   page {page}: {entry['latency']:.2f}s, {entry['bytes'] / 1024:.1f} KB"
+                         f" (waited {entry['waited']:.1f}s for a rate slot)")
+        return lines
+
+    @staticmethod
+    def _to_candidate(result) -> Dict:
+        """Convert an arxiv.Result into a candidate paper dict"""
+        paper = {
+            "id": result.entry_id.split('/')[-1],
+            "title": result.title,
+            "authors": [author.name for author in result.authors],
+            "abstract": result.summary,
+            "published": result.published.strftime("%Y-%m-%d"),
+            "updated": result.updated.strftime("%Y-%m-%d"),
+            "categories": result.categories,
+            "primary_category": result.primary_category,
+            "links": {
+                "paper": result.entry_id,
+                "pdf": result.pdf_url,
+            },
+            "arxiv_id": result.entry_id.split('/')[-1],
+            "comment": result.comment if result.comment else "",
+            "journal_ref": result.journal_ref if result.journal_ref else "",
+        }
 
-        query = self.build_query(days_back)
-        print(f"Query: {query}")  # Show full query for debugging
+        # Check for code availability
+        if result.comment and ("github" in result.comment.lower() or "code" in result.comment.lower()):
+            paper["has_code"] = True
+        else:
+            paper["has_code"] = False
+
+        return paper
+
+    def fetch_papers(self, max_results: int = 50, days_back: int = 7,
+                     cursor: Optional[ScraperCursor] = None, mode: str = "per-category",
+                     category_quota: Optional[int] = None) -> List[Dict]:
+        """
+        Fetch papers from arXiv
+
+        Args:
+            max_results: Maximum number of papers to return
+            days_back: Window to query (categories without a cursor)
+            cursor: Per-category cursor; None queries the --days window
+            mode: "per-category" (concurrent, one query per category) or
+                "combined" (single OR query, ignores the cursor)
+            category_quota: Papers per category (default: max_results split evenly)
+        """
+        if mode == "per-category":
+            return self.fetch_papers_per_category(max_results, days_back, cursor, category_quota)
+
+        print(f"🔍 Fetching papers from last {days_back} day(s)...")
 
         # Use new Client API (Search.results is deprecated)
-        client = arxiv.Client()
-        search = arxiv.Search(
-            query=query,
-            max_results=max_results,
-            sort_by=arxiv.SortCriterion.SubmittedDate,
-            sort_order=arxiv.SortOrder.Descending
-        )
+        stats = TransferStats()
+        client = self._make_client(RateLimiter(ARXIV_REQUEST_INTERVAL), stats)
+        log: List[str] = []
+        results = self._search_union(client, self.build_queries(days_back), max_results, log)
+        log.extend(self._transfer_log("arXiv", stats))
+        for line in log:
+            print(line)  # Show full queries for debugging
 
         papers = []
+        for count, (paper, _) in enumerate(results[:max_results], 1):
+            # Debug: print first few papers
+            if count <= 3:
+                print(f"   Paper {count}: {paper['title'][:60]}... (date: {paper['updated']})")
 
-        try:
-            # Use client.results() instead of search.results()
-            count = 0
-            for result in client.results(search):
-                count += 1
-
-                # Debug: print first few papers
-                if count <= 3:
-                    submit_date = result.updated.strftime("%Y-%m-%d")
-                    print(f"   Paper {count}: {result.title[:60]}... (date: {submit_date})")
-
-                paper = {
-                    "id": result.entry_id.split('/')[-1],
-                    "title": result.title,
-                    "authors": [author.name for author in result.authors],
-                    "abstract": result.summary,
-                    "published": result.published.strftime("%Y-%m-%d"),
-                    "updated": result.updated.strftime("%Y-%m-%d"),
-                    "categories": result.categories,
-                    "primary_category": result.primary_category,
-                    "links": {
-                        "paper": result.entry_id,
-                        "pdf": result.pdf_url,
-                    },
-                    "arxiv_id": result.entry_id.split('/')[-1],
-                    "comment": result.comment if result.comment else "",
-                    "journal_ref": result.journal_ref if result.journal_ref else "",
-                }
-
-                # Check for code availability
-                if result.comment and ("github" in result.comment.lower() or "code" in result.comment.lower()):
-                    paper["has_code"] = True
-                else:
-                    paper["has_code"] = False
-
-                papers.append(paper)
-
-                # Stop if we have enough papers
-                if len(papers) >= max_results:
-                    print(f"   ℹ️  Collected {len(papers)} papers, stopping...")
-                    break
-
-        except arxiv.UnexpectedEmptyPageError as e:
-            print(f"⚠️  Warning: Hit empty page after {len(papers)} papers")
-            print(f"   This is normal when arXiv has fewer results than requested")
-        except Exception as e:
-            print(f"⚠️  Warning: Error fetching papers: {str(e)}")
-            print(f"   Continuing with {len(papers)} papers already fetched...")
+            papers.append(paper)
 
         print(f"✅ Found {len(papers)} papers")
         return papers
 
-    def save_candidates(self, papers: List[Dict], output_file: str = "data/papers/pending/candidates.json"):
-        """Save candidate papers to JSON file"""
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    def _make_client(self, limiter: RateLimiter,
+                     stats: Optional[TransferStats] = None) -> arxiv.Client:
+        """arXiv client whose requests go through the HTTP cache and a shared limiter"""
+        client = arxiv.Client(delay_seconds=0)
+        install_cache(client._session, self.http_cache, inner=RateLimitedAdapter(limiter))
+        if stats is not None:
+            stats.install(client._session)
+        return client
+
+    def _fetch_category(self, category: str, days_back: int, limit: int,
+                        cursor: Optional[ScraperCursor],
+                        limiter: RateLimiter) -> Tuple[List[Tuple[Dict, datetime]], int, List[str]]:
+        """
+        Fetch up to limit unseen papers of one category (runs in a worker thread)
+
+        With a cursor the category is queried oldest first from the cursor,
+        so when the quota cuts the results off it is the newest papers that
+        wait for the next run, and the cursor never moves past papers that
+        were not fetched. Without one the --days window is queried newest
+        first and a cut-off leaves its oldest papers out (logged).
+
+        Returns:
+            (papers with their submission time, newest first, already-seen count, log lines)
+        """
+        log = []
+        start = cursor.query_start(category) if cursor is not None else None
+        if start is None:
+            log.append(f"🔍 {category}: fetching last {days_back} day(s)...")
+        else:
+            log.append(f"🔍 {category}: fetching papers submitted since {start:%Y-%m-%d %H:%M} UTC...")
+
+        queries = self.build_queries(days_back, category=category, start=start)
+
+        # Papers inside the cursor's overlap window come back again; leave room to skip them
+        overlap_seen = len((cursor.categories.get(category) or {}).get('seen') or {}) if cursor else 0
+        ascending = start is not None
+        capped: Dict[str, datetime] = {}
+        stats = TransferStats()
+        results = self._search_union(self._make_client(limiter, stats), queries,
+                                     limit + overlap_seen, log, capped=capped, ascending=ascending)
+        log.extend(self._transfer_log(category, stats))
+        if ascending:
+            results.reverse()
+            # Past the earliest cut-off some query's papers are missing
+            horizon = min(capped.values()) if capped else None
+        else:
+            horizon = max(capped.values()) if capped else None
+
+        fetched = []
+        skipped = 0
+        new_count = 0
+        truncated = False
+        for paper, published in results:
+            if new_count >= limit or (ascending and horizon is not None and published > horizon):
+                truncated = True
+                break
+            fetched.append((paper, published))
+            if cursor is not None and cursor.is_seen(category, paper["arxiv_id"]):
+                skipped += 1
+                continue
+            new_count += 1
+
+        if ascending:
+            fetched.reverse()
+            if truncated or horizon is not None:
+                reached = fetched[0][1] if fetched else start
+                log.append(f"⚠️  {category}: quota of {limit} reached at {reached:%Y-%m-%d %H:%M} UTC; "
+                           f"newer papers are left for the next run")
+        elif truncated or horizon is not None:
+            window_start = (datetime.now(timezone.utc) - timedelta(days=days_back)).replace(
+                hour=0, minute=0, second=0, microsecond=0)
+            gap_end = fetched[-1][1] if truncated and fetched else horizon
+            log.append(f"⚠️  {category}: quota of {limit} reached; papers submitted "
+                       f"{window_start:%Y-%m-%d %H:%M} to {gap_end:%Y-%m-%d %H:%M} UTC were not fetched")
+
+        return fetched, skipped, log
+
+    def fetch_papers_per_category(self, max_results: int, days_back: int,
+                                  cursor: Optional[ScraperCursor] = None,
+                                  category_quota: Optional[int] = None) -> List[Dict]:
+        """
+        Fetch each category concurrently with its own quota and merge by arXiv ID
+
+        Each category is queried from its cursor (minus the overlap), oldest
+        first, or over the --days window, newest first (see _fetch_category). All clients share one rate limiter,
+        so requests stay spaced per arXiv's policy however many run at once.
+        Papers already returned by an earlier run, or by another category in
+        this run (cross-listings), are skipped.
+        """
+        quota = category_quota or max(1, max_results // len(self.categories))
+        print(f"🔍 Fetching {len(self.categories)} categories concurrently "
+              f"(up to {quota} papers each)...")
+
+        limiter = RateLimiter(ARXIV_REQUEST_INTERVAL)
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=len(self.categories)) as pool:
+            futures = [
+                pool.submit(self._fetch_category, category, days_back, quota, cursor, limiter)
+                for category in self.categories
+            ]
+            results = [future.result() for future in futures]
 
-        # Add metadata
-        data = {
-            "fetched_at": datetime.now().isoformat(),
-            "total_papers": len(papers),
-            "papers": papers
-        }
+        papers = []
+        fetched_ids = set()
+        for category, (fetched, skipped, log) in zip(self.categories, results):
+            for line in log:
+                print(line)
+
+            new_count = 0
+            duplicates = 0
+            for paper, published in fetched:
+                arxiv_id = paper["arxiv_id"]
+                already_seen = cursor is not None and cursor.is_seen(category, arxiv_id)
+                if cursor is not None:
+                    cursor.advance(category, arxiv_id, published)
+                if already_seen:
+                    continue
+                if arxiv_id in fetched_ids:
+                    duplicates += 1
+                    continue
+                fetched_ids.add(arxiv_id)
+                papers.append(paper)
+                new_count += 1
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            print(f"   {category}: {new_count} new, {skipped} already seen, "
+                  f"{duplicates} cross-listed")
 
-        print(f"💾 Saved {len(papers)} candidates to {output_file}")
+        print(f"✅ Found {len(papers)} new papers in {time.monotonic() - started:.1f}s")
+        return papers
 
-    def run(self, max_results: int = 50, days_back: int = 1):
+    def fetch_range(self, start: datetime, end: datetime, limiter: RateLimiter,
+                    max_results: int, capped: Optional[Dict[str, datetime]] = None) -> List[Dict]:
+        """
+        Fetch every paper submitted between two days, all categories
+
+        Unlike the daily fetch, errors are raised instead of returning the
+        papers fetched so far (see scraper_backfill.py). Queries are newest
+        first, so a query that reaches max_results is missing the oldest
+        papers of the range; check capped before treating the result as complete.
+
+        Args:
+            start: First day (UTC)
+            end: Last day (UTC, inclusive)
+            limiter: Rate limiter shared with concurrent fetches
+            max_results: Maximum papers per query
+            capped: Optional dict that receives the queries cut off at max_results
+        """
+        queries = self.build_queries(start=start, end=end)
+        log: List[str] = []
+        results = self._search_union(self._make_client(limiter), queries, max_results, log,
+                                     strict=True, capped=capped)
+        return [paper for paper, _ in results]
+
+    def save_candidates(self, papers: Iterable[Dict], output_file: str = CANDIDATES_PATH) -> int:
+        """Stream candidate papers to a JSONL stage file, returns the number written"""
+        with RecordWriter(output_file) as out:
+            for paper in papers:
+                out.write(paper)
+
+        print(f"💾 Saved {out.count} candidates to {output_file}")
+        return out.count
+
+    @staticmethod
+    def drop_seen(papers: Iterable[Dict], seen: Optional[SeenSet]) -> Iterator[Dict]:
+        """Skip papers an earlier run already filtered, proposed or reviewed"""
+        skipped = 0
+        for paper in papers:
+            if seen is not None and paper.get("arxiv_id") and paper["arxiv_id"] in seen:
+                skipped += 1
+                continue
+            yield paper
+        if skipped:
+            print(f"👁️  Skipped {skipped} paper(s) already in the seen-set ({seen.path})")
+
+    def run(self, max_results: int = 50, days_back: int = 1,
+            cursor: Optional[ScraperCursor] = None, mode: str = "per-category",
+            category_quota: Optional[int] = None, seen: Optional[SeenSet] = None):
         """Main execution"""
-        papers = self.fetch_papers(max_results, days_back)
-        self.save_candidates(papers)
-        return papers
+        if mode != "per-category":
+            cursor = None  # the combined query has no per-category cursor
+        papers = self.fetch_papers(max_results, days_back, cursor, mode, category_quota)
+        count = self.save_candidates(self.drop_seen(papers, seen))
+        if cursor is not None:
+            # Only move the cursor once the candidates are safely written
+            cursor.save()
+            print(f"📍 Updated scraper cursor: {cursor.path}")
+        return count
 
 
 def main():
     parser = argparse.ArgumentParser(description="Scrape papers from arXiv")
     parser.add_argument("--max-results", type=int, default=50, help="Maximum papers to fetch")
-    parser.add_argument("--days", type=int, default=1, help="Days to look back")
+    parser.add_argument("--days", type=int, default=1,
+                        help="Days to look back (categories without a cursor, or with --ignore-cursor)")
+    parser.add_argument("--cursor-file", default=DEFAULT_CURSOR_PATH,
+                        help=f"Per-category scrape cursor (default: {DEFAULT_CURSOR_PATH})")
+    parser.add_argument("--overlap-hours", type=float, default=DEFAULT_OVERLAP_HOURS,
+                        help="Re-query this many hours before the cursor to catch late-indexed papers")
+    parser.add_argument("--ignore-cursor", action="store_true",
+                        help="Query the plain --days window and leave the cursor untouched")
+    parser.add_argument("--fetch-mode", choices=FETCH_MODES, default="per-category",
+                        help="per-category: concurrent query per category (default); "
+                             "combined: single OR query over the --days window")
+    parser.add_argument("--category-quota", type=int, default=None,
+                        help="Papers per category in per-category mode "
+                             "(default: max-results split evenly)")
+    parser.add_argument("--query-mode", choices=QUERY_MODES, default="keywords",
+                        help="keywords: only papers whose title/abstract match the research "
+                             "keywords (default); broad: whole categories, for recall checks")
+    parser.add_argument("--http-cache", choices=CACHE_MODES, default=None,
+                        help="HTTP cache mode: record, replay (offline) or revalidate "
+                             "(default: $PAPER_HTTP_CACHE or off)")
+    parser.add_argument("--seen-file", default=DEFAULT_SEEN_PATH,
+                        help=f"Seen-set of papers handled by earlier runs (default: {DEFAULT_SEEN_PATH})")
+    parser.add_argument("--include-seen", action="store_true",
+                        help="Keep papers that are already in the seen-set")
     parser.add_argument("--test", action="store_true", help="Test mode - just print query")
 
+    backfill = parser.add_argument_group(
+        "backfill", "Fetch a historical date range in resumable partitions (see scraper_backfill.py)")
+    backfill.add_argument("--from", dest="backfill_from", type=parse_day, metavar="YYYY-MM-DD",
+                          help="Backfill papers submitted from this day (requires --to)")
+    backfill.add_argument("--to", dest="backfill_to", type=parse_day, metavar="YYYY-MM-DD",
+                          help="Last day of the backfill range (inclusive)")
+    backfill.add_argument("--partition", choices=sorted(PARTITION_SIZES), default="week",
+                          help="Partition size (default: week)")
+    backfill.add_argument("--workers", type=int, default=4,
+                          help="Partitions fetched concurrently (default: 4)")
+    backfill.add_argument("--partition-max", type=int, default=DEFAULT_PARTITION_MAX,
+                          help=f"Maximum papers per partition query; a capped week is refetched "
+                               f"by day, a capped day fails (default: {DEFAULT_PARTITION_MAX})")
+    backfill.add_argument("--backfill-dir", default=DEFAULT_BACKFILL_DIR,
+                          help=f"Checkpoint directory (default: {DEFAULT_BACKFILL_DIR})")
+
     args = parser.parse_args()
 
-    scraper = ArxivScraper()
+    if (args.backfill_from is None) != (args.backfill_to is None):
+        parser.error("--from and --to must be given together")
+
+    scraper = ArxivScraper(query_mode=args.query_mode, http_cache=args.http_cache)
+    seen = None if args.include_seen else SeenSet(args.seen_file)
+
+    if args.backfill_from is not None:
+        # The daily cursor is left untouched: a backfill looks at the past
+        return run_backfill(scraper, args.backfill_from, args.backfill_to, args.partition,
+                            args.backfill_dir, args.workers, args.partition_max,
+                            CANDIDATES_PATH, seen)
+    use_cursor = not args.ignore_cursor and args.fetch_mode == "per-category"
+    cursor = ScraperCursor(args.cursor_file, args.overlap_hours) if use_cursor else None
 
     if args.test:
-        query = scraper.build_query(args.days)
         print("Test Query:")
-        print(query)
+        if args.fetch_mode == "combined":
+            print("\n".join(scraper.build_queries(args.days)))
+        else:
+            for category in scraper.categories:
+                start = cursor.query_start(category) if cursor else None
+                print("\n".join(scraper.build_queries(args.days, category=category, start=start)))
         print("\nKeywords:", scraper.keywords)
         print("Categories:", scraper.categories)
     else:
-        papers = scraper.run(args.max_results, args.days)
-        print(f"\n🎉 Scraping complete! Found {len(papers)} papers")
-        print("📁 Results saved to: data/papers/pending/candidates.json")
+        count = scraper.run(args.max_results, args.days, cursor,
+                            args.fetch_mode, args.category_quota, seen)
+        print(f"\n🎉 Scraping complete! Found {count} papers")
+        print(f"📁 Results saved to: {CANDIDATES_PATH}")
+
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Crash-safe, lock-coordinated file writes.
+
+Several workflows (citation updates, approved-paper processing, mindmap
+generation) rewrite the same data files. Writing with open(path, 'w')
+truncates the file first, so a crash mid-write leaves it corrupted and two
+concurrent writers silently overwrite each other. The helpers here:
+
+- file_lock() takes an advisory lock on <path>.lock so writers of the same
+  file run one at a time (re-entrant within a thread)
+- atomic_open()/atomic_write() write to a temp file in the same directory,
+  fsync it, rename it over the target and fsync the directory, so readers
+  see either the old or the new file, never a partial one
+"""
+
+import os
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes stay atomic but are not coordinated
+    fcntl = None
+
+
+DEFAULT_LOCK_TIMEOUT = 300.0  # seconds
+LOCK_POLL_INTERVAL = 0.1
+
+# Locks held by this process: (lock path, thread id) -> [file object, depth]
+_held_locks: Dict[tuple, list] = {}
+_held_locks_guard = threading.RLock()
+
+
+def lock_path(path: str) -> str:
+    """Return the lock file that coordinates writers of path."""
+    return path + '.lock'
+
+
+@contextmanager
+def file_lock(path: str, timeout: float = DEFAULT_LOCK_TIMEOUT):
+    """
+    Hold the exclusive advisory lock for a file.
+
+    Nested use for the same path within one thread is allowed; other
+    threads and processes wait.
+
+    Args:
+        path: File whose writers should be serialized
+        timeout: Seconds to wait for another process to release the lock
+
+    Raises:
+        TimeoutError: If the lock could not be acquired in time
+    """
+    lock_file_path = os.path.abspath(lock_path(path))
+    key = (lock_file_path, threading.get_ident())
+
+    with _held_locks_guard:
+        held = _held_locks.get(key)
+        if held is not None:
+            held[1] += 1
+    if held is not None:
+        try:
+            yield
+        finally:
+            with _held_locks_guard:
+                held[1] -= 1
+        return
+
+    os.makedirs(os.path.dirname(lock_file_path), exist_ok=True)
+    lock_file = open(lock_file_path, 'a+')
+    try:
+        if fcntl is not None:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"Timed out waiting for lock on {path}")
+                    time.sleep(LOCK_POLL_INTERVAL)
+
+        with _held_locks_guard:
+            _held_locks[key] = [lock_file, 1]
+        try:
+            yield
+        finally:
+            with _held_locks_guard:
+                del _held_locks[key]
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    finally:
+        lock_file.close()
+
+
+def _fsync_dir(directory: str):
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = 'w', encoding: str = 'utf-8'):
+    """
+    Open a temp file that replaces path when the block exits without error.
+
+    Args:
+        path: Target file
+        mode: 'w' (text) or 'wb' (binary)
+        encoding: Text encoding for mode 'w'
+
+    Yields:
+        Writable file object
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp',
+                                    dir=directory)
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+
+        # mkstemp creates 0600 files; keep the target's permissions
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+
+        os.replace(tmp_path, path)
+        _fsync_dir(directory)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write(path: str, data: Union[str, bytes], encoding: str = 'utf-8'):
+    """
+    Atomically replace a file's contents.
+
+    Args:
+        path: Target file
+        data: Text or bytes to write
+        encoding: Encoding for text data
+    """
+    mode = 'wb' if isinstance(data, bytes) else 'w'
+    with atomic_open(path, mode, encoding=encoding) as f:
+        f.write(data)
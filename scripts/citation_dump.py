@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Citation counts from locally downloaded bulk dumps.
+
+Refreshing a large collection through the Semantic Scholar API costs one
+request per paper (citation_tracker.py). The Semantic Scholar "papers"
+dataset and the OpenAlex "works" snapshot contain the same counts for every
+paper they know, as gzipped JSON lines. scan_dumps() streams such files one
+line at a time and keeps only the records whose arXiv ID is in the wanted
+set, so memory stays bounded by the collection, not the dump:
+
+    Semantic Scholar  {"externalids": {"ArXiv": "2308.04079", ...},
+                       "citationcount": 812, "influentialcitationcount": 95, ...}
+    OpenAlex          {"doi": "https://doi.org/10.48550/arxiv.2308.04079",
+                       "cited_by_count": 790, "locations": [...], ...}
+
+OpenAlex has no influential citation count; papers matched only there keep
+their previous one. OpenAlex often lists the arXiv preprint and the
+published version as separate works, so when an ID matches several records
+the highest count wins.
+"""
+
+import re
+import gzip
+import json
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from seen_set import base_arxiv_id
+
+
+DUMP_FORMATS = ('auto', 's2', 'openalex')
+PROGRESS_INTERVAL = 1_000_000  # records between progress lines
+
+# Lines that do not mention arXiv cannot match; skipping them avoids json.loads
+_MENTIONS_ARXIV = re.compile(r'arxiv', re.IGNORECASE)
+_ARXIV_DOI = re.compile(r'10\.48550/arxiv\.(.+)$', re.IGNORECASE)
+_ARXIV_URL = re.compile(r'arxiv\.org/(?:abs|pdf)/([^?#]+?)(?:\.pdf)?/?$', re.IGNORECASE)
+
+# (arXiv ID without version, citations, influential citations or None)
+DumpCounts = Tuple[str, int, Optional[int]]
+
+
+def open_dump(path: str):
+    """Open a dump file as text (gzip-compressed if it ends in .gz)."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def _s2_counts(record: Dict) -> Optional[DumpCounts]:
+    # Bulk datasets use lower-case keys, Graph API responses camelCase
+    external = record.get('externalids') or record.get('externalIds') or {}
+    arxiv_id = external.get('ArXiv') or external.get('arxiv')
+    if not arxiv_id:
+        return None
+    citations = record.get('citationcount', record.get('citationCount'))
+    influential = record.get('influentialcitationcount', record.get('influentialCitationCount'))
+    return base_arxiv_id(str(arxiv_id)), int(citations or 0), int(influential or 0)
+
+
+def _openalex_arxiv_id(record: Dict) -> Optional[str]:
+    ids = record.get('ids') or {}
+    for doi in (record.get('doi'), ids.get('doi')):
+        match = _ARXIV_DOI.search(doi or '')
+        if match:
+            return match.group(1)
+    locations = list(record.get('locations') or [])
+    locations += [record.get('primary_location'), record.get('best_oa_location')]
+    for location in locations:
+        for url in ((location or {}).get('landing_page_url'), (location or {}).get('pdf_url')):
+            match = _ARXIV_URL.search(url or '')
+            if match:
+                return match.group(1)
+    return None
+
+
+def _openalex_counts(record: Dict) -> Optional[DumpCounts]:
+    arxiv_id = _openalex_arxiv_id(record)
+    if not arxiv_id:
+        return None
+    return base_arxiv_id(arxiv_id), int(record.get('cited_by_count') or 0), None
+
+
+def record_counts(record: Dict, dump_format: str = 'auto') -> Optional[DumpCounts]:
+    """
+    Citation counts of one dump record.
+
+    Args:
+        record: Parsed JSON line
+        dump_format: 's2', 'openalex' or 'auto' (decided by the record's keys)
+
+    Returns:
+        (arXiv ID, citations, influential citations or None), or None if
+        the record is not an arXiv paper
+    """
+    if dump_format == 'auto':
+        dump_format = 'openalex' if 'cited_by_count' in record else 's2'
+    if dump_format == 'openalex':
+        return _openalex_counts(record)
+    return _s2_counts(record)
+
+
+def iter_dump_counts(path: str, dump_format: str = 'auto',
+                     stats: Optional[Dict] = None) -> Iterator[DumpCounts]:
+    """
+    Stream the arXiv papers of one dump file.
+
+    Args:
+        path: .jsonl or .jsonl.gz dump file
+        dump_format: One of DUMP_FORMATS
+        stats: Optional dict whose 'records' and 'malformed' counters are updated
+
+    Yields:
+        (arXiv ID, citations, influential citations or None) per arXiv record
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault('records', 0)
+    stats.setdefault('malformed', 0)
+    with open_dump(path) as f:
+        for line in f:
+            stats['records'] += 1
+            if stats['records'] % PROGRESS_INTERVAL == 0:
+                print(f"   📖 {stats['records']:,} records scanned...")
+            if not _MENTIONS_ARXIV.search(line):
+                continue
+            try:
+                counts = record_counts(json.loads(line), dump_format)
+            except (ValueError, TypeError, AttributeError):
+                stats['malformed'] += 1
+                continue
+            if counts:
+                yield counts
+
+
+def scan_dumps(paths: Iterable[str], wanted: Set[str],
+               dump_format: str = 'auto', stats: Optional[Dict] = None) -> Dict[str, Tuple[int, Optional[int]]]:
+    """
+    Join dump files against a set of arXiv IDs in one pass.
+
+    Args:
+        paths: Dump files (e.g. all parts of one dataset release)
+        wanted: arXiv IDs without version
+        dump_format: One of DUMP_FORMATS
+        stats: Optional dict for the 'records' and 'malformed' counters
+
+    Returns:
+        arXiv ID -> (citations, influential citations or None) for the IDs found
+    """
+    found: Dict[str, Tuple[int, Optional[int]]] = {}
+    for path in paths:
+        for arxiv_id, citations, influential in iter_dump_counts(path, dump_format, stats):
+            if arxiv_id not in wanted:
+                continue
+            previous = found.get(arxiv_id)
+            if previous is not None:
+                # Duplicate work (preprint and published version): keep the larger counts
+                citations = max(citations, previous[0])
+                if previous[1] is not None:
+                    influential = max(influential or 0, previous[1])
+            found[arxiv_id] = (citations, influential)
+    return found
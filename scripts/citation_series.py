@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Columnar time-series store for citation counts.
+
+Citation snapshots used to live in papers.yaml as one
+{date, papers: {id: {citation_count, influential_count}}} entry per run,
+repeating every paper ID per snapshot and growing the file Hugo loads.
+CitationSeries keeps one set of array-backed columns per paper instead
+(snapshot day, citation count, influential count) and persists them to
+data/papers/citations.json:
+
+    {
+      "version": 1,
+      "dates": ["2025-11-17", ...],
+      "papers": {
+        "<paper id>": {"dates": [...], "citations": [...], "influential": [...]}
+      }
+    }
+
+Every per-paper column is delta-encoded: the first value is absolute
+(an index into "dates" for the date column) and each following value is
+the difference to the previous one. Old points are downsampled instead of
+dropped: daily for the last 90 days, weekly up to a year, monthly beyond.
+"""
+
+import os
+import sys
+import json
+import argparse
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from atomic_io import atomic_write, file_lock
+
+
+SERIES_VERSION = 1
+
+# Downsampling tiers (age in days)
+DAILY_DAYS = 90
+WEEKLY_DAYS = 365
+
+DateLike = Union[str, date, datetime]
+
+
+def default_series_path(papers_yaml_path: str) -> str:
+    """Return the citation series file that belongs to a papers.yaml file."""
+    return os.path.join(os.path.dirname(papers_yaml_path), 'citations.json')
+
+
+def _to_day(value: DateLike) -> int:
+    """Convert a date (or YYYY-MM-DD string) to a proleptic ordinal day."""
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+def _to_date_str(day: int) -> str:
+    return date.fromordinal(day).isoformat()
+
+
+def _deltas(values: Iterable[int]) -> List[int]:
+    result = []
+    previous = 0
+    for value in values:
+        result.append(value - previous)
+        previous = value
+    return result
+
+
+class _Column:
+    """Snapshot days and counts for one paper, sorted by day."""
+
+    __slots__ = ('days', 'citations', 'influential')
+
+    def __init__(self, days=(), citations=(), influential=()):
+        self.days = array('l', days)
+        self.citations = array('l', citations)
+        self.influential = array('l', influential)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def put(self, day: int, citations: int, influential: int):
+        """Insert a point, replacing an existing point for the same day."""
+        pos = bisect_left(self.days, day)
+        if pos < len(self.days) and self.days[pos] == day:
+            self.citations[pos] = citations
+            self.influential[pos] = influential
+        else:
+            self.days.insert(pos, day)
+            self.citations.insert(pos, citations)
+            self.influential.insert(pos, influential)
+
+    def position_at(self, day: int) -> int:
+        """Index of the last point on or before day (-1 if none)."""
+        return bisect_right(self.days, day) - 1
+
+    def keep(self, positions: List[int]):
+        self.days = array('l', (self.days[i] for i in positions))
+        self.citations = array('l', (self.citations[i] for i in positions))
+        self.influential = array('l', (self.influential[i] for i in positions))
+
+
+class CitationSeries:
+    """Per-paper citation count time series backed by citations.json."""
+
+    def __init__(self, path: str):
+        """
+        Open a series file (created on first save).
+
+        Args:
+            path: Path to citations.json
+        """
+        self.path = path
+        self._columns: Dict[str, _Column] = {}
+        self._loaded_mtime_ns: Optional[int] = None
+        # Points recorded since loading, re-applied if the file changed meanwhile
+        self._pending: List[Tuple[int, str, int, int]] = []
+        self._downsample_day: Optional[int] = None
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _mtime_ns(self) -> Optional[int]:
+        return os.stat(self.path).st_mtime_ns if os.path.exists(self.path) else None
+
+    def _load(self):
+        self._columns = {}
+        self._loaded_mtime_ns = self._mtime_ns()
+        if self._loaded_mtime_ns is None:
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('version') != SERIES_VERSION:
+            raise ValueError(f"Unsupported citation series version in {self.path}: "
+                             f"{data.get('version')}")
+
+        dates = [_to_day(d) for d in data.get('dates') or []]
+        for paper_id, column in (data.get('papers') or {}).items():
+            self._columns[paper_id] = _Column(
+                (dates[i] for i in accumulate(column['dates'])),
+                accumulate(column['citations']),
+                accumulate(column['influential']),
+            )
+
+    def save(self):
+        """Write the series to disk (one paper per line, atomically replaced)."""
+        with file_lock(self.path):
+            if self._mtime_ns() != self._loaded_mtime_ns:
+                # Another run saved in the meantime: re-apply our points on top of it
+                self._load()
+                for day, paper_id, citations, influential in self._pending:
+                    self._columns.setdefault(paper_id, _Column()).put(day, citations, influential)
+                if self._downsample_day is not None:
+                    self.downsample(date.fromordinal(self._downsample_day))
+            self._write()
+            self._loaded_mtime_ns = self._mtime_ns()
+            self._pending = []
+
+    def _write(self):
+        days = sorted({day for column in self._columns.values() for day in column.days})
+        date_index = {day: i for i, day in enumerate(days)}
+
+        lines = [
+            '{',
+            f'  "version": {SERIES_VERSION},',
+            f'  "dates": {json.dumps([_to_date_str(day) for day in days])},',
+            '  "papers": {',
+        ]
+        paper_lines = []
+        for paper_id in sorted(self._columns):
+            column = self._columns[paper_id]
+            if not column:
+                continue
+            encoded = {
+                'dates': _deltas(date_index[day] for day in column.days),
+                'citations': _deltas(column.citations),
+                'influential': _deltas(column.influential),
+            }
+            paper_lines.append(f'    {json.dumps(paper_id, ensure_ascii=False)}: '
+                               f'{json.dumps(encoded, separators=(",", ":"))}')
+        lines.append(',\n'.join(paper_lines))
+        lines.extend(['  }', '}'])
+
+        atomic_write(self.path, '\n'.join(line for line in lines if line) + '\n')
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def record(self, snapshot_date: DateLike, papers: Dict[str, Dict]):
+        """
+        Record citation counts for one date.
+
+        Args:
+            snapshot_date: Snapshot date
+            papers: Mapping of paper ID to {citation_count, influential_count}
+        """
+        day = _to_day(snapshot_date)
+        for paper_id, counts in papers.items():
+            citations = int(counts.get('citation_count') or 0)
+            influential = int(counts.get('influential_count') or 0)
+            self._columns.setdefault(paper_id, _Column()).put(day, citations, influential)
+            self._pending.append((day, paper_id, citations, influential))
+
+    def migrate(self, history: List[Dict]) -> int:
+        """
+        Import snapshots in the legacy papers.yaml citation_history layout.
+
+        Args:
+            history: List of {date, papers: {id: {citation_count, influential_count}}}
+
+        Returns:
+            Number of snapshots imported
+        """
+        for entry in history:
+            self.record(entry['date'], entry.get('papers') or {})
+        return len(history)
+
+    def downsample(self, today: Optional[DateLike] = None) -> int:
+        """
+        Thin out old points: keep the last point per week beyond DAILY_DAYS
+        and the last point per month beyond WEEKLY_DAYS.
+
+        Args:
+            today: Reference date (default: today)
+
+        Returns:
+            Number of points removed
+        """
+        today_day = _to_day(today) if today is not None else date.today().toordinal()
+        self._downsample_day = today_day
+        removed = 0
+
+        for column in self._columns.values():
+            buckets: Dict[tuple, int] = {}
+            for pos, day in enumerate(column.days):
+                age = today_day - day
+                if age <= DAILY_DAYS:
+                    key = ('d', day)
+                elif age <= WEEKLY_DAYS:
+                    key = ('w',) + date.fromordinal(day).isocalendar()[:2]
+                else:
+                    point = date.fromordinal(day)
+                    key = ('m', point.year, point.month)
+                # Counts are cumulative: the last point of a bucket represents it
+                buckets[key] = pos
+
+            if len(buckets) < len(column):
+                removed += len(column) - len(buckets)
+                column.keep(sorted(buckets.values()))
+
+        return removed
+
+    def remove_paper(self, paper_id: str):
+        """Drop the series of a paper."""
+        self._columns.pop(paper_id, None)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __contains__(self, paper_id: str) -> bool:
+        return paper_id in self._columns
+
+    def paper_ids(self) -> List[str]:
+        """IDs of papers with at least one snapshot."""
+        return list(self._columns)
+
+    def dates(self) -> List[str]:
+        """All snapshot dates (YYYY-MM-DD), oldest first."""
+        days = sorted({day for column in self._columns.values() for day in column.days})
+        return [_to_date_str(day) for day in days]
+
+    def series(self, paper_id: str) -> List[Dict]:
+        """
+        Citation history of one paper.
+
+        Returns:
+            List of {date, citation_count, influential_count}, oldest first
+        """
+        column = self._columns.get(paper_id)
+        if not column:
+            return []
+        return [
+            {'date': _to_date_str(day), 'citation_count': citations,
+             'influential_count': influential}
+            for day, citations, influential in zip(column.days, column.citations,
+                                                    column.influential)
+        ]
+
+    def value_at(self, paper_id: str, when: DateLike, field: str = 'citations') -> Optional[int]:
+        """
+        Count of a paper as of a date (last snapshot on or before it).
+
+        Args:
+            paper_id: Paper ID
+            when: Date
+            field: 'citations' or 'influential'
+
+        Returns:
+            Count, or None if the paper has no snapshot up to that date
+        """
+        column = self._columns.get(paper_id)
+        if not column:
+            return None
+        pos = column.position_at(_to_day(when))
+        return getattr(column, field)[pos] if pos >= 0 else None
+
+    def latest(self, field: str = 'citations') -> Dict[str, int]:
+        """Most recent count of every paper."""
+        return {paper_id: getattr(column, field)[-1]
+                for paper_id, column in self._columns.items() if column}
+
+    def growth(self, start: DateLike, end: Optional[DateLike] = None,
+               field: str = 'citations') -> Dict[str, Tuple[int, int]]:
+        """
+        Count change of every paper over a window.
+
+        The start value is the last snapshot on or before start; papers first
+        seen inside the window start from their first snapshot. Papers without
+        a snapshot in or before the window are left out.
+
+        Args:
+            start: Window start
+            end: Window end (default: latest snapshot)
+            field: 'citations' or 'influential'
+
+        Returns:
+            Mapping of paper ID to (growth, count at end)
+        """
+        start_day = _to_day(start)
+        end_day = _to_day(end) if end is not None else None
+        result = {}
+
+        for paper_id, column in self._columns.items():
+            values = getattr(column, field)
+            end_pos = len(column) - 1 if end_day is None else column.position_at(end_day)
+            if end_pos < 0:
+                continue
+            start_pos = max(column.position_at(start_day), 0)
+            if start_pos > end_pos:
+                continue
+            result[paper_id] = (values[end_pos] - values[start_pos], values[end_pos])
+
+        return result
+
+    def growth_since_previous(self, field: str = 'citations') -> Dict[str, Tuple[int, int]]:
+        """
+        Change between the two most recent snapshot dates, for papers that
+        were checked in the latest snapshot.
+
+        Returns:
+            Mapping of paper ID to (growth, latest count)
+        """
+        days = sorted({day for column in self._columns.values() for day in column.days})
+        if len(days) < 2:
+            return {}
+
+        latest_day, previous_day = days[-1], days[-2]
+        result = {}
+        for paper_id, column in self._columns.items():
+            if column.days[-1] != latest_day:
+                continue
+            values = getattr(column, field)
+            pos = column.position_at(previous_day)
+            previous = values[pos] if pos >= 0 else 0
+            result[paper_id] = (values[-1] - previous, values[-1])
+        return result
+
+    def top_growth(self, window_days: int, end: Optional[DateLike] = None,
+                   n: int = 10) -> List[Tuple[str, int, int]]:
+        """
+        Papers with the largest citation growth over the last window_days.
+
+        Returns:
+            List of (paper ID, growth, count at end), largest growth first
+        """
+        end_date = date.fromordinal(_to_day(end or date.today()))
+        growth = self.growth(date.fromordinal(end_date.toordinal() - window_days), end_date)
+        ranked = sorted(growth.items(), key=lambda item: item[1][0], reverse=True)
+        return [(paper_id, delta, total) for paper_id, (delta, total) in ranked[:n] if delta > 0]
+
+    def iter_snapshots(self) -> Iterator[Dict]:
+        """Yield the series in the legacy citation_history layout (oldest first)."""
+        by_day: Dict[int, Dict] = {}
+        for paper_id, column in self._columns.items():
+            for day, citations, influential in zip(column.days, column.citations,
+                                                   column.influential):
+                by_day.setdefault(day, {})[paper_id] = {
+                    'citation_count': citations,
+                    'influential_count': influential
+                }
+        for day in sorted(by_day):
+            yield {'date': _to_date_str(day), 'papers': by_day[day]}
+
+    def get_stats(self) -> Dict:
+        """Size of the series."""
+        return {
+            'papers': len(self._columns),
+            'dates': len(self.dates()),
+            'points': sum(len(column) for column in self._columns.values()),
+        }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Inspect and maintain the citation time series'
+    )
+    parser.add_argument(
+        '--papers-yaml',
+        default='data/papers/papers.yaml',
+        help='Path to papers.yaml (default: data/papers/papers.yaml)'
+    )
+    parser.add_argument(
+        '--series',
+        help='Path to citation series (default: citations.json next to papers.yaml)'
+    )
+
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+    subparsers.add_parser('migrate', help='Move citation_history out of papers.yaml')
+    subparsers.add_parser('downsample', help='Thin out old snapshots')
+    growth_parser = subparsers.add_parser('growth', help='Show top citation growth')
+    growth_parser.add_argument('--days', type=int, default=30, help='Window in days (default: 30)')
+    growth_parser.add_argument('--top', type=int, default=10, help='Number of papers (default: 10)')
+    subparsers.add_parser('stats', help='Show series statistics')
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    series_path = args.series or default_series_path(args.papers_yaml)
+    series = CitationSeries(series_path)
+
+    if args.command == 'migrate':
+        from paper_store import PaperStore
+
+        with PaperStore(args.papers_yaml) as store:
+            history = store.pop_citation_history()
+            if history:
+                series.migrate(history)
+                series.downsample()
+                series.save()
+                store.export_yaml()
+        print(f"✅ Migrated {len(history)} snapshots to {series_path}")
+
+    elif args.command == 'downsample':
+        removed = series.downsample()
+        series.save()
+        print(f"✅ Removed {removed} points from {series_path}")
+
+    elif args.command == 'growth':
+        top = series.top_growth(args.days, n=args.top)
+        print(f"\n📈 Citation growth over the last {args.days} days\n")
+        for paper_id, delta, total in top:
+            print(f"  +{delta:<6} {total:>7}  {paper_id}")
+        if not top:
+            print("  (no growth recorded)")
+
+    elif args.command == 'stats':
+        stats = series.get_stats()
+        print(f"\n📊 Citation Series: {series_path}")
+        print(f"Papers: {stats['papers']}")
+        print(f"Snapshot dates: {stats['dates']}")
+        print(f"Points: {stats['points']}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,13 +3,13 @@
 Citation Tracker using Semantic Scholar API.
 
 This script tracks citation counts for papers in the database using the free
-Semantic Scholar API. It updates papers.yaml with current citation counts and
-maintains historical data for trend analysis.
+Semantic Scholar API. It updates the paper store (and the exported papers.yaml)
+with current citation counts and records historical data for trend analysis
+in the citation time series (see citation_series.py).
 """
 
 import os
 import sys
-import yaml
 import argparse
 import time
 import requests
@@ -17,6 +17,12 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from citation_dump import DUMP_FORMATS, scan_dumps
+from citation_series import CitationSeries, default_series_path
+from http_cache import CACHE_MODES, install_cache, is_cached
+from paper_store import PaperStore
+from seen_set import base_arxiv_id
+
 
 # Semantic Scholar API configuration
 SEMANTIC_SCHOLAR_API = "https://api.semanticscholar.org/graph/v1"
@@ -26,18 +32,20 @@ REQUEST_DELAY = 1.0  # Seconds between requests (rate limiting)
 class CitationTracker:
     """Track citations for research papers."""
 
-    def __init__(self, api_delay: float = REQUEST_DELAY):
+    def __init__(self, api_delay: float = REQUEST_DELAY, http_cache: Optional[str] = None):
         """
         Initialize citation tracker.
 
         Args:
             api_delay: Delay between API requests in seconds
+            http_cache: HTTP cache mode (see http_cache.py; default: $PAPER_HTTP_CACHE or off)
         """
         self.api_delay = api_delay
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Academic-Paper-Tracker/1.0'
         })
+        install_cache(self.session, http_cache)
 
     def get_paper_info(self, arxiv_id: str) -> Optional[Dict]:
         """
@@ -56,6 +64,7 @@ class CitationTracker:
         arxiv_ids = [arxiv_id, clean_arxiv_id] if 'v' in arxiv_id else [arxiv_id]
 
         for aid in arxiv_ids:
+            response = None
             try:
                 # Query Semantic Scholar API
                 url = f"{SEMANTIC_SCHOLAR_API}/paper/arXiv:{aid}"
@@ -89,8 +98,9 @@ class CitationTracker:
                 continue
 
             finally:
-                # Rate limiting
-                time.sleep(self.api_delay)
+                # Rate limiting (cached responses made no API request)
+                if response is None or not is_cached(response):
+                    time.sleep(self.api_delay)
 
         return None
 
@@ -106,10 +116,9 @@ class CitationTracker:
             Dictionary with update statistics
         """
         # Load papers data
-        with open(papers_yaml_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-
-        papers = data.get('papers', [])
+        store = PaperStore(papers_yaml_path)
+        papers = store.get_papers()
+        series, migrated = self._open_series(store, papers_yaml_path)
 
         stats = {
             'total': len(papers),
@@ -119,10 +128,6 @@ class CitationTracker:
             'errors': []
         }
 
-        # Initialize citation_history if not present
-        if 'citation_history' not in data:
-            data['citation_history'] = []
-
         citation_history_entry = {
             'date': datetime.now().strftime('%Y-%m-%d'),
             'papers': {}
@@ -159,9 +164,11 @@ class CitationTracker:
                 new_count = info['citation_count']
 
                 # Update paper data
-                paper['citation_count'] = new_count
-                paper['influential_citation_count'] = info.get('influential_citation_count', 0)
-                paper['citation_last_checked'] = info['last_checked']
+                store.update_paper(paper_id, {
+                    'citation_count': new_count,
+                    'influential_citation_count': info.get('influential_citation_count', 0),
+                    'citation_last_checked': info['last_checked']
+                })
 
                 # Record in history
                 citation_history_entry['papers'][paper_id] = {
@@ -187,25 +194,106 @@ class CitationTracker:
                     'title': paper.get('title', '')
                 })
 
+        self._finish_update(store, series, citation_history_entry, migrated)
+        return stats
+
+    @staticmethod
+    def _open_series(store: PaperStore, papers_yaml_path: str) -> Tuple[CitationSeries, bool]:
+        """Open the citation series, moving snapshots still stored in papers.yaml into it."""
+        series = CitationSeries(default_series_path(papers_yaml_path))
+        legacy_history = store.pop_citation_history()
+        if legacy_history:
+            series.migrate(legacy_history)
+            print(f"📦 Migrated {len(legacy_history)} citation snapshots out of papers.yaml")
+        return series, bool(legacy_history)
+
+    @staticmethod
+    def _finish_update(store: PaperStore, series: CitationSeries,
+                       citation_history_entry: Dict, migrated: bool):
+        """Record the snapshot, save the series and export the store."""
         # Add history entry if we updated any papers
         if citation_history_entry['papers']:
-            data['citation_history'].append(citation_history_entry)
+            series.record(citation_history_entry['date'], citation_history_entry['papers'])
 
-            # Keep only last 365 days of history
-            cutoff_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-            data['citation_history'] = [
-                entry for entry in data['citation_history']
-                if entry.get('date', '') >= cutoff_date
-            ]
+        # Downsample old snapshots (daily -> weekly -> monthly) instead of dropping them
+        if citation_history_entry['papers'] or migrated:
+            series.downsample()
+            series.save()
 
         # Update metadata
-        if 'metadata' in data:
-            data['metadata']['last_citation_update'] = datetime.now().strftime('%Y-%m-%d')
+        if store.get_section('metadata') is not None:
+            store.update_metadata(last_citation_update=datetime.now().strftime('%Y-%m-%d'))
 
         # Save updated data
-        with open(papers_yaml_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, allow_unicode=True, sort_keys=False)
+        store.export_yaml()
+        store.close()
+
+    def import_citation_dump(self, papers_yaml_path: str, dump_paths: List[str],
+                             dump_format: str = 'auto') -> Dict:
+        """
+        Update citation counts from local bulk dumps instead of the API.
+
+        Args:
+            papers_yaml_path: Path to papers.yaml file
+            dump_paths: Semantic Scholar papers or OpenAlex works dump files (.jsonl[.gz])
+            dump_format: 's2', 'openalex' or 'auto' (see citation_dump.py)
+
+        Returns:
+            Dictionary with update statistics
+        """
+        store = PaperStore(papers_yaml_path)
+        series, migrated = self._open_series(store, papers_yaml_path)
 
+        stats = {
+            'total': 0,
+            'updated': 0,
+            'skipped': 0,
+            'failed': 0,
+            'errors': []
+        }
+
+        # arXiv ID -> paper IDs (the only per-paper state held while scanning)
+        targets: Dict[str, List[str]] = {}
+        for paper in store.iter_papers():
+            stats['total'] += 1
+            if paper.get('arxiv_id'):
+                targets.setdefault(base_arxiv_id(paper['arxiv_id']), []).append(paper['id'])
+            else:
+                stats['skipped'] += 1
+
+        print(f"📂 Scanning {len(dump_paths)} dump file(s) for {len(targets)} arXiv papers...")
+        scan_stats: Dict = {}
+        found = scan_dumps(dump_paths, set(targets), dump_format, scan_stats)
+        print(f"   {scan_stats.get('records', 0):,} records scanned, "
+              f"{len(found)} of our papers found"
+              + (f", {scan_stats['malformed']} malformed lines skipped" if scan_stats.get('malformed') else ""))
+
+        checked = datetime.now().isoformat()
+        citation_history_entry = {
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            'papers': {}
+        }
+
+        with store.batch():
+            for arxiv_id, paper_ids in targets.items():
+                if arxiv_id not in found:
+                    stats['failed'] += len(paper_ids)
+                    continue
+                citations, influential = found[arxiv_id]
+                for paper_id in paper_ids:
+                    changes = {'citation_count': citations, 'citation_last_checked': checked}
+                    if influential is not None:
+                        changes['influential_citation_count'] = influential
+                    store.update_paper(paper_id, changes)
+
+                    paper = store.get_paper(paper_id) or {}
+                    citation_history_entry['papers'][paper_id] = {
+                        'citation_count': citations,
+                        'influential_count': paper.get('influential_citation_count', 0)
+                    }
+                    stats['updated'] += 1
+
+        self._finish_update(store, series, citation_history_entry, migrated)
         return stats
 
     def generate_citation_report(self, papers_yaml_path: str, output_file: Optional[str] = None) -> str:
@@ -220,10 +308,8 @@ class CitationTracker:
             Report as string
         """
         # Load papers data
-        with open(papers_yaml_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-
-        papers = data.get('papers', [])
+        with PaperStore(papers_yaml_path) as store:
+            papers = store.get_papers()
 
         # Sort by citation count
         papers_sorted = sorted(
@@ -321,6 +407,27 @@ def main():
         default=REQUEST_DELAY,
         help=f'Delay between API requests in seconds (default: {REQUEST_DELAY})'
     )
+    parser.add_argument(
+        '--http-cache',
+        choices=CACHE_MODES,
+        default=None,
+        help='HTTP cache mode: record, replay (offline) or revalidate '
+             '(default: $PAPER_HTTP_CACHE or off)'
+    )
+
+    parser.add_argument(
+        '--from-dump',
+        nargs='+',
+        metavar='FILE',
+        help='Update from local Semantic Scholar papers or OpenAlex works dump files '
+             '(.jsonl or .jsonl.gz) instead of the API'
+    )
+    parser.add_argument(
+        '--dump-format',
+        choices=DUMP_FORMATS,
+        default='auto',
+        help='Format of the --from-dump files (default: auto)'
+    )
 
     args = parser.parse_args()
 
@@ -329,7 +436,7 @@ def main():
         print(f"Error: Papers file not found: {args.papers_yaml}", file=sys.stderr)
         return 1
 
-    tracker = CitationTracker(api_delay=args.delay)
+    tracker = CitationTracker(api_delay=args.delay, http_cache=args.http_cache)
 
     if args.report:
         # Generate report only
@@ -339,8 +446,16 @@ def main():
             print("\n" + report)
     else:
         # Update citation counts
-        print("\n🔍 Starting citation tracking...\n")
-        stats = tracker.update_citation_counts(args.papers_yaml, force_update=args.force)
+        if args.from_dump:
+            missing = [path for path in args.from_dump if not os.path.exists(path)]
+            if missing:
+                print(f"Error: Dump file not found: {missing[0]}", file=sys.stderr)
+                return 1
+            print("\n📦 Importing citation counts from dump...\n")
+            stats = tracker.import_citation_dump(args.papers_yaml, args.from_dump, args.dump_format)
+        else:
+            print("\n🔍 Starting citation tracking...\n")
+            stats = tracker.update_citation_counts(args.papers_yaml, force_update=args.force)
 
         # Print summary
         print("\n" + "="*60)
@@ -349,7 +464,7 @@ def main():
         print(f"Total papers: {stats['total']}")
         print(f"✅ Updated: {stats['updated']}")
         print(f"⏭️  Skipped: {stats['skipped']}")
-        print(f"❌ Failed: {stats['failed']}")
+        print(f"❌ {'Not in dump' if args.from_dump else 'Failed'}: {stats['failed']}")
 
         if stats['errors']:
             print("\n⚠️  Errors:")
@@ -4,11 +4,12 @@ Create GitHub Issue for Paper Review
 Generates an issue with papers needing review
 """
 
-import json
-import os
 import subprocess
 from datetime import datetime
 
+from pipeline_io import AUDIO_PATH, SUMMARIES_PATH, find_stage_file, read_records
+from seen_set import mark_seen
+
 
 def create_issue_body(papers: list) -> str:
     """Create markdown body for GitHub issue"""
@@ -142,6 +143,8 @@ def create_issue(papers: list):
         if result.returncode == 0:
             print(f"✅ Issue created successfully!")
             print(result.stdout)
+            # Proposed papers never come back in a later issue
+            mark_seen(papers, "proposed")
         else:
             print(f"❌ Error creating issue: {result.stderr}")
 
@@ -152,20 +155,15 @@ def create_issue(papers: list):
 
 
 def main():
-    input_file = "data/papers/pending/with_audio.json"
-
-    if not os.path.exists(input_file):
-        # Try with summaries file
-        input_file = "data/papers/pending/with_summaries.json"
+    # Prefer the audio stage output, fall back to the summaries
+    input_file = find_stage_file(AUDIO_PATH, SUMMARIES_PATH)
 
-    if not os.path.exists(input_file):
+    if input_file is None:
         print(f"❌ No processed papers found")
         return
 
     # Load papers
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        papers = data.get("papers", [])
+    papers = list(read_records(input_file))
 
     print(f"📋 Creating review issue for {len(papers)} papers...")
     create_issue(papers)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Candidate Enrichment with Semantic Scholar
+Attaches venue, author h-index and early citation counts to scraped papers
+
+Runs between arxiv_scraper.py and smart_filter.py:
+
+    candidates.jsonl -> enrich_candidates.py -> enriched.jsonl -> smart_filter.py
+
+Candidates are looked up with the Semantic Scholar batch endpoint
+(POST /paper/batch, up to 500 IDs per request), so a daily run costs a
+handful of requests instead of one per paper. Each found paper gets an
+"s2" record:
+
+    "s2": {"venue": "CVPR", "citation_count": 3, "influential_citation_count": 0,
+           "max_author_h_index": 42, "author_h_indices": [42, 7, 3],
+           "checked_at": "2025-11-17T06:02:11"}
+
+Papers Semantic Scholar does not know yet pass through unchanged, and so
+does everything when the API is unreachable, so the filter always has
+input. The API base URL can point at a local stand-in server (--api-url or
+SEMANTIC_SCHOLAR_API_URL), e.g. for tests.
+"""
+
+import os
+import sys
+import time
+import argparse
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+from citation_tracker import SEMANTIC_SCHOLAR_API, REQUEST_DELAY
+from http_cache import CACHE_MODES, install_cache
+from http_transport import RateLimiter, RateLimitedAdapter, TransferStats
+from pipeline_io import CANDIDATES_PATH, ENRICHED_PATH, RecordWriter, read_records
+from seen_set import base_arxiv_id
+
+
+BATCH_SIZE = 500  # IDs per request (Semantic Scholar batch endpoint limit)
+BATCH_FIELDS = ("venue,publicationVenue,year,citationCount,influentialCitationCount,"
+                "authors.name,authors.hIndex")
+MAX_RETRIES = 3
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class SemanticScholarEnricher:
+    """Batch lookup of candidate papers on Semantic Scholar"""
+
+    def __init__(self, api_url: Optional[str] = None, api_key: Optional[str] = None,
+                 batch_size: int = BATCH_SIZE, api_delay: float = REQUEST_DELAY,
+                 http_cache: Optional[str] = None):
+        """
+        Initialize enricher
+
+        Args:
+            api_url: Graph API base URL (default: $SEMANTIC_SCHOLAR_API_URL or the public API)
+            api_key: Optional API key (default: $SEMANTIC_SCHOLAR_API_KEY)
+            batch_size: Papers per batch request
+            api_delay: Minimum seconds between requests
+            http_cache: HTTP cache mode (see http_cache.py; default: $PAPER_HTTP_CACHE or off)
+        """
+        self.api_url = (api_url or os.environ.get("SEMANTIC_SCHOLAR_API_URL")
+                        or SEMANTIC_SCHOLAR_API).rstrip("/")
+        self.batch_size = max(1, min(batch_size, BATCH_SIZE))
+        self.stats = TransferStats()
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'Academic-Paper-Tracker/1.0'})
+        api_key = api_key or os.environ.get("SEMANTIC_SCHOLAR_API_KEY")
+        if api_key:
+            self.session.headers['x-api-key'] = api_key
+        install_cache(self.session, http_cache, inner=RateLimitedAdapter(RateLimiter(api_delay)))
+        self.stats.install(self.session)
+
+    def lookup(self, arxiv_ids: List[str]) -> List[Optional[Dict]]:
+        """
+        Look up one batch of papers
+
+        Args:
+            arxiv_ids: arXiv IDs (with or without version)
+
+        Returns:
+            Semantic Scholar records in input order (None where not found)
+
+        Raises:
+            requests.RequestException: If the batch still fails after retries
+        """
+        ids = [f"arXiv:{base_arxiv_id(arxiv_id)}" for arxiv_id in arxiv_ids]
+        for attempt in range(MAX_RETRIES + 1):
+            response = self.session.post(f"{self.api_url}/paper/batch",
+                                         params={'fields': BATCH_FIELDS},
+                                         json={'ids': ids}, timeout=30)
+            if response.status_code not in RETRY_STATUS or attempt == MAX_RETRIES:
+                break
+            wait = float(response.headers.get('Retry-After') or 2 ** attempt)
+            print(f"   ⏳ Semantic Scholar returned {response.status_code}, retrying in {wait:.0f}s...")
+            time.sleep(wait)
+
+        response.raise_for_status()
+        records = response.json()
+        if not isinstance(records, list) or len(records) != len(ids):
+            raise ValueError(f"Unexpected batch response for {len(ids)} IDs")
+        return records
+
+    @staticmethod
+    def to_enrichment(record: Dict) -> Dict:
+        """Condense a Semantic Scholar record into the candidate's "s2" field"""
+        venue = record.get('venue') or ((record.get('publicationVenue') or {}).get('name')) or ""
+        h_indices = [author.get('hIndex') or 0 for author in record.get('authors') or []]
+        return {
+            'venue': venue,
+            'year': record.get('year'),
+            'citation_count': record.get('citationCount') or 0,
+            'influential_citation_count': record.get('influentialCitationCount') or 0,
+            'max_author_h_index': max(h_indices, default=0),
+            'author_h_indices': h_indices,
+            'checked_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def enrich(self, papers: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Attach Semantic Scholar data to papers, one batch request per batch_size papers
+
+        Args:
+            papers: Candidate papers (streamed)
+
+        Yields:
+            The same papers, in order, with "s2" added where found
+        """
+        batch: List[Dict] = []
+        for paper in papers:
+            batch.append(paper)
+            if len(batch) >= self.batch_size:
+                yield from self._enrich_batch(batch)
+                batch = []
+        if batch:
+            yield from self._enrich_batch(batch)
+
+    def _enrich_batch(self, batch: List[Dict]) -> List[Dict]:
+        with_ids = [paper for paper in batch if paper.get("arxiv_id")]
+        if not with_ids:
+            return batch
+        try:
+            records = self.lookup([paper["arxiv_id"] for paper in with_ids])
+        except (requests.RequestException, ValueError) as e:
+            # Enrichment is optional; the filter falls back to its heuristics
+            print(f"⚠️  Warning: Semantic Scholar lookup failed for {len(with_ids)} papers: {e}")
+            return batch
+
+        found = 0
+        for paper, record in zip(with_ids, records):
+            if record:
+                paper["s2"] = self.to_enrichment(record)
+                found += 1
+        print(f"   📚 Batch of {len(with_ids)}: {found} found on Semantic Scholar")
+        return batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enrich candidates with Semantic Scholar metadata")
+    parser.add_argument("--input", default=CANDIDATES_PATH, help="Input JSONL file")
+    parser.add_argument("--output", default=ENRICHED_PATH, help="Output JSONL file")
+    parser.add_argument("--api-url", default=None,
+                        help="Semantic Scholar Graph API base URL "
+                             "(default: $SEMANTIC_SCHOLAR_API_URL or the public API)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"Papers per batch request (max {BATCH_SIZE})")
+    parser.add_argument("--delay", type=float, default=REQUEST_DELAY,
+                        help="Minimum seconds between API requests")
+    parser.add_argument("--http-cache", choices=CACHE_MODES, default=None,
+                        help="HTTP cache mode: record, replay (offline) or revalidate "
+                             "(default: $PAPER_HTTP_CACHE or off)")
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"❌ Error: {args.input} not found")
+        print("   Run arxiv_scraper.py first")
+        return 1
+
+    enricher = SemanticScholarEnricher(api_url=args.api_url, batch_size=args.batch_size,
+                                       api_delay=args.delay, http_cache=args.http_cache)
+    print(f"🔎 Enriching candidates from {args.input} via {enricher.api_url}...")
+
+    enriched = 0
+    with RecordWriter(args.output) as out:
+        for paper in enricher.enrich(read_records(args.input)):
+            enriched += "s2" in paper
+            out.write(paper)
+
+    print(f"📶 Semantic Scholar: {enricher.stats.summary()}")
+    print(f"✅ Enriched {enriched}/{out.count} candidates, saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
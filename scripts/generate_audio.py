@@ -4,12 +4,14 @@ Audio Generator using Edge TTS (Free)
 Converts paper summaries to audio files
 """
 
-import json
 import os
 import asyncio
 import edge_tts
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
+
+from pipeline_io import AUDIO_PATH, SUMMARIES_PATH, RecordWriter, read_records
+from seen_set import DEFAULT_SEEN_PATH, mark_seen
 
 
 class AudioGenerator:
@@ -61,56 +63,69 @@ class AudioGenerator:
             print(f"   ❌ Error generating audio: {e}")
             return None
 
-    async def process_papers(self, input_file: str, output_file: str):
-        """Process all papers and generate audio"""
-        # Load papers
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            papers = data.get("papers", [])
+    async def process_papers(self, input_file: str, output_file: str,
+                             seen_file: Optional[str] = DEFAULT_SEEN_PATH,
+                             resume: bool = False, follow: bool = False):
+        """Generate audio paper by paper, appending each to the output as it is done"""
+        print(f"\n🔊 Generating audio for papers from {input_file}...")
 
-        print(f"\n🔊 Generating audio for {len(papers)} papers...")
+        voiced = []
+        with RecordWriter(output_file, resume=resume) as out:
+            if out.done_ids:
+                print(f"⏩ Resuming after {len(out.done_ids)} already processed papers")
 
-        # Generate audio for each paper
-        for i, paper in enumerate(papers, 1):
-            paper_id = paper.get("arxiv_id", f"paper_{i}")
-            title = paper.get("title", "")[:50]
+            for paper in read_records(input_file, follow=follow):
+                if paper.get("arxiv_id") in out.done_ids:
+                    continue
+                i = out.count + 1
+                paper_id = paper.get("arxiv_id", f"paper_{i}")
+                title = paper.get("title", "")[:50]
 
-            print(f"\n[{i}/{len(papers)}] {title}...")
+                print(f"\n[{i}] {title}...")
 
-            audio_url = await self.generate_paper_audio(paper, paper_id)
+                audio_url = await self.generate_paper_audio(paper, paper_id)
 
-            if audio_url:
-                if "ai_summaries" not in paper:
-                    paper["ai_summaries"] = {}
-                paper["ai_summaries"]["audio_url"] = audio_url
+                if audio_url:
+                    if "ai_summaries" not in paper:
+                        paper["ai_summaries"] = {}
+                    paper["ai_summaries"]["audio_url"] = audio_url
+                    voiced.append(paper)
 
-        # Save updated data
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+                out.write(paper)
 
         print(f"\n✅ Audio generation complete!")
         print(f"📁 Audio files saved to: {self.output_dir}")
         print(f"📄 Updated data saved to: {output_file}")
 
+        if seen_file:
+            mark_seen(voiced, "voiced", path=seen_file)
+
 
 def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="Generate audio summaries")
-    parser.add_argument("--input", default="data/papers/pending/with_summaries.json",
-                        help="Input JSON with summaries")
-    parser.add_argument("--output", default="data/papers/pending/with_audio.json",
-                        help="Output JSON file")
+    parser.add_argument("--input", default=SUMMARIES_PATH,
+                        help="Input JSONL with summaries")
+    parser.add_argument("--output", default=AUDIO_PATH,
+                        help="Output JSONL file")
+    parser.add_argument("--seen-file", default=DEFAULT_SEEN_PATH,
+                        help="Seen-set to record voiced papers in ('' to skip)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run, keeping the papers already in --output")
+    parser.add_argument("--follow", action="store_true",
+                        help="Consume --input while the summary stage is still writing it")
 
     args = parser.parse_args()
 
-    if not os.path.exists(args.input):
+    if not args.follow and not os.path.exists(args.input):
         print(f"❌ Error: {args.input} not found")
         print("   Run generate_summaries.py first")
         return
 
     generator = AudioGenerator()
-    asyncio.run(generator.process_papers(args.input, args.output))
+    asyncio.run(generator.process_papers(args.input, args.output, args.seen_file,
+                                         args.resume, args.follow))
 
 
 if __name__ == "__main__":
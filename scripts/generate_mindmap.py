@@ -8,12 +8,13 @@ visualizing the paper structure and main ideas using Mermaid.js syntax.
 
 import os
 import sys
-import yaml
 import argparse
 import re
 from typing import Dict, List, Optional
 from pathlib import Path
 
+from paper_store import PaperStore
+
 
 def sanitize_text(text: str, max_length: int = 100) -> str:
     """
@@ -157,15 +158,10 @@ def generate_mindmap_for_all_papers(papers_yaml_path: str, output_dir: Optional[
     Returns:
         Number of mindmaps generated
     """
-    # Load papers data
-    with open(papers_yaml_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
-
-    papers = data.get('papers', [])
-
-    if not papers:
-        print("No papers found in database")
-        return 0
+    # Read through the store so journaled edits not yet exported are included;
+    # papers are streamed when writing separate files
+    store = PaperStore(papers_yaml_path)
+    papers = store.iter_papers() if output_dir else store.get_papers()
 
     # Create output directory if specified
     if output_dir:
@@ -185,15 +181,19 @@ def generate_mindmap_for_all_papers(papers_yaml_path: str, output_dir: Optional[
                 f.write(mindmap)
             print(f"Generated mindmap for: {paper.get('title', paper_id)}")
 
-        # Also add to paper data (for Hugo integration)
-        paper['mindmap'] = mindmap
+        else:
+            # Embed in paper data instead (for Hugo integration)
+            store.update_paper(paper_id, {'mindmap': mindmap})
 
         count += 1
 
-    # Save updated data back to YAML (with mindmaps embedded)
-    if output_dir is None:  # Only update YAML if not saving to separate files
-        with open(papers_yaml_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, allow_unicode=True, sort_keys=False)
+    if count == 0:
+        print("No papers found in database")
+
+    if not output_dir and count:
+        # Save updated data back to YAML (with mindmaps embedded)
+        store.export_yaml()
+    store.close()
 
     return count
 
@@ -228,11 +228,8 @@ def main():
     # Generate mindmaps
     if args.paper_id:
         # Generate for specific paper
-        with open(args.papers_yaml, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-
-        papers = data.get('papers', [])
-        paper = next((p for p in papers if p.get('id') == args.paper_id), None)
+        with PaperStore(args.papers_yaml) as store:
+            paper = store.get_paper(args.paper_id)
 
         if not paper:
             print(f"Error: Paper ID not found: {args.paper_id}", file=sys.stderr)
@@ -4,13 +4,15 @@ AI Summary Generator using Groq API (Free)
 Generates multiple types of summaries for research papers
 """
 
-import json
 import os
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional
 from groq import Groq
 import argparse
 
+from pipeline_io import FILTERED_PATH, SUMMARIES_PATH, RecordWriter, read_records
+from seen_set import DEFAULT_SEEN_PATH, mark_seen
+
 
 class SummaryGenerator:
     """Generate AI summaries using Groq's free API"""
@@ -235,60 +237,65 @@ Abstract: {abstract}
         print(f"   ✅ Generated {success_count}/5 summaries successfully (fallbacks used for others)")
         return summaries
 
-    def process_papers(self, input_file: str, output_file: str):
-        """Process all papers and generate summaries"""
-        # Load papers
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            papers = data.get("papers", [])
-
-        if not papers:
-            print("⚠️  No papers found to process")
-            return
-
-        print(f"🤖 Processing {len(papers)} papers with Groq AI...")
+    def process_papers(self, input_file: str, output_file: str,
+                       seen_file: Optional[str] = DEFAULT_SEEN_PATH):
+        """
+        Summarize papers one at a time, appending each to the output as it is done
+
+        Args:
+            input_file: Filtered papers (JSONL stage file)
+            output_file: Papers with summaries (JSONL stage file)
+            seen_file: Seen-set to record summarized papers in (None/'' to skip)
+        """
+        print(f"🤖 Processing papers from {input_file} with Groq AI...")
         print(f"   Model: {self.model}")
         print(f"   Retries: {self.max_retries}")
 
         total_success = 0
         total_failures = 0
+        summarized = []
 
         # Generate summaries for each paper
-        for i, paper in enumerate(papers, 1):
-            print(f"\n[{i}/{len(papers)}]", end=" ")
-
-            try:
-                summaries = self.generate_all_summaries(paper)
-                paper["ai_summaries"] = summaries
-                total_success += 1
-
+        with RecordWriter(output_file) as out:
+            for i, paper in enumerate(read_records(input_file), 1):
                 # Small delay to avoid rate limiting
-                if i < len(papers):
+                if i > 1:
                     time.sleep(0.5)
 
-            except Exception as e:
-                print(f"   ❌ Failed to process paper: {str(e)[:100]}")
-                paper["ai_summaries"] = {
-                    "tldr": paper.get("title", "Error"),
-                    "short": "Summary generation failed. Please check logs.",
-                    "detailed": "Summary generation failed. Please check logs.",
-                    "key_contributions": ["Summary generation failed."],
-                    "chinese": "摘要生成失败"
-                }
-                total_failures += 1
-
-        # Save results
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+                print(f"\n[{i}]", end=" ")
+
+                try:
+                    summaries = self.generate_all_summaries(paper)
+                    paper["ai_summaries"] = summaries
+                    total_success += 1
+
+                except Exception as e:
+                    print(f"   ❌ Failed to process paper: {str(e)[:100]}")
+                    paper["ai_summaries"] = {
+                        "tldr": paper.get("title", "Error"),
+                        "short": "Summary generation failed. Please check logs.",
+                        "detailed": "Summary generation failed. Please check logs.",
+                        "key_contributions": ["Summary generation failed."],
+                        "chinese": "摘要生成失败"
+                    }
+                    total_failures += 1
+
+                out.write(paper)
+                summarized.append({"arxiv_id": paper.get("arxiv_id")})
+
+        if not out.count:
+            print("⚠️  No papers found to process")
 
         print(f"\n" + "="*60)
         print(f"✅ Processing complete!")
-        print(f"   Successful: {total_success}/{len(papers)}")
-        print(f"   Failed: {total_failures}/{len(papers)}")
+        print(f"   Successful: {total_success}/{out.count}")
+        print(f"   Failed: {total_failures}/{out.count}")
         print(f"   Output: {output_file}")
         print("="*60)
 
+        if seen_file:
+            mark_seen(summarized, "summarized", path=seen_file)
+
 
 def test_api_connection(api_key: str):
     """Test Groq API connection"""
@@ -316,12 +323,14 @@ def test_api_connection(api_key: str):
 
 def main():
     parser = argparse.ArgumentParser(description="Generate AI summaries using Groq")
-    parser.add_argument("--input", default="data/papers/pending/filtered.json",
-                        help="Input JSON file with filtered papers")
-    parser.add_argument("--output", default="data/papers/pending/with_summaries.json",
-                        help="Output JSON file")
+    parser.add_argument("--input", default=FILTERED_PATH,
+                        help="Input JSONL file with filtered papers")
+    parser.add_argument("--output", default=SUMMARIES_PATH,
+                        help="Output JSONL file")
     parser.add_argument("--api-key", help="Groq API key (or set GROQ_API_KEY env var)")
     parser.add_argument("--test", action="store_true", help="Test API connection only")
+    parser.add_argument("--seen-file", default=DEFAULT_SEEN_PATH,
+                        help="Seen-set to record summarized papers in ('' to skip)")
 
     args = parser.parse_args()
 
@@ -361,7 +370,7 @@ def main():
     # Generate summaries
     try:
         generator = SummaryGenerator(api_key)
-        generator.process_papers(args.input, args.output)
+        generator.process_papers(args.input, args.output, args.seen_file)
         print("\n🎉 Summary generation complete!")
     except Exception as e:
         print(f"\n❌ Fatal error: {e}")
@@ -4,12 +4,14 @@ Multi-API AI Summary Generator
 Supports: Groq, Google Gemini, DeepSeek
 """
 
-import json
 import os
 import time
 from typing import Dict, List, Optional
 import argparse
 
+from pipeline_io import FILTERED_PATH, SUMMARIES_PATH, RecordWriter, read_records
+from seen_set import DEFAULT_SEEN_PATH, mark_seen
+
 
 class MultiAPIGenerator:
     """Generate AI summaries using multiple API providers"""
@@ -296,6 +298,10 @@ class MultiAPIGenerator:
 
         return None
 
+    def complete(self, prompt: str, max_tokens: int = 500) -> Optional[str]:
+        """Send a free-form prompt to the active provider (None in fallback mode or on failure)"""
+        return self._call_api(prompt, max_tokens=max_tokens)
+
     def generate_summary(self, title: str, abstract: str) -> str:
         """Generate short summary"""
         if not abstract or len(abstract.strip()) < 50:
@@ -365,50 +371,67 @@ Key Contributions:"""
         print(f"   ✅ Generated using {summaries['provider']}")
         return summaries
 
-    def process_papers(self, input_file: str, output_file: str):
-        """Process all papers"""
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            papers = data.get("papers", [])
-
-        if not papers:
-            print("⚠️  No papers found")
-            return
+    def process_papers(self, input_file: str, output_file: str,
+                       seen_file: Optional[str] = DEFAULT_SEEN_PATH,
+                       resume: bool = False, follow: bool = False):
+        """
+        Summarize papers one at a time, appending each to the output as it is done
 
-        print(f"🤖 Processing {len(papers)} papers...")
+        Args:
+            input_file: Filtered papers (JSONL stage file)
+            output_file: Papers with summaries (JSONL stage file)
+            seen_file: Seen-set to record summarized papers in (None/'' to skip)
+            resume: Keep papers an interrupted run already summarized
+            follow: Start before the filter stage has finished writing input_file
+        """
+        print(f"🤖 Processing papers from {input_file}...")
         print(f"   Provider: {self.api_provider or 'fallback mode'}")
         if self.model_name:
             print(f"   Model: {self.model_name}")
         print()
 
-        for i, paper in enumerate(papers, 1):
-            print(f"[{i}/{len(papers)}]", end=" ")
-            summaries = self.generate_all_summaries(paper)
-            paper["ai_summaries"] = summaries
+        with RecordWriter(output_file, resume=resume) as out:
+            if out.done_ids:
+                print(f"⏩ Resuming after {len(out.done_ids)} already summarized papers")
+            summarized = [{"arxiv_id": arxiv_id} for arxiv_id in out.done_ids]
 
-            # Rate limiting
-            if i < len(papers):
-                time.sleep(0.5)
+            for paper in read_records(input_file, follow=follow):
+                if paper.get("arxiv_id") in out.done_ids:
+                    continue
+                # Rate limiting
+                if summarized:
+                    time.sleep(0.5)
 
-        # Save results
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+                print(f"[{len(summarized) + 1}]", end=" ")
+                paper["ai_summaries"] = self.generate_all_summaries(paper)
+                out.write(paper)
+                summarized.append({"arxiv_id": paper.get("arxiv_id")})
+
+        if not summarized:
+            print("⚠️  No papers found")
+        print(f"\n✅ Saved {out.count} papers to {output_file}")
 
-        print(f"\n✅ Saved to {output_file}")
+        if seen_file:
+            mark_seen(summarized, "summarized", path=seen_file)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Multi-API Summary Generator")
-    parser.add_argument("--input", default="data/papers/pending/filtered.json")
-    parser.add_argument("--output", default="data/papers/pending/with_summaries.json")
+    parser.add_argument("--input", default=FILTERED_PATH)
+    parser.add_argument("--output", default=SUMMARIES_PATH)
     parser.add_argument("--provider", default="auto",
                        choices=["auto", "gemini", "groq", "deepseek", "zhipu", "openai", "claude", "kimi"],
                        help="API provider (auto tries all in order)")
+    parser.add_argument("--seen-file", default=DEFAULT_SEEN_PATH,
+                       help="Seen-set to record summarized papers in ('' to skip)")
+    parser.add_argument("--resume", action="store_true",
+                       help="Continue an interrupted run, keeping the papers already in --output")
+    parser.add_argument("--follow", action="store_true",
+                       help="Consume --input while the filter stage is still writing it")
 
     args = parser.parse_args()
 
-    if not os.path.exists(args.input):
+    if not args.follow and not os.path.exists(args.input):
         print(f"❌ Error: {args.input} not found")
         return
 
@@ -418,7 +441,7 @@ def main():
     print()
 
     generator = MultiAPIGenerator(api_provider=args.provider)
-    generator.process_papers(args.input, args.output)
+    generator.process_papers(args.input, args.output, args.seen_file, args.resume, args.follow)
 
     print("\n🎉 Complete!")
 
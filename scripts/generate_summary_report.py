@@ -8,13 +8,16 @@ including statistics, trends, and highlights.
 
 import os
 import sys
-import yaml
 import argparse
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict, Counter
 
+from citation_series import CitationSeries, default_series_path
+from paper_index import PaperIndex
+from paper_store import PaperStore
+
 
 class ReportGenerator:
     """Generate summary reports for paper collection."""
@@ -30,11 +33,13 @@ class ReportGenerator:
         self.data = self._load_data()
         self.papers = self.data.get('papers', [])
         self.categories = self.data.get('categories', [])
+        self.index = PaperIndex(self.papers)
+        self.category_map = {cat['id']: cat for cat in self.categories}
 
     def _load_data(self) -> Dict:
-        """Load papers data from YAML."""
-        with open(self.papers_yaml_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        """Load papers data from the paper store."""
+        with PaperStore(self.papers_yaml_path) as store:
+            return store.load_document()
 
     def _get_date_range(self, period: str) -> Tuple[datetime, datetime]:
         """
@@ -133,35 +138,23 @@ class ReportGenerator:
 
     def _get_citation_growth(self) -> List[Dict]:
         """
-        Analyze citation growth from history.
+        Analyze citation growth between the two latest citation snapshots.
 
         Returns:
             List of papers with significant citation growth
         """
-        citation_history = self.data.get('citation_history', [])
-        if len(citation_history) < 2:
-            return []
-
-        # Get latest and previous entries
-        latest = citation_history[-1]
-        previous = citation_history[-2] if len(citation_history) > 1 else {}
-
-        latest_papers = latest.get('papers', {})
-        previous_papers = previous.get('papers', {})
+        series = CitationSeries(default_series_path(self.papers_yaml_path))
 
         growth_papers = []
-        for paper_id, latest_data in latest_papers.items():
-            latest_count = latest_data.get('citation_count', 0)
-            previous_count = previous_papers.get(paper_id, {}).get('citation_count', 0)
-
-            if latest_count > previous_count:
+        for paper_id, (growth, total) in series.growth_since_previous().items():
+            if growth > 0:
                 # Find paper details
-                paper = next((p for p in self.papers if p.get('id') == paper_id), None)
+                paper = self.index.get(paper_id)
                 if paper:
                     growth_papers.append({
                         'paper': paper,
-                        'growth': latest_count - previous_count,
-                        'total': latest_count
+                        'growth': growth,
+                        'total': total
                     })
 
         return sorted(growth_papers, key=lambda x: x['growth'], reverse=True)
@@ -271,7 +264,7 @@ class ReportGenerator:
                 if categories:
                     cat_names = []
                     for cat_id in categories:
-                        cat = next((c for c in self.categories if c['id'] == cat_id), None)
+                        cat = self.category_map.get(cat_id)
                         if cat:
                             cat_names.append(cat['name'])
                     if cat_names:
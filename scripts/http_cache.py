@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+On-disk record/replay cache for the HTTP clients (arXiv, Semantic Scholar).
+
+CachingAdapter is a requests transport adapter; mount it on a client's
+session (see install_cache) and every request goes through the cache:
+
+- record:     always hit the network and store the response
+- replay:     serve only from the cache, never touch the network (offline
+              runs, benchmarks against recorded fixtures); a miss raises
+              requests.ConnectionError
+- revalidate: serve cached responses while they are fresh (per-endpoint
+              TTL); once stale, send a conditional request (If-None-Match /
+              If-Modified-Since) and reuse the body on 304 Not Modified
+
+Entries are keyed by method, normalized URL (lowercase host, sorted query
+parameters) and request body, and stored as one JSON file each under
+.cache/http/<host>/. The mode can be set with --http-cache on the scripts or
+the PAPER_HTTP_CACHE environment variable.
+"""
+
+import os
+import json
+import time
+import base64
+import hashlib
+from datetime import timedelta
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from atomic_io import atomic_write
+from http_transport import mount_adapter
+
+
+CACHE_MODES = ('off', 'record', 'replay', 'revalidate')
+DEFAULT_CACHE_DIR = '.cache/http'
+CACHE_ENTRY_VERSION = 1
+
+# Freshness per endpoint (host + path prefix -> seconds), longest prefix wins
+DEFAULT_TTLS = {
+    'export.arxiv.org/api/query': 6 * 3600,
+    'api.semanticscholar.org/graph/v1': 24 * 3600,
+}
+DEFAULT_TTL = 3600
+
+# Responses worth replaying (404 matters: callers use it to try ID variants)
+CACHEABLE_STATUS = (200, 404)
+CACHEABLE_METHODS = ('GET', 'POST')
+
+CACHE_HEADER = 'X-Paper-Cache'
+
+
+def normalize_url(url: str) -> str:
+    """URL with lowercase scheme/host, no fragment and sorted query parameters."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+
+def is_cached(response: requests.Response) -> bool:
+    """Whether a response was served from the cache (no network request)."""
+    return response.headers.get(CACHE_HEADER) in ('hit', 'revalidated')
+
+
+class HTTPCache:
+    """Directory of cached HTTP responses."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = DEFAULT_TTL):
+        """
+        Args:
+            cache_dir: Directory holding the cache entries
+            ttls: Seconds a response stays fresh, per host + path prefix
+            default_ttl: Freshness for endpoints not listed in ttls
+        """
+        self.cache_dir = cache_dir
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+
+    def key(self, request: requests.PreparedRequest) -> str:
+        """Cache key of a request: method, normalized URL and body."""
+        body = request.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        digest = hashlib.sha256()
+        digest.update(f"{request.method} {normalize_url(request.url)}\n".encode('utf-8'))
+        digest.update(body)
+        return digest.hexdigest()
+
+    def path(self, request: requests.PreparedRequest) -> str:
+        host = urlsplit(request.url).netloc.lower().replace(':', '_') or 'local'
+        return os.path.join(self.cache_dir, host, self.key(request) + '.json')
+
+    def ttl(self, url: str) -> float:
+        """Freshness lifetime for a URL (longest matching endpoint prefix)."""
+        parts = urlsplit(url)
+        target = parts.netloc.lower() + parts.path
+        matches = [prefix for prefix in self.ttls if target.startswith(prefix)]
+        return self.ttls[max(matches, key=len)] if matches else self.default_ttl
+
+    def load(self, request: requests.PreparedRequest) -> Optional[Dict]:
+        """Return the cache entry for a request, or None."""
+        try:
+            with open(self.path(request), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('version') == CACHE_ENTRY_VERSION else None
+
+    def store(self, request: requests.PreparedRequest, response: requests.Response) -> Dict:
+        """Write a response to the cache and return the entry."""
+        entry = {
+            'version': CACHE_ENTRY_VERSION,
+            'method': request.method,
+            'url': normalize_url(request.url),
+            'stored_at': time.time(),
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': dict(response.headers),
+            'body': base64.b64encode(response.content).decode('ascii'),
+        }
+        path = self.path(request)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, json.dumps(entry))
+        return entry
+
+    def touch(self, request: requests.PreparedRequest, entry: Dict) -> Dict:
+        """Mark an entry as fresh again (after a 304 Not Modified)."""
+        entry['stored_at'] = time.time()
+        atomic_write(self.path(request), json.dumps(entry))
+        return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry.get('stored_at', 0) < self.ttl(entry['url'])
+
+
+def _build_response(request: requests.PreparedRequest, entry: Dict, state: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry['status']
+    response.reason = entry.get('reason')
+    response.headers = CaseInsensitiveDict(entry.get('headers') or {})
+    response.headers[CACHE_HEADER] = state
+    response._content = base64.b64decode(entry['body'])
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    response.elapsed = timedelta(0)
+    return response
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter that records, replays or revalidates through an HTTPCache."""
+
+    def __init__(self, cache: HTTPCache, mode: str = 'revalidate',
+                 inner: Optional[HTTPAdapter] = None, **kwargs):
+        """
+        Args:
+            cache: Response cache
+            mode: 'record', 'replay' or 'revalidate'
+            inner: Adapter that performs network requests on a miss (e.g. a
+                RateLimitedAdapter, so cache hits don't wait for a rate slot)
+        """
+        if mode not in CACHE_MODES or mode == 'off':
+            raise ValueError(f"Invalid HTTP cache mode: {mode}")
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.mode = mode
+        self.inner = inner
+
+    def _send_network(self, request, **kwargs) -> requests.Response:
+        if self.inner is not None:
+            return self.inner.send(request, **kwargs)
+        return super().send(request, **kwargs)
+
+    def send(self, request, **kwargs):
+        if request.method not in CACHEABLE_METHODS:
+            return self._send_network(request, **kwargs)
+
+        entry = self.cache.load(request) if self.mode != 'record' else None
+
+        if self.mode == 'replay':
+            if entry is None:
+                raise requests.ConnectionError(
+                    f"No cached response for {request.method} {request.url} (replay mode)",
+                    request=request)
+            return _build_response(request, entry, 'hit')
+
+        if entry is not None and self.cache.is_fresh(entry):
+            return _build_response(request, entry, 'hit')
+
+        if entry is not None:
+            headers = CaseInsensitiveDict(entry.get('headers') or {})
+            if headers.get('ETag'):
+                request.headers['If-None-Match'] = headers['ETag']
+            if headers.get('Last-Modified'):
+                request.headers['If-Modified-Since'] = headers['Last-Modified']
+
+        response = self._send_network(request, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            return _build_response(request, self.cache.touch(request, entry), 'revalidated')
+        if response.status_code in CACHEABLE_STATUS:
+            self.cache.store(request, response)
+        response.headers[CACHE_HEADER] = 'miss'
+        return response
+
+    def close(self):
+        if self.inner is not None:
+            self.inner.close()
+        super().close()
+
+
+def cache_mode_from_env(default: str = 'off') -> str:
+    """HTTP cache mode from PAPER_HTTP_CACHE (off/record/replay/revalidate)."""
+    mode = os.environ.get('PAPER_HTTP_CACHE', default).strip().lower() or default
+    if mode not in CACHE_MODES:
+        raise ValueError(f"PAPER_HTTP_CACHE must be one of {', '.join(CACHE_MODES)}, got {mode!r}")
+    return mode
+
+
+def install_cache(session: requests.Session, mode: Optional[str] = None,
+                  cache_dir: Optional[str] = None,
+                  inner: Optional[HTTPAdapter] = None) -> requests.Session:
+    """
+    Route a session through the HTTP cache.
+
+    Args:
+        session: Session to configure
+        mode: Cache mode (default: PAPER_HTTP_CACHE, else off)
+        cache_dir: Cache directory (default: PAPER_HTTP_CACHE_DIR or .cache/http)
+        inner: Adapter for network requests (mounted as-is when the cache is off)
+
+    Returns:
+        The session
+    """
+    mode = mode or cache_mode_from_env()
+    if mode == 'off':
+        if inner is not None:
+            mount_adapter(session, inner)
+        return session
+
+    cache = HTTPCache(cache_dir or os.environ.get('PAPER_HTTP_CACHE_DIR', DEFAULT_CACHE_DIR))
+    return mount_adapter(session, CachingAdapter(cache, mode, inner=inner))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP transport helpers for the API clients.
+
+The scrapers talk to rate-limited public APIs (arXiv asks for at most one
+request every three seconds over a single connection). When several
+clients run at once - e.g. one arXiv client per category in worker
+threads - each client's own delay only spaces its own requests. A
+RateLimiter shared by all of them, mounted on their requests sessions via
+RateLimitedAdapter, spaces every request that goes out.
+
+TransferStats records every response of a session (latency, bytes, time
+spent waiting for a rate slot) so fetches can report where their time went.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+ARXIV_REQUEST_INTERVAL = 3.0  # seconds, arXiv API terms of use
+
+
+class RateLimiter:
+    """Thread-safe request spacing with a bound on requests in flight."""
+
+    def __init__(self, interval: float, max_in_flight: int = 1):
+        """
+        Args:
+            interval: Minimum seconds between the starts of two requests
+            max_in_flight: Maximum number of requests running at once
+        """
+        self.interval = interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+
+    def wait(self) -> float:
+        """
+        Block until the next request may start and reserve that slot.
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+        return slot - now
+
+    @contextmanager
+    def slot(self):
+        """Hold a request slot for the duration of one request (yields the seconds waited)."""
+        started = time.monotonic()
+        with self._in_flight:
+            self.wait()
+            yield time.monotonic() - started
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """requests transport adapter that sends every request through a RateLimiter."""
+
+    def __init__(self, limiter: RateLimiter, **kwargs):
+        super().__init__(**kwargs)
+        self.limiter = limiter
+
+    def send(self, request, **kwargs):
+        with self.limiter.slot() as waited:
+            response = super().send(request, **kwargs)
+        response.rate_limit_wait = waited
+        return response
+
+
+def mount_adapter(session: requests.Session, adapter: HTTPAdapter) -> requests.Session:
+    """Route all http(s) traffic of a session through an adapter."""
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class TransferStats:
+    """Thread-safe per-request latency and size log, fed by a session response hook."""
+
+    def __init__(self):
+        self.requests: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def install(self, session: requests.Session) -> requests.Session:
+        """Record every response of a session."""
+        session.hooks.setdefault('response', []).append(self._record)
+        return session
+
+    def _record(self, response: requests.Response, *args, **kwargs):
+        # elapsed covers the adapter chain, including the wait for a rate slot
+        waited = getattr(response, 'rate_limit_wait', 0.0)
+        started = time.monotonic()
+        size = len(response.content)
+        entry = {
+            'url': response.url,
+            'status': response.status_code,
+            'latency': max(0.0, response.elapsed.total_seconds() - waited) + time.monotonic() - started,
+            'waited': waited,
+            'bytes': size,
+        }
+        with self._lock:
+            self.requests.append(entry)
+
+    def summary(self) -> str:
+        """One-line summary: requests, bytes, latency and rate-limit wait."""
+        with self._lock:
+            entries = list(self.requests)
+        if not entries:
+            return "0 requests"
+        latencies = [e['latency'] for e in entries]
+        return (f"{len(entries)} request{'s' if len(entries) != 1 else ''}, {sum(e['bytes'] for e in entries) / 1024:.0f} KB, "
+                f"latency avg {sum(latencies) / len(latencies):.2f}s / max {max(latencies):.2f}s, "
+                f"{sum(e['waited'] for e in entries):.1f}s waiting for rate slots")
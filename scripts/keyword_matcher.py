@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Multi-family keyword matching over pre-normalized text fields.
+
+SmartFilter's scorers used to lowercase and concatenate the title and
+abstract in each scorer before testing their own keyword list. A
+KeywordMatcher is built once from all keyword families; each text field is
+normalized once per paper and every family is answered from the same
+normalized fields:
+
+    matcher = KeywordMatcher({"field": ["gaussian splatting", "nerf"],
+                              "novelty": ["novel", "new"]})
+    title = matcher.scan(paper["title"])
+    abstract = matcher.scan(paper["abstract"])
+    matcher.find("novelty", matcher.join(title, abstract))   # -> {"new"}
+
+Matching keeps plain substring semantics (case-insensitive): "nerf" matches
+"NeRFs" and "new" matches "renewal". Joined fields are separated by a
+character no keyword contains, so a keyword never spans two fields. Each
+keyword is one C-level substring search; for keyword lists of this size
+that is faster in CPython than one combined regex or a token-level
+automaton, which cost tens of nanoseconds per character however few
+keywords there are.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+FIELD_SEPARATOR = '\x00'
+
+
+class KeywordMatcher:
+    """Finds the keywords of several families in normalized text fields."""
+
+    def __init__(self, families: Dict[str, Iterable[str]]):
+        """
+        Compile the keyword families.
+
+        Args:
+            families: Family name -> keywords (matched case-insensitively)
+        """
+        # family -> [(keyword as given, normalized keyword)]
+        self.families: Dict[str, List[Tuple[str, str]]] = {
+            family: [(keyword, keyword.lower()) for keyword in keywords
+                     if FIELD_SEPARATOR not in keyword]
+            for family, keywords in families.items()
+        }
+
+    @staticmethod
+    def scan(*texts: Optional[str]) -> str:
+        """
+        Normalize text fields for find().
+
+        Args:
+            *texts: Raw field texts (None and '' are fine)
+
+        Returns:
+            Normalized fields, joined so that no keyword matches across two of them
+        """
+        return FIELD_SEPARATOR.join((text or '').lower() for text in texts)
+
+    @staticmethod
+    def join(*fields: str) -> str:
+        """Combine fields already normalized with scan()."""
+        return FIELD_SEPARATOR.join(fields)
+
+    def find(self, family: str, text: str) -> Set[str]:
+        """
+        Keywords of a family that occur in normalized text.
+
+        Args:
+            family: Family name given to the constructor
+            text: Output of scan() or join()
+
+        Returns:
+            Matching keywords, as given to the constructor
+        """
+        return {keyword for keyword, normalized in self.families[family] if normalized in text}
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+In-memory lookup tables for a loaded paper collection.
+
+PaperIndex is built once per load and replaces the linear scans that used to
+be spread over the scripts:
+- hash maps by paper ID and arXiv ID
+- inverted indexes for normalized author tokens, venues and categories
+- a year-sorted array for range queries
+
+Author, venue and category lookups keep the existing case-insensitive
+substring semantics: the query is matched against the (small) vocabulary of
+distinct tokens/values instead of against every paper.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+
+class PaperIndex:
+    """Lookup tables over a list of paper dictionaries."""
+
+    def __init__(self, papers: List[Dict]):
+        """
+        Build the index.
+
+        Args:
+            papers: Papers in collection order (the index keeps references)
+        """
+        self.papers = papers
+        self.by_id: Dict[str, Dict] = {}
+        self.by_arxiv_id: Dict[str, Dict] = {}
+
+        # normalized value -> positions in self.papers
+        self._author_names: Dict[str, List[int]] = defaultdict(list)
+        self._venues: Dict[str, List[int]] = defaultdict(list)
+        self._categories: Dict[str, List[int]] = defaultdict(list)
+        # author token -> normalized author names containing it
+        self._author_tokens: Dict[str, Set[str]] = defaultdict(set)
+        self._match_cache: Dict[tuple, List[int]] = {}
+
+        year_pairs = []
+
+        for pos, paper in enumerate(papers):
+            paper_id = paper.get('id')
+            if paper_id is not None and paper_id not in self.by_id:
+                self.by_id[paper_id] = paper
+
+            arxiv_id = paper.get('arxiv_id')
+            if arxiv_id and arxiv_id not in self.by_arxiv_id:
+                self.by_arxiv_id[arxiv_id] = paper
+
+            for author in paper.get('authors') or []:
+                name = str(author).lower()
+                postings = self._author_names[name]
+                if not postings or postings[-1] != pos:
+                    postings.append(pos)
+                for token in name.split():
+                    self._author_tokens[token].add(name)
+
+            self._venues[str(paper.get('venue') or '').lower()].append(pos)
+
+            for cat in paper.get('categories') or []:
+                postings = self._categories[str(cat).lower()]
+                if not postings or postings[-1] != pos:
+                    postings.append(pos)
+
+            year = paper.get('year')
+            if isinstance(year, int):
+                year_pairs.append((year, pos))
+
+        year_pairs.sort()
+        self._years = [year for year, _ in year_pairs]
+        self._year_positions = [pos for _, pos in year_pairs]
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+    # ------------------------------------------------------------------
+    # Exact lookups
+    # ------------------------------------------------------------------
+
+    def get(self, paper_id: str) -> Optional[Dict]:
+        """Get paper by ID."""
+        return self.by_id.get(paper_id)
+
+    def get_by_arxiv_id(self, arxiv_id: str) -> Optional[Dict]:
+        """Get paper by arXiv ID."""
+        return self.by_arxiv_id.get(arxiv_id)
+
+    # ------------------------------------------------------------------
+    # Substring lookups
+    # ------------------------------------------------------------------
+
+    def _select(self, positions: Iterable[int], exclude_ids: Optional[Set[str]] = None,
+                limit: Optional[int] = None) -> List[Dict]:
+        exclude_ids = exclude_ids or set()
+        result = []
+        for pos in positions:
+            paper = self.papers[pos]
+            if paper.get('id') in exclude_ids:
+                continue
+            result.append(paper)
+            if limit and len(result) >= limit:
+                break
+        return result
+
+    @staticmethod
+    def _merge_postings(postings: Iterable[List[int]]) -> List[int]:
+        merged = set()
+        for positions in postings:
+            merged.update(positions)
+        return sorted(merged)
+
+    def author_positions(self, author_name: str) -> List[int]:
+        """Positions of papers with an author containing author_name (case-insensitive)."""
+        query = author_name.lower()
+        key = ('author', query)
+        if key not in self._match_cache:
+            tokens = query.split()
+            if tokens:
+                # Any name containing the query contains its longest token
+                probe = max(tokens, key=len)
+                names = set()
+                for token, token_names in self._author_tokens.items():
+                    if probe in token:
+                        names.update(token_names)
+            else:
+                names = self._author_names.keys()
+            self._match_cache[key] = self._merge_postings(
+                self._author_names[name] for name in names if query in name
+            )
+        return self._match_cache[key]
+
+    def venue_positions(self, venue: str) -> List[int]:
+        """Positions of papers whose venue contains venue (case-insensitive)."""
+        query = venue.lower()
+        key = ('venue', query)
+        if key not in self._match_cache:
+            self._match_cache[key] = self._merge_postings(
+                positions for value, positions in self._venues.items() if query in value
+            )
+        return self._match_cache[key]
+
+    def category_positions(self, category: str) -> List[int]:
+        """Positions of papers with a category containing category (case-insensitive)."""
+        query = category.lower()
+        key = ('category', query)
+        if key not in self._match_cache:
+            self._match_cache[key] = self._merge_postings(
+                positions for value, positions in self._categories.items() if query in value
+            )
+        return self._match_cache[key]
+
+    def find_by_author(self, author_name: str, exclude_ids: Optional[Set[str]] = None,
+                       limit: Optional[int] = None) -> List[Dict]:
+        """Papers by an author (partial, case-insensitive match) in collection order."""
+        return self._select(self.author_positions(author_name), exclude_ids, limit)
+
+    def find_by_venue(self, venue: str, exclude_ids: Optional[Set[str]] = None,
+                      limit: Optional[int] = None) -> List[Dict]:
+        """Papers from a venue (partial, case-insensitive match) in collection order."""
+        return self._select(self.venue_positions(venue), exclude_ids, limit)
+
+    def find_by_category(self, category: str, exclude_ids: Optional[Set[str]] = None,
+                         limit: Optional[int] = None) -> List[Dict]:
+        """Papers in a category (partial, case-insensitive match) in collection order."""
+        return self._select(self.category_positions(category), exclude_ids, limit)
+
+    # ------------------------------------------------------------------
+    # Range queries
+    # ------------------------------------------------------------------
+
+    def year_positions(self, min_year: Optional[int] = None,
+                       max_year: Optional[int] = None) -> List[int]:
+        """Positions of papers with min_year <= year <= max_year, in collection order."""
+        lo = 0 if min_year is None else bisect_left(self._years, min_year)
+        hi = len(self._years) if max_year is None else bisect_right(self._years, max_year)
+        return sorted(self._year_positions[lo:hi])
+
+    def find_by_year(self, min_year: Optional[int] = None,
+                     max_year: Optional[int] = None) -> List[Dict]:
+        """Papers published in a year range (inclusive) in collection order."""
+        return [self.papers[pos] for pos in self.year_positions(min_year, max_year)]
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Append-only mutation journal for the paper collection.
+
+Small edits (star, tag, note, citation update) are appended as typed JSON
+lines to data/papers/papers.journal.jsonl instead of rewriting papers.yaml.
+Readers replay the journal tail over the papers.yaml snapshot, and compaction
+folds the journal into the snapshot on demand or once the journal grows past
+a size threshold.
+
+Every entry carries a sequence number. papers.yaml records the last folded
+sequence number in `metadata.journal_seq`, so replaying is safe even if a
+compaction was interrupted between writing the snapshot and truncating the
+journal.
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+from atomic_io import atomic_open, file_lock
+
+
+# Supported mutation types and the payload keys they accept
+JOURNAL_OPS = {
+    'star': ('starred',),
+    'tag': ('category',),
+    'note': ('note',),
+    'citation': ('citation_count', 'influential_citation_count', 'citation_last_checked'),
+    'set': ('fields',),
+}
+
+# Compact automatically once the journal file is larger than this
+DEFAULT_COMPACT_THRESHOLD = 256 * 1024
+
+
+def default_journal_path(papers_yaml_path: str) -> str:
+    """Return the journal path that belongs to a papers.yaml file."""
+    root, _ = os.path.splitext(papers_yaml_path)
+    return root + '.journal.jsonl'
+
+
+def apply_mutation(paper: Dict, entry: Dict) -> Dict:
+    """
+    Apply one journal entry to a paper dictionary in place.
+
+    Args:
+        paper: Paper dictionary
+        entry: Journal entry with 'op' and its payload
+
+    Returns:
+        The updated paper dictionary
+    """
+    op = entry['op']
+
+    if op == 'star':
+        paper['starred'] = bool(entry['starred'])
+
+    elif op == 'tag':
+        categories = paper.get('categories') or []
+        if entry['category'] not in categories:
+            paper['categories'] = categories + [entry['category']]
+
+    elif op == 'note':
+        existing_note = paper.get('notes', '')
+        if existing_note:
+            paper['notes'] = f"{existing_note}\n{entry['note']}"
+        else:
+            paper['notes'] = entry['note']
+
+    elif op == 'citation':
+        for key in JOURNAL_OPS['citation']:
+            if key in entry:
+                paper[key] = entry[key]
+
+    elif op == 'set':
+        paper.update(entry['fields'])
+
+    else:
+        raise ValueError(f"Unknown journal op: {op}")
+
+    return paper
+
+
+class MutationJournal:
+    """Append-only JSONL journal of paper mutations."""
+
+    def __init__(self, path: str, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
+        """
+        Initialize journal.
+
+        Args:
+            path: Path to the JSONL journal file
+            compact_threshold: Journal size in bytes that triggers compaction
+        """
+        self.path = path
+        self.compact_threshold = compact_threshold
+        self._last_seq = None
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest entry (or of the last compaction)."""
+        if self._last_seq is None:
+            self._last_seq = self._read_last_seq()
+        return self._last_seq
+
+    def _read_last_seq(self) -> int:
+        """Read the sequence number from the last line without scanning the file."""
+        if not os.path.exists(self.path):
+            return 0
+
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            block = 4096
+            tail = b''
+            while end > 0 and tail.count(b'\n') < 2:
+                start = max(0, end - block)
+                f.seek(start)
+                tail = f.read(end - start) + tail
+                end = start
+
+        lines = [line for line in tail.splitlines() if line.strip()]
+        if not lines:
+            return 0
+        last = json.loads(lines[-1])
+        return int(last.get('seq', last.get('compacted_through', 0)))
+
+    def append(self, op: str, paper_id: str, **payload) -> Dict:
+        """
+        Append a mutation to the journal.
+
+        Args:
+            op: Mutation type (see JOURNAL_OPS)
+            paper_id: Paper ID the mutation applies to
+            **payload: Mutation payload
+
+        Returns:
+            The journal entry that was written
+        """
+        if op not in JOURNAL_OPS:
+            raise ValueError(f"Unknown journal op: {op}")
+        unknown = set(payload) - set(JOURNAL_OPS[op])
+        if unknown:
+            raise ValueError(f"Unexpected fields for '{op}': {', '.join(sorted(unknown))}")
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with file_lock(self.path):
+            # Another process may have appended since we last looked
+            self._last_seq = self._read_last_seq()
+            entry = {
+                'seq': self._last_seq + 1,
+                'ts': datetime.now().isoformat(timespec='seconds'),
+                'op': op,
+                'paper_id': paper_id,
+            }
+            entry.update(payload)
+
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+        self._last_seq = entry['seq']
+        return entry
+
+    def entries(self, after_seq: int = 0) -> Iterator[Dict]:
+        """
+        Iterate journal entries.
+
+        Args:
+            after_seq: Only yield entries with a larger sequence number
+
+        Yields:
+            Journal entries in append order
+        """
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn write from a crash - only the last line can be affected
+                    break
+                if 'op' in entry and entry.get('seq', 0) > after_seq:
+                    yield entry
+
+    def size(self) -> int:
+        """Journal size in bytes."""
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def needs_compaction(self) -> bool:
+        """True once the journal is larger than the compaction threshold."""
+        return self.size() >= self.compact_threshold
+
+    def truncate(self, compacted_through: Optional[int] = None):
+        """
+        Drop all entries after they were folded into the snapshot.
+
+        Args:
+            compacted_through: Last folded sequence number (default: last_seq)
+        """
+        with file_lock(self.path):
+            seq = self._read_last_seq() if compacted_through is None else compacted_through
+            # Entries appended after the snapshot was taken must survive
+            remaining = list(self.entries(after_seq=seq))
+
+            with atomic_open(self.path) as f:
+                f.write(json.dumps({'compacted_through': seq}) + '\n')
+                for entry in remaining:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._last_seq = remaining[-1]['seq'] if remaining else seq
@@ -11,15 +11,17 @@ Provides utilities for:
 
 import os
 import sys
-import yaml
 import argparse
 import json
 import csv
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
 from datetime import datetime
 from collections import Counter
 
+from paper_index import PaperIndex
+from paper_store import PaperStore
+
 
 class PaperManager:
     """Manage papers with batch operations and utilities."""
@@ -32,25 +34,58 @@ class PaperManager:
             papers_yaml_path: Path to papers.yaml
         """
         self.papers_yaml_path = papers_yaml_path
+        self.store = PaperStore(papers_yaml_path)
         self._load_data()
 
     def _load_data(self):
-        """Load papers data from YAML."""
-        with open(self.papers_yaml_path, 'r', encoding='utf-8') as f:
-            self.data = yaml.safe_load(f)
-
-        self.papers = self.data.get('papers', [])
-        self.categories = self.data.get('categories', [])
-        self.metadata = self.data.get('metadata', {})
+        """Load papers data from the paper store."""
+        self._papers = None
+        self._index = None
+        self.categories = self.store.get_categories()
+        self.metadata = self.store.get_metadata()
+
+    @property
+    def papers(self) -> List[Dict]:
+        """All papers, loaded on first use (exports stream from the store instead)."""
+        if self._papers is None:
+            self._papers = self.store.get_papers()
+        return self._papers
+
+    @papers.setter
+    def papers(self, papers: List[Dict]):
+        self._papers = papers
+        self._index = None
+
+    @property
+    def index(self) -> PaperIndex:
+        """Lookup tables over self.papers, built on first use."""
+        if self._index is None:
+            self._index = PaperIndex(self.papers)
+        return self._index
 
     def _save_data(self):
-        """Save papers data to YAML."""
-        # Update metadata
-        self.data['metadata']['last_updated'] = datetime.now().strftime('%Y-%m-%d')
-        self.data['metadata']['total_papers'] = len(self.papers)
-
-        with open(self.papers_yaml_path, 'w', encoding='utf-8') as f:
-            yaml.dump(self.data, f, allow_unicode=True, sort_keys=False)
+        """Update metadata and regenerate papers.yaml from the store."""
+        self.store.update_metadata(
+            last_updated=datetime.now().strftime('%Y-%m-%d'),
+            total_papers=self.store.count_papers()
+        )
+        self.metadata = self.store.get_metadata()
+        self.store.export_yaml()
+
+    def _save_journal(self):
+        """Compact the mutation journal once it grows past its threshold."""
+        if self.store.journal.needs_compaction():
+            self.compact()
+
+    def compact(self):
+        """Fold the mutation journal into papers.yaml."""
+        self.store.update_metadata(
+            last_updated=datetime.now().strftime('%Y-%m-%d'),
+            total_papers=self.store.count_papers()
+        )
+        seq = self.store.compact()
+        self.metadata = self.store.get_metadata()
+        print(f"🗜️  Compacted journal into {self.papers_yaml_path} (through entry {seq})")
 
     def batch_mark_starred(self, paper_ids: List[str], starred: bool = True):
         """
@@ -65,10 +100,11 @@ class PaperManager:
             paper = self._get_paper_by_id(paper_id)
             if paper:
                 paper['starred'] = starred
+                self.store.record('star', paper_id, starred=starred)
                 updated += 1
 
         if updated > 0:
-            self._save_data()
+            self._save_journal()
 
         print(f"✅ Updated {updated}/{len(paper_ids)} papers")
 
@@ -88,10 +124,11 @@ class PaperManager:
                 if category not in categories:
                     categories.append(category)
                     paper['categories'] = categories
+                    self.store.record('tag', paper_id, category=category)
                     updated += 1
 
         if updated > 0:
-            self._save_data()
+            self._save_journal()
 
         print(f"✅ Added category to {updated}/{len(paper_ids)} papers")
 
@@ -112,10 +149,11 @@ class PaperManager:
                     paper['notes'] = f"{existing_note}\n{note}"
                 else:
                     paper['notes'] = note
+                self.store.record('note', paper_id, note=note)
                 updated += 1
 
         if updated > 0:
-            self._save_data()
+            self._save_journal()
 
         print(f"✅ Added notes to {updated}/{len(paper_ids)} papers")
 
@@ -131,50 +169,54 @@ class PaperManager:
             filter_category: Only export papers in this category
             filter_starred: Only export starred/unstarred papers
         """
-        # Filter papers
-        papers_to_export = self.papers
-
-        if filter_category:
-            papers_to_export = [
-                p for p in papers_to_export
-                if filter_category in p.get('categories', [])
-            ]
-
-        if filter_starred is not None:
-            papers_to_export = [
-                p for p in papers_to_export
-                if p.get('starred', False) == filter_starred
-            ]
+        def papers_to_export() -> Iterator[Dict]:
+            # Stream from the store so large exports never hold the whole collection
+            for paper in self.store.iter_papers():
+                if filter_category and filter_category not in paper.get('categories', []):
+                    continue
+                if filter_starred is not None and paper.get('starred', False) != filter_starred:
+                    continue
+                yield paper
 
         # Export based on format
         if format == 'json':
-            self._export_json(papers_to_export, output_path)
+            count = self._export_json(papers_to_export(), output_path)
         elif format == 'csv':
-            self._export_csv(papers_to_export, output_path)
+            count = self._export_csv(papers_to_export, output_path)
         elif format == 'bibtex':
-            self._export_bibtex(papers_to_export, output_path)
+            count = self._export_bibtex(papers_to_export(), output_path)
         elif format == 'markdown':
-            self._export_markdown(papers_to_export, output_path)
+            count = self._export_markdown(papers_to_export(), output_path)
         else:
             print(f"Unknown format: {format}")
             return
 
-        print(f"✅ Exported {len(papers_to_export)} papers to {output_path}")
+        print(f"✅ Exported {count} papers to {output_path}")
 
-    def _export_json(self, papers: List[Dict], output_path: str):
+    def _export_json(self, papers: Iterable[Dict], output_path: str) -> int:
         """Export to JSON."""
+        count = 0
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(papers, f, indent=2, ensure_ascii=False)
-
-    def _export_csv(self, papers: List[Dict], output_path: str):
-        """Export to CSV."""
-        if not papers:
-            return
-
+            f.write('[')
+            for paper in papers:
+                f.write(',\n  ' if count else '\n  ')
+                encoded = json.dumps(paper, indent=2, ensure_ascii=False)
+                f.write(encoded.replace('\n', '\n  '))
+                count += 1
+            f.write('\n]' if count else ']')
+        return count
+
+    def _export_csv(self, papers: Callable[[], Iterable[Dict]], output_path: str) -> int:
+        """Export to CSV (papers is called twice: once for the header, once for the rows)."""
         # Get all possible fields
         fields = set()
-        for paper in papers:
+        count = 0
+        for paper in papers():
             fields.update(paper.keys())
+            count += 1
+
+        if not count:
+            return 0
 
         fields = sorted(fields)
 
@@ -182,7 +224,7 @@ class PaperManager:
             writer = csv.DictWriter(f, fieldnames=fields)
             writer.writeheader()
 
-            for paper in papers:
+            for paper in papers():
                 # Convert lists to strings
                 row = {}
                 for field in fields:
@@ -194,75 +236,84 @@ class PaperManager:
                     else:
                         row[field] = value
                 writer.writerow(row)
+        return count
 
-    def _export_bibtex(self, papers: List[Dict], output_path: str):
+    def _export_bibtex(self, papers: Iterable[Dict], output_path: str) -> int:
         """Export to BibTeX."""
-        entries = []
-
-        for paper in papers:
-            paper_id = paper.get('id', 'unknown')
-            title = paper.get('title', 'Unknown')
-            authors = ' and '.join(paper.get('authors', []))
-            year = paper.get('year', '')
-            venue = paper.get('venue', '')
-            arxiv_id = paper.get('arxiv_id', '')
+        count = 0
 
-            entry_type = 'article'
-            if venue and any(conf in venue.lower() for conf in ['cvpr', 'iccv', 'eccv', 'nips', 'icml']):
-                entry_type = 'inproceedings'
-
-            entry = f"""@{entry_type}{{{paper_id},
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for paper in papers:
+                paper_id = paper.get('id', 'unknown')
+                title = paper.get('title', 'Unknown')
+                authors = ' and '.join(paper.get('authors', []))
+                year = paper.get('year', '')
+                venue = paper.get('venue', '')
+                arxiv_id = paper.get('arxiv_id', '')
+
+                entry_type = 'article'
+                if venue and any(conf in venue.lower() for conf in ['cvpr', 'iccv', 'eccv', 'nips', 'icml']):
+                    entry_type = 'inproceedings'
+
+                entry = f"""@{entry_type}{{{paper_id},
   title = {{{title}}},
   author = {{{authors}}},
   year = {{{year}}},
   venue = {{{venue}}},"""
 
-            if arxiv_id:
-                entry += f"\n  eprint = {{{arxiv_id}}},"
+                if arxiv_id:
+                    entry += f"\n  eprint = {{{arxiv_id}}},"
 
-            entry += "\n}\n"
-            entries.append(entry)
+                entry += "\n}\n"
+                if count:
+                    f.write('\n')
+                f.write(entry)
+                count += 1
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(entries))
+        return count
 
-    def _export_markdown(self, papers: List[Dict], output_path: str):
+    def _export_markdown(self, papers: Iterable[Dict], output_path: str) -> int:
         """Export to Markdown."""
-        lines = ["# Paper Collection Export", ""]
-
-        for i, paper in enumerate(papers, 1):
-            title = paper.get('title', 'Unknown')
-            authors = ', '.join(paper.get('authors', []))
-            venue = paper.get('venue', 'Unknown')
-            year = paper.get('year', 'N/A')
-
-            lines.append(f"## {i}. {title}")
-            lines.append(f"\n**Authors:** {authors}")
-            lines.append(f"\n**Venue:** {venue} ({year})")
-
-            categories = paper.get('categories', [])
-            if categories:
-                lines.append(f"\n**Categories:** {', '.join(categories)}")
-
-            abstract = paper.get('abstract', paper.get('ai_summary', ''))
-            if abstract:
-                lines.append(f"\n**Abstract:** {abstract}")
-
-            links = paper.get('links', {})
-            if any(links.values()):
-                link_parts = []
-                if links.get('paper'):
-                    link_parts.append(f"[Paper]({links['paper']})")
-                if links.get('code'):
-                    link_parts.append(f"[Code]({links['code']})")
-                if links.get('project'):
-                    link_parts.append(f"[Project]({links['project']})")
-                lines.append(f"\n**Links:** {' | '.join(link_parts)}")
-
-            lines.append("\n---\n")
+        count = 0
 
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+            f.write("# Paper Collection Export\n")
+
+            for i, paper in enumerate(papers, 1):
+                title = paper.get('title', 'Unknown')
+                authors = ', '.join(paper.get('authors', []))
+                venue = paper.get('venue', 'Unknown')
+                year = paper.get('year', 'N/A')
+
+                lines = [""]
+                lines.append(f"## {i}. {title}")
+                lines.append(f"\n**Authors:** {authors}")
+                lines.append(f"\n**Venue:** {venue} ({year})")
+
+                categories = paper.get('categories', [])
+                if categories:
+                    lines.append(f"\n**Categories:** {', '.join(categories)}")
+
+                abstract = paper.get('abstract', paper.get('ai_summary', ''))
+                if abstract:
+                    lines.append(f"\n**Abstract:** {abstract}")
+
+                links = paper.get('links', {})
+                if any(links.values()):
+                    link_parts = []
+                    if links.get('paper'):
+                        link_parts.append(f"[Paper]({links['paper']})")
+                    if links.get('code'):
+                        link_parts.append(f"[Code]({links['code']})")
+                    if links.get('project'):
+                        link_parts.append(f"[Project]({links['project']})")
+                    lines.append(f"\n**Links:** {' | '.join(link_parts)}")
+
+                lines.append("\n---\n")
+                f.write('\n'.join(lines))
+                count = i
+
+        return count
 
     def validate_database(self) -> Dict:
         """
@@ -400,12 +451,13 @@ class PaperManager:
             print(f"\n  Total changes: {len(changes)}")
         else:
             self.papers = papers_to_keep
+            self.store.replace_papers(papers_to_keep)
             self._save_data()
             print(f"✅ Cleaned up database: {len(changes)} changes")
 
     def _get_paper_by_id(self, paper_id: str) -> Optional[Dict]:
         """Get paper by ID."""
-        return next((p for p in self.papers if p.get('id') == paper_id), None)
+        return self.index.get(paper_id)
 
 
 def main():
@@ -450,6 +502,9 @@ def main():
     # Validate
     subparsers.add_parser('validate', help='Validate database')
 
+    # Compact journal
+    subparsers.add_parser('compact', help='Fold pending journal edits into papers.yaml')
+
     # Statistics
     subparsers.add_parser('stats', help='Show statistics')
 
@@ -493,6 +548,9 @@ def main():
             filter_starred=filter_starred
         )
 
+    elif args.command == 'compact':
+        manager.compact()
+
     elif args.command == 'validate':
         issues = manager.validate_database()
         print("\n🔍 Database Validation Results:\n")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Three-way merge of papers.yaml documents.
+
+When a process is about to write papers.yaml but the file changed on disk
+since the process loaded it (another workflow wrote it in the meantime),
+overwriting would lose the other writer's updates. merge_documents()
+combines both versions against the common base instead:
+
+- papers are matched by ID and merged field by field, so e.g. a citation
+  update and a newly added mindmap on the same paper both survive
+- papers added on either side are kept, papers deleted on one side are
+  dropped unless the other side changed them
+- metadata is merged key by key, other sections as whole values
+
+When both sides changed the same value differently, "ours" (the process
+doing the write) wins and the conflict is reported.
+"""
+
+from typing import Dict, List, Optional
+
+
+_MISSING = object()
+
+
+class MergeResult:
+    """Merged document plus the conflicts that were resolved in favour of ours."""
+
+    def __init__(self):
+        self.document: Dict = {}
+        self.conflicts: List[str] = []
+
+
+def _merge_value(base, ours, theirs, where: str, result: MergeResult):
+    """Three-way merge of a single value (returns _MISSING for deleted)."""
+    if ours == theirs:
+        return ours
+    if ours == base:
+        return theirs
+    if theirs == base:
+        return ours
+    result.conflicts.append(where)
+    return ours
+
+
+def _ordered_keys(primary: Dict, secondary: Dict) -> List:
+    keys = list(primary)
+    seen = set(keys)
+    keys.extend(key for key in secondary if key not in seen)
+    return keys
+
+
+def _merge_mapping(base: Dict, ours: Dict, theirs: Dict, where: str,
+                   result: MergeResult) -> Dict:
+    """Merge two dictionaries key by key (theirs' key order first)."""
+    merged = {}
+    for key in _ordered_keys(theirs, ours):
+        value = _merge_value(base.get(key, _MISSING), ours.get(key, _MISSING),
+                             theirs.get(key, _MISSING), f"{where}.{key}", result)
+        if value is not _MISSING:
+            merged[key] = value
+    return merged
+
+
+def _paper_key(paper: Dict, position: int):
+    paper_id = paper.get('id')
+    return paper_id if paper_id is not None else ('#', paper.get('title'), position)
+
+
+def _by_key(papers: Optional[List[Dict]]) -> Dict:
+    keyed = {}
+    for position, paper in enumerate(papers or []):
+        keyed.setdefault(_paper_key(paper, position), paper)
+    return keyed
+
+
+def _merge_papers(base: List[Dict], ours: List[Dict], theirs: List[Dict],
+                  result: MergeResult) -> List[Dict]:
+    base_map, ours_map, theirs_map = _by_key(base), _by_key(ours), _by_key(theirs)
+    merged = []
+
+    for key in _ordered_keys(theirs_map, ours_map):
+        b = base_map.get(key)
+        o = ours_map.get(key)
+        t = theirs_map.get(key)
+        where = f"papers[{key}]"
+
+        if o is not None and t is not None:
+            merged.append(_merge_mapping(b or {}, o, t, where, result))
+        elif t is not None:
+            # Missing on our side: new on theirs, or deleted by us
+            if b is None:
+                merged.append(t)
+            elif t != b:
+                result.conflicts.append(f"{where} (deleted here, changed on disk)")
+                merged.append(t)
+        else:
+            # Missing on their side: new on ours, or deleted by them
+            if b is None:
+                merged.append(o)
+            elif o != b:
+                result.conflicts.append(f"{where} (deleted on disk, changed here)")
+                merged.append(o)
+
+    return merged
+
+
+def merge_documents(base: Optional[Dict], ours: Dict, theirs: Optional[Dict]) -> MergeResult:
+    """
+    Three-way merge of papers.yaml documents.
+
+    Args:
+        base: Document both sides started from (None if unknown)
+        ours: Document about to be written
+        theirs: Document currently on disk
+
+    Returns:
+        MergeResult with the merged document and the list of conflicts
+    """
+    base = base or {}
+    theirs = theirs or {}
+    result = MergeResult()
+
+    for name in _ordered_keys(theirs, ours):
+        b = base.get(name, _MISSING)
+        o = ours.get(name, _MISSING)
+        t = theirs.get(name, _MISSING)
+
+        if name == 'papers':
+            value = _merge_papers(b if isinstance(b, list) else [],
+                                  o if isinstance(o, list) else [],
+                                  t if isinstance(t, list) else [], result)
+        elif isinstance(o, dict) and isinstance(t, dict):
+            value = _merge_mapping(b if isinstance(b, dict) else {}, o, t, name, result)
+        else:
+            value = _merge_value(b, o, t, name, result)
+
+        if value is not _MISSING:
+            result.document[name] = value
+
+    _fix_metadata(result, ours, theirs)
+    return result
+
+
+# Metadata fields recomputed after merging (never reported as conflicts)
+DERIVED_METADATA = ('total_papers', 'journal_seq', 'last_updated')
+
+
+def _fix_metadata(result: MergeResult, ours: Dict, theirs: Dict):
+    """Recompute metadata fields that derive from the merged content."""
+    merged = result.document
+    metadata = merged.get('metadata')
+    if not isinstance(metadata, dict):
+        return
+
+    derived = {f"metadata.{field}" for field in DERIVED_METADATA}
+    result.conflicts = [c for c in result.conflicts if c not in derived]
+
+    if 'total_papers' in metadata:
+        metadata['total_papers'] = len(merged.get('papers') or [])
+
+    # Both sides folded journal entries up to their own sequence number
+    seqs = [
+        (doc.get('metadata') or {}).get('journal_seq')
+        for doc in (ours, theirs)
+    ]
+    seqs = [seq for seq in seqs if isinstance(seq, int)]
+    if seqs:
+        metadata['journal_seq'] = max(seqs)
+
+    dates = [
+        (doc.get('metadata') or {}).get('last_updated')
+        for doc in (ours, theirs)
+    ]
+    dates = [d for d in dates if d]
+    if dates and 'last_updated' in metadata:
+        metadata['last_updated'] = max(dates, key=str)
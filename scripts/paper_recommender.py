@@ -12,13 +12,15 @@ This script provides intelligent paper recommendations based on:
 
 import os
 import sys
-import yaml
 import argparse
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 from collections import Counter, defaultdict
 from datetime import datetime
 
+from paper_index import PaperIndex
+from paper_store import PaperStore
+
 # Import vector database if available
 HAS_VECTORDB = False
 PaperQueryEngine = None
@@ -46,11 +48,10 @@ class PaperRecommender:
         self.vectordb_path = vectordb_path
 
         # Load papers data
-        with open(papers_yaml_path, 'r', encoding='utf-8') as f:
-            self.data = yaml.safe_load(f)
-
-        self.papers = self.data.get('papers', [])
-        self.categories = self.data.get('categories', [])
+        with PaperStore(papers_yaml_path) as store:
+            self.papers = store.get_records()
+            self.categories = store.get_categories()
+        self.index = PaperIndex(self.papers)
 
         # Initialize vector database if available
         self.query_engine = None
@@ -93,19 +94,7 @@ class PaperRecommender:
         Returns:
             List of papers
         """
-        exclude_ids = exclude_ids or set()
-        author_lower = author_name.lower()
-
-        matching_papers = []
-        for paper in self.papers:
-            if paper.get('id') in exclude_ids:
-                continue
-
-            authors = paper.get('authors', [])
-            if any(author_lower in author.lower() for author in authors):
-                matching_papers.append(paper)
-
-        return matching_papers
+        return self.index.find_by_author(author_name, exclude_ids)
 
     def get_papers_by_venue(self, venue: str, exclude_ids: Set[str] = None,
                            limit: Optional[int] = None) -> List[Dict]:
@@ -120,21 +109,7 @@ class PaperRecommender:
         Returns:
             List of papers
         """
-        exclude_ids = exclude_ids or set()
-        venue_lower = venue.lower()
-
-        matching_papers = []
-        for paper in self.papers:
-            if paper.get('id') in exclude_ids:
-                continue
-
-            paper_venue = paper.get('venue', '').lower()
-            if venue_lower in paper_venue:
-                matching_papers.append(paper)
-                if limit and len(matching_papers) >= limit:
-                    break
-
-        return matching_papers
+        return self.index.find_by_venue(venue, exclude_ids, limit)
 
     def get_papers_by_category(self, category: str, exclude_ids: Set[str] = None,
                                limit: Optional[int] = None) -> List[Dict]:
@@ -149,21 +124,7 @@ class PaperRecommender:
         Returns:
             List of papers
         """
-        exclude_ids = exclude_ids or set()
-        category_lower = category.lower()
-
-        matching_papers = []
-        for paper in self.papers:
-            if paper.get('id') in exclude_ids:
-                continue
-
-            paper_cats = paper.get('categories', [])
-            if any(category_lower in cat.lower() for cat in paper_cats):
-                matching_papers.append(paper)
-                if limit and len(matching_papers) >= limit:
-                    break
-
-        return matching_papers
+        return self.index.find_by_category(category, exclude_ids, limit)
 
     def get_trending_papers(self, min_citations: int = 10, limit: int = 10) -> List[Dict]:
         """
@@ -180,9 +141,8 @@ class PaperRecommender:
 
         # Papers from last 2 years with citations
         trending = [
-            p for p in self.papers
-            if p.get('year', 0) >= current_year - 2
-            and p.get('citation_count', 0) >= min_citations
+            p for p in self.index.find_by_year(min_year=current_year - 2)
+            if p.get('citation_count', 0) >= min_citations
         ]
 
         # Sort by citation count
@@ -202,7 +162,7 @@ class PaperRecommender:
             Dictionary with different recommendation types
         """
         # Find the paper
-        paper = next((p for p in self.papers if p.get('id') == paper_id), None)
+        paper = self.index.get(paper_id)
         if not paper:
             return {'error': f'Paper {paper_id} not found'}
 
@@ -263,31 +223,22 @@ class PaperRecommender:
         """
         recommendations = {}  # paper_id -> score
 
+        # Interest matches come from the index postings
+        interest_scores = Counter()
+        for cat in categories or []:
+            for pos in self.index.category_positions(cat):
+                interest_scores[pos] += 3
+        for author in authors or []:
+            for pos in self.index.author_positions(author):
+                interest_scores[pos] += 5
+        for venue in venues or []:
+            for pos in self.index.venue_positions(venue):
+                interest_scores[pos] += 2
+
         # Score papers based on matches
-        for paper in self.papers:
+        for pos, paper in enumerate(self.papers):
             paper_id = paper.get('id')
-            score = 0
-
-            # Category match
-            if categories:
-                paper_cats = paper.get('categories', [])
-                for cat in categories:
-                    if any(cat.lower() in pc.lower() for pc in paper_cats):
-                        score += 3
-
-            # Author match
-            if authors:
-                paper_authors = paper.get('authors', [])
-                for author in authors:
-                    if any(author.lower() in pa.lower() for pa in paper_authors):
-                        score += 5
-
-            # Venue match
-            if venues:
-                paper_venue = paper.get('venue', '')
-                for venue in venues:
-                    if venue.lower() in paper_venue.lower():
-                        score += 2
+            score = interest_scores.get(pos, 0)
 
             # Bonus for high citations
             citations = paper.get('citation_count', 0)
@@ -319,7 +270,7 @@ class PaperRecommender:
         # Return full paper objects with scores
         result = []
         for paper_id, score in sorted_papers:
-            paper = next((p for p in self.papers if p.get('id') == paper_id), None)
+            paper = self.index.get(paper_id)
             if paper:
                 result.append({
                     'paper': paper,
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory record type for papers.
+
+Papers are normally handled as nested dictionaries, which repeat every key
+string per paper and keep large text fields (abstract, mindmap, summaries,
+notes) fully decoded in memory. Paper stores the common fields in __slots__,
+interns strings that repeat across the collection (authors, venues,
+categories, types, dictionary keys) and keeps the heavy text fields
+zlib-compressed until they are accessed.
+
+Paper implements the read/write subset of the dict API used by the scripts
+(get, [], in, keys, items), so analysis code written against paper dicts
+works unchanged, and converts losslessly to and from the papers.yaml schema
+with from_dict()/to_dict().
+"""
+
+import sys
+import json
+import zlib
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+# Fields kept in dedicated slots
+CORE_FIELDS = (
+    'id', 'title', 'authors', 'venue', 'year', 'month', 'categories', 'type',
+    'arxiv_id', 'citation_count', 'starred', 'date_added',
+)
+
+# Fields kept compressed until accessed
+HEAVY_FIELDS = frozenset(('abstract', 'mindmap', 'ai_summary', 'notes', 'key_contributions'))
+
+# Core fields whose values repeat across papers
+_INTERNED_FIELDS = frozenset(('venue', 'type'))
+_INTERNED_LIST_FIELDS = frozenset(('authors', 'categories'))
+
+# Papers with the same key layout share one key-order tuple
+_KEY_ORDERS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+_MISSING = object()
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_keys(value):
+    """Recursively intern dictionary keys of nested containers."""
+    if isinstance(value, dict):
+        return {_intern(k): _intern_keys(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_intern_keys(v) for v in value]
+    return value
+
+
+def _shared_key_order(keys) -> Tuple[str, ...]:
+    order = tuple(sys.intern(k) for k in keys)
+    return _KEY_ORDERS.setdefault(order, order)
+
+
+class Paper:
+    """Slotted paper record that round-trips to the papers.yaml dictionary schema."""
+
+    __slots__ = CORE_FIELDS + ('_keys', '_extra', '_heavy')
+
+    def __init__(self):
+        for field in CORE_FIELDS:
+            object.__setattr__(self, field, None)
+        self._keys: Tuple[str, ...] = ()
+        self._extra: Optional[Dict[str, Any]] = None
+        self._heavy: Optional[bytes] = None
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Paper':
+        """
+        Build a record from a paper dictionary.
+
+        Args:
+            data: Paper in the papers.yaml / pending JSON schema
+
+        Returns:
+            Paper record
+        """
+        paper = cls()
+        heavy = {}
+        for key, value in data.items():
+            if key in HEAVY_FIELDS:
+                heavy[key] = value
+            else:
+                paper._set_light(key, value)
+        paper._keys = _shared_key_order(data.keys())
+        if heavy:
+            paper._store_heavy(heavy)
+        return paper
+
+    def to_dict(self) -> Dict:
+        """Convert back to a plain paper dictionary (original key order)."""
+        heavy = self._load_heavy()
+        result = {}
+        for key in self._keys:
+            if key in HEAVY_FIELDS:
+                result[key] = heavy[key]
+            elif key in CORE_FIELDS:
+                value = getattr(self, key)
+                result[key] = list(value) if key in _INTERNED_LIST_FIELDS and isinstance(value, tuple) else value
+            else:
+                result[key] = self._extra[key]
+        return result
+
+    # ------------------------------------------------------------------
+    # Storage helpers
+    # ------------------------------------------------------------------
+
+    def _set_light(self, key: str, value):
+        if key in CORE_FIELDS:
+            if key in _INTERNED_LIST_FIELDS and isinstance(value, list):
+                value = tuple(_intern(v) for v in value)
+            elif key in _INTERNED_FIELDS:
+                value = _intern(value)
+            object.__setattr__(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[sys.intern(key)] = _intern_keys(value)
+
+    def _load_heavy(self) -> Dict[str, Any]:
+        if self._heavy is None:
+            return {}
+        return json.loads(zlib.decompress(self._heavy).decode('utf-8'))
+
+    def _store_heavy(self, heavy: Dict[str, Any]):
+        encoded = json.dumps(heavy, ensure_ascii=False, separators=(',', ':'), default=str)
+        self._heavy = zlib.compress(encoded.encode('utf-8')) if heavy else None
+
+    def __getattr__(self, name: str):
+        # Only reached for names that are not slots: materialize heavy fields
+        if name in HEAVY_FIELDS:
+            return self._load_heavy().get(name)
+        raise AttributeError(f"'Paper' object has no attribute '{name}'")
+
+    # ------------------------------------------------------------------
+    # Dict-compatible access
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default=None):
+        """Same as dict.get on the paper dictionary."""
+        if key not in self._keys:
+            return default
+        if key in HEAVY_FIELDS:
+            return self._load_heavy().get(key, default)
+        if key in CORE_FIELDS:
+            return getattr(self, key)
+        return self._extra.get(key, default)
+
+    def __getitem__(self, key: str):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value):
+        if key in HEAVY_FIELDS:
+            heavy = self._load_heavy()
+            heavy[key] = value
+            self._store_heavy(heavy)
+        else:
+            self._set_light(key, value)
+        if key not in self._keys:
+            self._keys = _shared_key_order(self._keys + (key,))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def keys(self):
+        """Field names in original order."""
+        return list(self._keys)
+
+    def items(self):
+        """(field, value) pairs in original order."""
+        return self.to_dict().items()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Paper):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Paper(id={self.id!r}, title={self.title!r})"
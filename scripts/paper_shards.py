@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Year-sharded storage for the papers section of papers.yaml.
+
+Instead of one monolithic papers.yaml, the collection is written as:
+
+- data/papers/papers.yaml            metadata, categories, automation
+- data/papers/shards/<year>.yaml     {papers: [...]} for one publication year
+- data/papers/shards/manifest.yaml   shard order, paper counts and digests
+- data/papers/stats.yaml             precomputed counts and the most recently
+                                     added papers for Hugo widgets
+
+The manifest stores a digest of each shard's papers, so a writer only
+rewrites the shards whose papers actually changed (a daily update touches
+one small file), and a digest of each shard's file text, so a changed shard
+that is still exactly as we wrote it is patched block by block
+(yaml_canonical.patch) instead of re-serialized. Loading concatenates the
+shards in manifest order.
+"""
+
+import os
+import json
+import hashlib
+from collections import Counter
+from typing import Dict, List, Optional
+
+import yaml
+
+import yaml_canonical
+from atomic_io import atomic_write
+from yaml_snapshot import load_yaml, save_snapshot
+
+
+MANIFEST_VERSION = 2
+UNDATED_SHARD = 'undated'
+
+# Number of most recently added papers copied into stats.yaml
+RECENT_PAPERS = 20
+
+# Fields left out of the recent papers copy (not shown by the widgets)
+_RECENT_EXCLUDED_FIELDS = ('mindmap', 'notes', 'key_contributions')
+
+
+def shards_dir(papers_yaml_path: str) -> str:
+    """Directory holding the year shards of a papers.yaml file."""
+    return os.path.join(os.path.dirname(papers_yaml_path), 'shards')
+
+
+def manifest_path(papers_yaml_path: str) -> str:
+    """Shard manifest that belongs to a papers.yaml file."""
+    return os.path.join(shards_dir(papers_yaml_path), 'manifest.yaml')
+
+
+def stats_path(papers_yaml_path: str) -> str:
+    """Precomputed stats file that belongs to a papers.yaml file."""
+    return os.path.join(os.path.dirname(papers_yaml_path), 'stats.yaml')
+
+
+def shard_name(paper: Dict) -> str:
+    """Name of the shard a paper belongs to (its publication year)."""
+    year = paper.get('year')
+    if isinstance(year, int) or (isinstance(year, str) and year.isdigit()):
+        return str(year)
+    return UNDATED_SHARD
+
+
+def _shard_sort_key(name: str):
+    # Newest year first, undated last
+    return (1, 0) if name == UNDATED_SHARD else (0, -int(name))
+
+
+def _digest(papers: List[Dict]) -> str:
+    encoded = json.dumps(papers, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _dump_yaml(path: str, data, text: Optional[str] = None) -> str:
+    text = yaml_canonical.dump(data) if text is None else text
+    atomic_write(path, text)
+    save_snapshot(path, data)
+    return text
+
+
+def _write_if_changed(path: str, data):
+    text = yaml_canonical.dump(data)
+    if _read_text(path) != text:
+        _dump_yaml(path, data, text)
+
+
+def _shard_text(path: str, previous: Optional[Dict], papers: List[Dict]) -> str:
+    """Serialize a shard, patching the existing file if it is our last output."""
+    if previous and previous.get('text_digest'):
+        old_text = _read_text(path)
+        if old_text is not None and _text_digest(old_text) == previous['text_digest']:
+            return yaml_canonical.patch(old_text, load_yaml(path) or {}, {'papers': papers})
+    return yaml_canonical.dump({'papers': papers})
+
+
+def read_manifest(papers_yaml_path: str) -> Optional[Dict]:
+    """Return the shard manifest, or None if the collection is not sharded."""
+    path = manifest_path(papers_yaml_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or None
+
+
+def shard_paths(papers_yaml_path: str) -> Optional[List[str]]:
+    """Shard files in manifest order, or None if the collection is not sharded."""
+    manifest = read_manifest(papers_yaml_path)
+    if manifest is None:
+        return None
+    directory = shards_dir(papers_yaml_path)
+    return [os.path.join(directory, shard['file']) for shard in manifest.get('shards') or []]
+
+
+def load_sharded_papers(papers_yaml_path: str) -> Optional[List[Dict]]:
+    """
+    Load the papers of a sharded collection.
+
+    Args:
+        papers_yaml_path: Path to papers.yaml
+
+    Returns:
+        Papers in manifest order, or None if there is no shard manifest
+    """
+    paths = shard_paths(papers_yaml_path)
+    if paths is None:
+        return None
+
+    papers = []
+    for path in paths:
+        if os.path.exists(path):
+            papers.extend((load_yaml(path) or {}).get('papers') or [])
+    return papers
+
+
+def compute_stats(papers: List[Dict], metadata: Optional[Dict] = None) -> Dict:
+    """
+    Precompute the numbers the Hugo widgets show.
+
+    Args:
+        papers: All papers
+        metadata: papers.yaml metadata section
+
+    Returns:
+        Stats dictionary (written to stats.yaml)
+    """
+    categories = Counter()
+    years = Counter()
+    for paper in papers:
+        categories.update(set(paper.get('categories') or []))
+        years[shard_name(paper)] += 1
+
+    recent = sorted(papers, key=lambda p: str(p.get('date_added') or ''), reverse=True)
+    recent_papers = [
+        {key: value for key, value in paper.items() if key not in _RECENT_EXCLUDED_FIELDS}
+        for paper in recent[:RECENT_PAPERS]
+    ]
+
+    return {
+        'total_papers': len(papers),
+        'starred_papers': sum(1 for p in papers if p.get('starred')),
+        'total_citations': sum(int(p.get('citation_count') or 0) for p in papers),
+        'last_updated': (metadata or {}).get('last_updated'),
+        'categories': dict(sorted(categories.items())),
+        'years': {name: years[name] for name in sorted(years, key=_shard_sort_key)},
+        'recent_papers': recent_papers,
+    }
+
+
+def write_shards(papers_yaml_path: str, papers: List[Dict],
+                 metadata: Optional[Dict] = None) -> List[str]:
+    """
+    Write the papers as year shards, rewriting only shards that changed.
+
+    Also refreshes the manifest and stats.yaml. The caller is expected to
+    hold the papers.yaml lock.
+
+    Args:
+        papers_yaml_path: Path to papers.yaml
+        papers: All papers in collection order
+        metadata: papers.yaml metadata section (for stats.yaml)
+
+    Returns:
+        Names of the shards that were (re)written or removed
+    """
+    groups: Dict[str, List[Dict]] = {}
+    for paper in papers:
+        groups.setdefault(shard_name(paper), []).append(paper)
+
+    directory = shards_dir(papers_yaml_path)
+    os.makedirs(directory, exist_ok=True)
+
+    old_manifest = read_manifest(papers_yaml_path) or {}
+    old_shards = {shard['name']: shard for shard in old_manifest.get('shards') or []}
+    # Shards from an older manifest version are rewritten in the current format
+    same_format = old_manifest.get('version') == MANIFEST_VERSION
+
+    changed = []
+    shards = []
+    for name in sorted(groups, key=_shard_sort_key):
+        group = groups[name]
+        entry = {
+            'name': name,
+            'file': f'{name}.yaml',
+            'count': len(group),
+            'digest': _digest(group),
+        }
+        path = os.path.join(directory, entry['file'])
+        previous = old_shards.get(name) if same_format else None
+        if not previous or previous.get('digest') != entry['digest'] or not os.path.exists(path):
+            text = _dump_yaml(path, {'papers': group}, _shard_text(path, previous, group))
+            entry['text_digest'] = _text_digest(text)
+            changed.append(name)
+        else:
+            entry['text_digest'] = previous.get('text_digest')
+        shards.append(entry)
+
+    for name, shard in old_shards.items():
+        if name not in groups:
+            path = os.path.join(directory, shard['file'])
+            if os.path.exists(path):
+                os.remove(path)
+            changed.append(name)
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'total_papers': len(papers),
+        'shards': shards,
+    }
+    _write_if_changed(manifest_path(papers_yaml_path), manifest)
+    _write_if_changed(stats_path(papers_yaml_path), compute_stats(papers, metadata))
+
+    return changed
@@ -0,0 +1,942 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed paper store.
+
+All scripts read and modify the paper collection through PaperStore instead
+of parsing and rewriting data/papers/papers.yaml directly. The store keeps
+papers, authors and categories in an indexed SQLite file next to the YAML
+file, so single-paper updates are cheap row writes. (Citation history lives
+in its own time-series file, see citation_series.py.)
+
+papers.yaml (with the papers themselves in year shards, see paper_shards.py)
+stays the committed source of truth for Hugo: the store imports it whenever
+it changed on disk (e.g. after a git pull) and regenerates it with
+export_yaml() once a command has finished modifying the collection.
+Small edits can instead be recorded in the mutation journal (see
+paper_journal.py), which the store replays over the imported snapshot.
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import yaml_canonical
+from atomic_io import atomic_write, file_lock
+from paper_journal import MutationJournal, apply_mutation, default_journal_path
+from paper_merge import merge_documents
+from paper_record import Paper
+from paper_shards import load_sharded_papers, manifest_path, shard_paths, write_shards
+from yaml_snapshot import load_yaml, save_snapshot
+from yaml_stream import iter_document, iter_papers, top_level_keys
+
+
+DEFAULT_PAPERS_YAML = "data/papers/papers.yaml"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS categories (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS papers (
+    seq INTEGER PRIMARY KEY,
+    id TEXT,
+    arxiv_id TEXT,
+    title TEXT,
+    venue TEXT,
+    year INTEGER,
+    starred INTEGER NOT NULL DEFAULT 0,
+    date_added TEXT,
+    citation_count INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_papers_id ON papers(id);
+CREATE INDEX IF NOT EXISTS idx_papers_arxiv_id ON papers(arxiv_id);
+CREATE INDEX IF NOT EXISTS idx_papers_year ON papers(year);
+CREATE INDEX IF NOT EXISTS idx_papers_venue ON papers(venue);
+CREATE TABLE IF NOT EXISTS paper_authors (
+    paper_seq INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (paper_seq, position)
+);
+CREATE INDEX IF NOT EXISTS idx_paper_authors_name ON paper_authors(name);
+CREATE TABLE IF NOT EXISTS paper_categories (
+    paper_seq INTEGER NOT NULL,
+    category_id TEXT NOT NULL,
+    PRIMARY KEY (paper_seq, category_id)
+);
+CREATE INDEX IF NOT EXISTS idx_paper_categories_category ON paper_categories(category_id);
+CREATE TABLE IF NOT EXISTS base_document (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS base_items (
+    section TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (section, position)
+);
+CREATE TABLE IF NOT EXISTS citation_history (
+    date TEXT NOT NULL,
+    paper_id TEXT NOT NULL,
+    citation_count INTEGER NOT NULL DEFAULT 0,
+    influential_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (date, paper_id)
+);
+"""
+
+# Top-level sections with dedicated tables (everything else lives in `sections`)
+TABLE_SECTIONS = ('categories', 'papers', 'citation_history')
+
+# Sections imported item by item (and kept row by row in the merge base)
+STREAMED_SECTIONS = ('papers', 'citation_history')
+
+
+def default_db_path(papers_yaml_path: str) -> str:
+    """Return the SQLite path that belongs to a papers.yaml file."""
+    root, _ = os.path.splitext(papers_yaml_path)
+    return root + '.db'
+
+
+def _file_signature(path: str) -> Dict:
+    """Size, mtime and content hash of a file."""
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+
+
+def read_document(papers_yaml_path: str) -> Dict:
+    """
+    Read papers.yaml as one document, joining the year shards back in.
+
+    Args:
+        papers_yaml_path: Path to papers.yaml
+
+    Returns:
+        Parsed document with the papers section in its usual place
+    """
+    data = load_yaml(papers_yaml_path) or {}
+    if 'papers' in data:
+        return data
+
+    papers = load_sharded_papers(papers_yaml_path)
+    if papers is None:
+        return data
+
+    # Put the papers section back after categories, where it used to be
+    document = {}
+    for name, value in data.items():
+        document[name] = value
+        if name == 'categories':
+            document['papers'] = papers
+    document.setdefault('papers', papers)
+    return document
+
+
+def iter_document_sections(papers_yaml_path: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream papers.yaml section by section, joining the year shards back in.
+
+    Like read_document(), but the papers and citation_history sections are
+    iterators (see yaml_stream.iter_document), so only one paper is held in
+    memory at a time. Consume each iterator before the next section.
+
+    Args:
+        papers_yaml_path: Path to papers.yaml
+
+    Yields:
+        (section name, value or item iterator) in document order
+    """
+    if shard_paths(papers_yaml_path) is None or 'papers' in top_level_keys(papers_yaml_path):
+        yield from iter_document(papers_yaml_path, STREAMED_SECTIONS)
+        return
+
+    # Put the papers section back after categories, where it used to be
+    placed = False
+    for name, value in iter_document(papers_yaml_path, STREAMED_SECTIONS):
+        yield name, value
+        if name == 'categories':
+            yield 'papers', iter_papers(papers_yaml_path)
+            placed = True
+    if not placed:
+        yield 'papers', iter_papers(papers_yaml_path)
+
+
+def _as_int(value, default: int = 0) -> int:
+    """Coerce a YAML scalar to int for indexed columns."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class PaperStore:
+    """Indexed SQLite store for the paper collection."""
+
+    def __init__(self, papers_yaml_path: str = DEFAULT_PAPERS_YAML,
+                 db_path: Optional[str] = None, auto_sync: bool = True,
+                 journal_path: Optional[str] = None):
+        """
+        Open (and create if needed) the store for a papers.yaml file.
+
+        Args:
+            papers_yaml_path: Path to papers.yaml (import source and export target)
+            db_path: Path to SQLite file (default: papers.db next to papers.yaml)
+            auto_sync: Import papers.yaml if it changed since the last sync
+            journal_path: Mutation journal (default: papers.journal.jsonl next to papers.yaml)
+        """
+        self.papers_yaml_path = papers_yaml_path
+        self.db_path = db_path or default_db_path(papers_yaml_path)
+        self.journal = MutationJournal(journal_path or default_journal_path(papers_yaml_path))
+        self._batch_depth = 0
+
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.executescript(SCHEMA)
+
+        if auto_sync:
+            self.sync()
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Transactions and bookkeeping
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def batch(self):
+        """Group several writes into a single transaction."""
+        self._batch_depth += 1
+        try:
+            yield self
+        except Exception:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.rollback()
+            raise
+        self._batch_depth -= 1
+        self._commit()
+
+    def _commit(self):
+        if self._batch_depth == 0:
+            self.conn.commit()
+
+    def _get_meta(self, key: str, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key: str, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (key, json.dumps(value))
+        )
+
+    def _mark_dirty(self):
+        self._set_meta('dirty', True)
+
+    def _ensure_section(self, name: str):
+        """Register a table-backed section so export_yaml emits it."""
+        if not self.conn.execute("SELECT 1 FROM sections WHERE name = ?", (name,)).fetchone():
+            self.set_section(name, None)
+
+    @property
+    def dirty(self) -> bool:
+        """True if the store has changes that are not exported yet."""
+        return bool(self._get_meta('dirty', False))
+
+    # ------------------------------------------------------------------
+    # YAML import
+    # ------------------------------------------------------------------
+
+    def _collection_files(self) -> List[str]:
+        """papers.yaml plus the shard manifest (which changes whenever a shard does)."""
+        files = [self.papers_yaml_path]
+        manifest = manifest_path(self.papers_yaml_path)
+        if os.path.exists(manifest):
+            files.append(manifest)
+        return files
+
+    def _collection_signature(self) -> Dict:
+        return {os.path.basename(path): _file_signature(path) for path in self._collection_files()}
+
+    def _yaml_changed(self) -> bool:
+        """Check whether papers.yaml (or its shards) differ from the last import/export."""
+        if not os.path.exists(self.papers_yaml_path):
+            return False
+
+        known = self._get_meta('yaml_signature')
+        files = self._collection_files()
+        if not known or set(known) != {os.path.basename(path) for path in files}:
+            return True
+
+        touched = []
+        for path in files:
+            signature = known[os.path.basename(path)]
+            stat = os.stat(path)
+            if stat.st_size != signature['size'] or stat.st_mtime_ns != signature['mtime_ns']:
+                touched.append(path)
+        if not touched:
+            return False
+
+        # Touched but maybe identical (e.g. git checkout) - compare content
+        for path in touched:
+            if _file_signature(path)['sha256'] != known[os.path.basename(path)]['sha256']:
+                return True
+        self._set_meta('yaml_signature', self._collection_signature())
+        self.conn.commit()
+        return False
+
+    def sync(self) -> bool:
+        """
+        Import papers.yaml if it changed since the last sync and replay the journal tail.
+
+        Returns:
+            True if the YAML file was (re-)imported
+        """
+        imported = False
+        if self._yaml_changed():
+            if self.dirty:
+                # Keep unexported changes: merge them with the new file
+                self.merge_from_disk()
+            else:
+                self.import_yaml()
+            imported = True
+
+        self.replay_journal()
+        return imported
+
+    def import_yaml(self, path: Optional[str] = None):
+        """
+        Replace the store contents with a papers.yaml document.
+
+        Args:
+            path: YAML file to import (default: the store's papers.yaml)
+        """
+        path = path or self.papers_yaml_path
+
+        with self.batch():
+            self._import_sections(iter_document_sections(path))
+            if path == self.papers_yaml_path:
+                self._set_meta('yaml_signature', self._collection_signature())
+            self._set_meta('dirty', False)
+
+    def import_document(self, data: Dict):
+        """Replace the store contents with an already parsed document."""
+        self._import_sections(data.items())
+
+    def _import_sections(self, sections: Iterable[Tuple[str, Any]]):
+        """
+        Replace the store contents with a document given section by section.
+
+        Args:
+            sections: (name, value) in document order; papers and
+                citation_history may be iterators, which are inserted item by item
+        """
+        with self.batch():
+            for table in ('sections', 'categories', 'papers', 'paper_authors',
+                          'paper_categories', 'citation_history', 'base_items'):
+                self.conn.execute(f"DELETE FROM {table}")
+
+            base = {}
+            streamed = []
+            for position, (name, value) in enumerate(sections):
+                if name in STREAMED_SECTIONS and value is not None:
+                    # Kept out of base_document, one base_items row per item
+                    base[name] = None
+                    streamed.append(name)
+                    value = self._import_items(name, value)
+                else:
+                    base[name] = value
+
+                stored = None if name in TABLE_SECTIONS else json.dumps(value, ensure_ascii=False)
+                self.conn.execute(
+                    "INSERT INTO sections (name, position, value) VALUES (?, ?, ?)",
+                    (name, position, stored)
+                )
+
+                if name == 'categories':
+                    for index, category in enumerate(value or []):
+                        self.conn.execute(
+                            "INSERT OR REPLACE INTO categories (id, position, data) VALUES (?, ?, ?)",
+                            (category.get('id'), index, json.dumps(category, ensure_ascii=False))
+                        )
+
+            # Journal entries up to this sequence number are already in the snapshot
+            metadata = base.get('metadata') or {}
+            self._set_meta('journal_seq', _as_int(metadata.get('journal_seq')))
+            self._write_base_document(base, streamed)
+
+    def _import_items(self, name: str, items: Iterable) -> None:
+        """Insert the items of a streamed section and record them in the merge base."""
+        for index, item in enumerate(items):
+            self.conn.execute(
+                "INSERT INTO base_items (section, position, data) VALUES (?, ?, ?)",
+                (name, index, json.dumps(item, ensure_ascii=False, default=str))
+            )
+            if name == 'papers':
+                self._insert_paper(item)
+            else:
+                self._insert_citation_snapshot(item.get('date', ''), item.get('papers') or {})
+
+    def _set_base(self, data: Dict):
+        """Remember the document last read from / written to papers.yaml (merge base)."""
+        self.conn.execute("DELETE FROM base_items")
+        document = {}
+        streamed = []
+        for name, value in data.items():
+            if name in STREAMED_SECTIONS and isinstance(value, list):
+                self.conn.executemany(
+                    "INSERT INTO base_items (section, position, data) VALUES (?, ?, ?)",
+                    ((name, index, json.dumps(item, ensure_ascii=False, default=str))
+                     for index, item in enumerate(value))
+                )
+                document[name] = None
+                streamed.append(name)
+            else:
+                document[name] = value
+        self._write_base_document(document, streamed)
+
+    def _write_base_document(self, document: Dict, streamed: List[str]):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO base_document (id, data) VALUES (1, ?)",
+            (json.dumps(document, ensure_ascii=False, default=str),)
+        )
+        self._set_meta('base_streamed', streamed)
+
+    def _get_base(self) -> Optional[Dict]:
+        row = self.conn.execute("SELECT data FROM base_document WHERE id = 1").fetchone()
+        if not row:
+            return None
+        document = json.loads(row[0])
+        for name in self._get_meta('base_streamed', []):
+            document[name] = [json.loads(data) for (data,) in self.conn.execute(
+                "SELECT data FROM base_items WHERE section = ? ORDER BY position", (name,))]
+        return document
+
+    def merge_from_disk(self) -> List[str]:
+        """
+        Three-way merge papers.yaml (changed by another process) into the store.
+
+        The merge base is the document this store last imported or exported;
+        see paper_merge.py for the rules.
+
+        Returns:
+            Conflicts that were resolved in favour of the store's version
+        """
+        with file_lock(self.papers_yaml_path):
+            theirs = read_document(self.papers_yaml_path)
+            result = merge_documents(self._get_base(), self.load_document(), theirs)
+
+            with self.batch():
+                replayed_seq = self.journal_seq
+                self.import_document(result.document)
+                # Journal entries this store already applied are part of the merge result
+                self._set_meta('journal_seq', max(replayed_seq, self.journal_seq))
+                self._set_base(theirs)
+                self._set_meta('yaml_signature', self._collection_signature())
+                self._mark_dirty()
+
+        for conflict in result.conflicts:
+            print(f"⚠️  Merge conflict in {self.papers_yaml_path}: {conflict} "
+                  f"(kept local value)", file=sys.stderr)
+        return result.conflicts
+
+    # ------------------------------------------------------------------
+    # Papers
+    # ------------------------------------------------------------------
+
+    def _write_indexes(self, seq: int, paper: Dict):
+        self.conn.execute("DELETE FROM paper_authors WHERE paper_seq = ?", (seq,))
+        self.conn.execute("DELETE FROM paper_categories WHERE paper_seq = ?", (seq,))
+        self.conn.executemany(
+            "INSERT INTO paper_authors (paper_seq, position, name) VALUES (?, ?, ?)",
+            [(seq, i, str(name)) for i, name in enumerate(paper.get('authors') or [])]
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO paper_categories (paper_seq, category_id) VALUES (?, ?)",
+            [(seq, str(cat)) for cat in paper.get('categories') or []]
+        )
+
+    def _paper_columns(self, paper: Dict) -> tuple:
+        year = paper.get('year')
+        return (
+            paper.get('id'),
+            paper.get('arxiv_id') or None,
+            paper.get('title'),
+            paper.get('venue'),
+            _as_int(year, None) if year is not None else None,
+            1 if paper.get('starred') else 0,
+            str(paper['date_added']) if paper.get('date_added') else None,
+            _as_int(paper.get('citation_count')),
+            json.dumps(paper, ensure_ascii=False, default=str),
+        )
+
+    def _insert_paper(self, paper: Dict) -> int:
+        cursor = self.conn.execute(
+            "INSERT INTO papers (id, arxiv_id, title, venue, year, starred, date_added, "
+            "citation_count, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            self._paper_columns(paper)
+        )
+        seq = cursor.lastrowid
+        self._write_indexes(seq, paper)
+        return seq
+
+    def _find_seq(self, paper_id: str) -> Optional[int]:
+        row = self.conn.execute(
+            "SELECT seq FROM papers WHERE id = ? ORDER BY seq LIMIT 1", (paper_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def iter_papers(self) -> Iterator[Dict]:
+        """Yield all papers in collection order."""
+        cursor = self.conn.execute("SELECT data FROM papers ORDER BY seq")
+        for (data,) in cursor:
+            yield json.loads(data)
+
+    def get_papers(self) -> List[Dict]:
+        """Return all papers in collection order."""
+        return list(self.iter_papers())
+
+    def iter_records(self) -> Iterator[Paper]:
+        """Yield all papers as compact Paper records in collection order."""
+        for paper in self.iter_papers():
+            yield Paper.from_dict(paper)
+
+    def get_records(self) -> List[Paper]:
+        """Return all papers as compact Paper records (for large read-only analyses)."""
+        return list(self.iter_records())
+
+    def count_papers(self) -> int:
+        """Number of papers in the store."""
+        return self.conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def get_paper(self, paper_id: str) -> Optional[Dict]:
+        """Get a paper by its ID."""
+        row = self.conn.execute(
+            "SELECT data FROM papers WHERE id = ? ORDER BY seq LIMIT 1", (paper_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_paper_by_arxiv_id(self, arxiv_id: str) -> Optional[Dict]:
+        """Get a paper by its arXiv ID."""
+        row = self.conn.execute(
+            "SELECT data FROM papers WHERE arxiv_id = ? ORDER BY seq LIMIT 1", (arxiv_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def arxiv_ids(self) -> Set[str]:
+        """All arXiv IDs in the collection."""
+        rows = self.conn.execute("SELECT arxiv_id FROM papers WHERE arxiv_id IS NOT NULL")
+        return {row[0] for row in rows}
+
+    def get_papers_by_author(self, author_name: str) -> List[Dict]:
+        """Get papers with an exact author name match."""
+        rows = self.conn.execute(
+            "SELECT DISTINCT p.seq, p.data FROM papers p "
+            "JOIN paper_authors a ON a.paper_seq = p.seq WHERE a.name = ? ORDER BY p.seq",
+            (author_name,)
+        )
+        return [json.loads(data) for _, data in rows]
+
+    def get_papers_by_category(self, category_id: str) -> List[Dict]:
+        """Get papers tagged with a category ID."""
+        rows = self.conn.execute(
+            "SELECT p.data FROM papers p "
+            "JOIN paper_categories c ON c.paper_seq = p.seq WHERE c.category_id = ? ORDER BY p.seq",
+            (category_id,)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def add_paper(self, paper: Dict):
+        """Append a paper to the collection."""
+        self._ensure_section('papers')
+        self._insert_paper(paper)
+        self._mark_dirty()
+        self._commit()
+
+    def update_paper(self, paper_id: str, changes: Dict) -> bool:
+        """
+        Update fields of a single paper.
+
+        Args:
+            paper_id: Paper ID
+            changes: Fields to set on the paper
+
+        Returns:
+            True if the paper exists and was updated
+        """
+        seq = self._find_seq(paper_id)
+        if seq is None:
+            return False
+
+        row = self.conn.execute("SELECT data FROM papers WHERE seq = ?", (seq,)).fetchone()
+        paper = json.loads(row[0])
+        paper.update(changes)
+        self.put_paper(paper, seq=seq)
+        return True
+
+    def put_paper(self, paper: Dict, seq: Optional[int] = None):
+        """
+        Write a full paper record, replacing the stored one with the same ID.
+
+        Args:
+            paper: Paper dictionary
+            seq: Row to overwrite (looked up by ID if not given)
+        """
+        if seq is None:
+            seq = self._find_seq(paper.get('id'))
+        if seq is None:
+            self._ensure_section('papers')
+            self._insert_paper(paper)
+        else:
+            self.conn.execute(
+                "UPDATE papers SET id = ?, arxiv_id = ?, title = ?, venue = ?, year = ?, "
+                "starred = ?, date_added = ?, citation_count = ?, data = ? WHERE seq = ?",
+                self._paper_columns(paper) + (seq,)
+            )
+            self._write_indexes(seq, paper)
+        self._mark_dirty()
+        self._commit()
+
+    def replace_papers(self, papers: List[Dict]):
+        """Replace the whole paper list (e.g. after cleanup/reordering)."""
+        with self.batch():
+            self._ensure_section('papers')
+            self.conn.execute("DELETE FROM papers")
+            self.conn.execute("DELETE FROM paper_authors")
+            self.conn.execute("DELETE FROM paper_categories")
+            for paper in papers:
+                self._insert_paper(paper)
+            self._mark_dirty()
+
+    # ------------------------------------------------------------------
+    # Mutation journal
+    # ------------------------------------------------------------------
+
+    @property
+    def journal_seq(self) -> int:
+        """Sequence number of the last journal entry applied to the store."""
+        return self._get_meta('journal_seq', 0)
+
+    def replay_journal(self) -> int:
+        """
+        Apply journal entries that the store has not seen yet.
+
+        Returns:
+            Number of entries applied
+        """
+        applied = 0
+        last_seq = self.journal_seq
+        with self.batch():
+            for entry in self.journal.entries(after_seq=last_seq):
+                self._apply_entry(entry)
+                last_seq = entry['seq']
+                applied += 1
+            if applied:
+                self._set_meta('journal_seq', last_seq)
+        return applied
+
+    def _apply_entry(self, entry: Dict) -> bool:
+        paper = self.get_paper(entry['paper_id'])
+        if paper is None:
+            return False
+        self.put_paper(apply_mutation(paper, entry))
+        return True
+
+    def record(self, op: str, paper_id: str, **payload) -> bool:
+        """
+        Record a mutation in the journal and apply it to the store.
+
+        Args:
+            op: Mutation type (star, tag, note, citation, set)
+            paper_id: Paper ID
+            **payload: Mutation payload
+
+        Returns:
+            True if the paper exists and the mutation was recorded
+        """
+        if self._find_seq(paper_id) is None:
+            return False
+
+        with self.batch():
+            # Pick up entries written by other processes first
+            self.replay_journal()
+            entry = self.journal.append(op, paper_id, **payload)
+            self._apply_entry(entry)
+            self._set_meta('journal_seq', entry['seq'])
+        return True
+
+    def compact(self) -> int:
+        """
+        Fold the journal into papers.yaml and truncate it.
+
+        Returns:
+            Sequence number the snapshot now includes
+        """
+        with file_lock(self.papers_yaml_path):
+            self.replay_journal()
+            seq = self.journal_seq
+            self.export_yaml(force=True)
+            self.journal.truncate(seq)
+        return seq
+
+    # ------------------------------------------------------------------
+    # Categories and other sections
+    # ------------------------------------------------------------------
+
+    def get_categories(self) -> List[Dict]:
+        """Return category definitions in collection order."""
+        rows = self.conn.execute("SELECT data FROM categories ORDER BY position")
+        return [json.loads(data) for (data,) in rows]
+
+    def get_section(self, name: str, default=None):
+        """Return a top-level section (metadata, automation, ...)."""
+        row = self.conn.execute("SELECT value FROM sections WHERE name = ?", (name,)).fetchone()
+        if row is None or row[0] is None:
+            return default
+        return json.loads(row[0])
+
+    def set_section(self, name: str, value):
+        """Create or replace a top-level section."""
+        row = self.conn.execute("SELECT position FROM sections WHERE name = ?", (name,)).fetchone()
+        if row:
+            position = row[0]
+        else:
+            position = self.conn.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM sections"
+            ).fetchone()[0]
+        stored = None if name in TABLE_SECTIONS else json.dumps(value, ensure_ascii=False)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sections (name, position, value) VALUES (?, ?, ?)",
+            (name, position, stored)
+        )
+        self._mark_dirty()
+        self._commit()
+
+    def get_metadata(self) -> Dict:
+        """Return the metadata section."""
+        return self.get_section('metadata', {}) or {}
+
+    def update_metadata(self, **fields):
+        """Set fields in the metadata section."""
+        metadata = self.get_metadata()
+        metadata.update(fields)
+        self.set_section('metadata', metadata)
+
+    # ------------------------------------------------------------------
+    # Citation history
+    # ------------------------------------------------------------------
+
+    def _insert_citation_snapshot(self, date: str, papers: Dict):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO citation_history "
+            "(date, paper_id, citation_count, influential_count) VALUES (?, ?, ?, ?)",
+            [
+                (str(date), paper_id, _as_int(counts.get('citation_count')),
+                 _as_int(counts.get('influential_count')))
+                for paper_id, counts in papers.items()
+            ]
+        )
+
+    def get_citation_history(self) -> List[Dict]:
+        """Return citation history in the papers.yaml layout (oldest first)."""
+        history = []
+        rows = self.conn.execute(
+            "SELECT date, paper_id, citation_count, influential_count "
+            "FROM citation_history ORDER BY date, rowid"
+        )
+        for date, paper_id, citations, influential in rows:
+            if not history or history[-1]['date'] != date:
+                history.append({'date': date, 'papers': {}})
+            history[-1]['papers'][paper_id] = {
+                'citation_count': citations,
+                'influential_count': influential
+            }
+        return history
+
+    def pop_citation_history(self) -> List[Dict]:
+        """
+        Remove the legacy citation_history section and return its snapshots.
+
+        Citation history now lives in the citation series store
+        (citation_series.py); this is used to migrate old papers.yaml files.
+        """
+        history = self.get_citation_history()
+        if self.conn.execute("SELECT 1 FROM sections WHERE name = 'citation_history'").fetchone():
+            with self.batch():
+                self.conn.execute("DELETE FROM citation_history")
+                self.conn.execute("DELETE FROM sections WHERE name = 'citation_history'")
+                self._mark_dirty()
+        return history
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def load_document(self) -> Dict:
+        """Rebuild the full papers.yaml document from the store."""
+        data = {}
+        rows = self.conn.execute("SELECT name, value FROM sections ORDER BY position").fetchall()
+        for name, value in rows:
+            if name == 'categories':
+                data[name] = self.get_categories()
+            elif name == 'papers':
+                data[name] = self.get_papers()
+            elif name == 'citation_history':
+                data[name] = self.get_citation_history()
+            else:
+                data[name] = json.loads(value) if value is not None else None
+        return data
+
+    def export_yaml(self, path: Optional[str] = None, force: bool = False) -> bool:
+        """
+        Regenerate papers.yaml from the store.
+
+        Args:
+            path: Output path (default: the store's papers.yaml)
+            force: Write even if nothing changed since the last export
+
+        Returns:
+            True if the file was written
+        """
+        path = path or self.papers_yaml_path
+        own_file = path == self.papers_yaml_path
+        if own_file and not force and not self.dirty:
+            return False
+
+        # Record which journal entries the snapshot already contains
+        if self.journal_seq and self.get_metadata().get('journal_seq') != self.journal_seq:
+            self.update_metadata(journal_seq=self.journal_seq)
+
+        with file_lock(path):
+            # Another process rewrote papers.yaml since we read it: merge, don't clobber
+            if own_file and self._yaml_changed():
+                self.merge_from_disk()
+
+            data = self.load_document()
+            if own_file and 'papers' in data:
+                # Papers go to year shards; papers.yaml keeps the other sections
+                document = {name: value for name, value in data.items() if name != 'papers'}
+                self._write_yaml(path, document)
+                write_shards(path, data['papers'], data.get('metadata'))
+            else:
+                self._write_yaml(path, data)
+
+            if own_file:
+                self._set_meta('yaml_signature', self._collection_signature())
+                self._set_meta('dirty', False)
+                self._set_base(data)
+                self.conn.commit()
+        return True
+
+    @staticmethod
+    def _write_yaml(path: str, data: Dict):
+        atomic_write(path, yaml_canonical.dump(data))
+        save_snapshot(path, data)
+
+    def get_stats(self) -> Dict:
+        """Row counts for the store tables."""
+        return {
+            'papers': self.count_papers(),
+            'authors': self.conn.execute(
+                "SELECT COUNT(DISTINCT name) FROM paper_authors").fetchone()[0],
+            'categories': self.conn.execute("SELECT COUNT(*) FROM categories").fetchone()[0],
+            'citation_snapshots': self.conn.execute(
+                "SELECT COUNT(DISTINCT date) FROM citation_history").fetchone()[0],
+            'journal_seq': self.journal_seq,
+            'journal_bytes': self.journal.size(),
+            'dirty': self.dirty,
+        }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Manage the SQLite paper store behind papers.yaml'
+    )
+    parser.add_argument(
+        '--papers-yaml',
+        default=DEFAULT_PAPERS_YAML,
+        help=f'Path to papers.yaml (default: {DEFAULT_PAPERS_YAML})'
+    )
+    parser.add_argument(
+        '--db',
+        help='Path to SQLite store (default: papers.db next to papers.yaml)'
+    )
+
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+    subparsers.add_parser('import', help='Re-import papers.yaml into the store')
+    export_parser = subparsers.add_parser('export', help='Regenerate papers.yaml from the store')
+    export_parser.add_argument('--output', help='Write to another path instead')
+    export_parser.add_argument('--force', action='store_true', help='Write even if unchanged')
+    subparsers.add_parser('compact', help='Fold the mutation journal into papers.yaml')
+    subparsers.add_parser('stats', help='Show store statistics')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return 0
+
+    if args.command == 'import':
+        if not os.path.exists(args.papers_yaml):
+            print(f"Error: Papers file not found: {args.papers_yaml}", file=sys.stderr)
+            return 1
+        store = PaperStore(args.papers_yaml, db_path=args.db, auto_sync=False)
+        store.import_yaml()
+        print(f"✅ Imported {store.count_papers()} papers into {store.db_path}")
+
+    elif args.command == 'export':
+        store = PaperStore(args.papers_yaml, db_path=args.db)
+        if store.export_yaml(args.output, force=args.force):
+            print(f"✅ Exported {store.count_papers()} papers to {args.output or args.papers_yaml}")
+        else:
+            print("ℹ️  papers.yaml is up to date")
+
+    elif args.command == 'compact':
+        store = PaperStore(args.papers_yaml, db_path=args.db)
+        seq = store.compact()
+        print(f"✅ Compacted journal into {args.papers_yaml} (through entry {seq})")
+
+    elif args.command == 'stats':
+        store = PaperStore(args.papers_yaml, db_path=args.db)
+        stats = store.get_stats()
+        print("\n📊 Paper Store Statistics:\n")
+        print(f"Database: {store.db_path}")
+        print(f"Papers: {stats['papers']}")
+        print(f"Authors: {stats['authors']}")
+        print(f"Categories: {stats['categories']}")
+        print(f"Citation snapshots: {stats['citation_snapshots']}")
+        print(f"Journal: {stats['journal_bytes']} bytes (applied through entry {stats['journal_seq']})")
+        print(f"Unexported changes: {'yes' if stats['dirty'] else 'no'}")
+
+    store.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
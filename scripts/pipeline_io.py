@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Newline-delimited JSON hand-off between the daily pipeline stages.
+
+Each stage reads the previous stage's records one at a time and appends
+every processed record to its own output as soon as it is done:
+
+    candidates.jsonl -> enriched.jsonl -> filtered.jsonl -> with_summaries.jsonl -> with_audio.jsonl
+
+(all in data/papers/pending/). A finished file ends with a marker line
+
+    {"_end": true, "count": 10, "finished_at": "2025-11-17T06:12:03"}
+
+so a file without it is known to be incomplete: a crashed stage loses only
+the record it was working on (resume=True continues after the records
+already written), and a downstream stage started early can follow the file
+while it grows (follow=True) and stop at the marker.
+
+Whole-document .json files ({"papers": [...]}) written by older versions
+are still read.
+"""
+
+import os
+import json
+import time
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Set
+
+
+PENDING_DIR = "data/papers/pending"
+CANDIDATES_PATH = f"{PENDING_DIR}/candidates.jsonl"
+ENRICHED_PATH = f"{PENDING_DIR}/enriched.jsonl"
+FILTERED_PATH = f"{PENDING_DIR}/filtered.jsonl"
+SUMMARIES_PATH = f"{PENDING_DIR}/with_summaries.jsonl"
+AUDIO_PATH = f"{PENDING_DIR}/with_audio.jsonl"
+CARRYOVER_PATH = f"{PENDING_DIR}/carryover.jsonl"  # candidates a filter time budget left unread
+
+END_KEY = "_end"
+FOLLOW_POLL_INTERVAL = 1.0  # seconds
+
+
+def _is_end(record: Dict) -> bool:
+    return record.get(END_KEY) is True
+
+
+def _read_legacy(path: str) -> Iterator[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from json.load(f).get("papers") or []
+
+
+def read_records(path: str, follow: bool = False,
+                 timeout: Optional[float] = None) -> Iterator[Dict]:
+    """
+    Iterate the records of a stage file.
+
+    Args:
+        path: .jsonl stage file (or a legacy .json document)
+        follow: Wait for the file and for new lines until the end marker
+            (the producing stage may still be running)
+        timeout: With follow, seconds without progress before giving up
+
+    Yields:
+        Records in file order (without the end marker)
+
+    Raises:
+        TimeoutError: If following and the file stops growing for timeout seconds
+    """
+    if path.endswith('.json') and os.path.exists(path):
+        yield from _read_legacy(path)
+        return
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    def wait():
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(f"{path} has no end marker after waiting {timeout:.0f}s")
+        time.sleep(FOLLOW_POLL_INTERVAL)
+
+    while follow and not os.path.exists(path):
+        wait()
+    if not os.path.exists(path):
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        while True:
+            line = f.readline()
+            if not line:
+                if not follow:
+                    break
+                wait()
+                continue
+            buffer += line
+            if not buffer.endswith('\n'):
+                # Partial line: the writer is mid-record (or crashed in it)
+                continue
+            text, buffer = buffer.strip(), ''
+            if not text:
+                continue
+            record = json.loads(text)
+            if _is_end(record):
+                return
+            if deadline is not None:
+                deadline = time.monotonic() + timeout
+            yield record
+
+
+def is_complete(path: str) -> bool:
+    """Whether a stage file exists and ends with the end marker."""
+    if not os.path.exists(path):
+        return False
+    if path.endswith('.json'):
+        return True
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 4096))
+        lines = f.read().splitlines()
+    try:
+        return bool(lines) and _is_end(json.loads(lines[-1]))
+    except ValueError:
+        return False
+
+
+def find_stage_file(*paths: str) -> Optional[str]:
+    """
+    First existing stage file, checking each .jsonl path and its legacy .json.
+
+    Args:
+        *paths: Candidate .jsonl paths, most processed stage first
+
+    Returns:
+        Path of the first file found, or None
+    """
+    for path in paths:
+        for candidate in (path, os.path.splitext(path)[0] + '.json'):
+            if os.path.exists(candidate):
+                return candidate
+    return None
+
+
+def current_stage_file(*paths: str) -> Optional[str]:
+    """
+    Most processed stage file that is up to date with its inputs.
+
+    A file is skipped when it is incomplete or older than the next existing
+    (less processed) one, e.g. an enriched.jsonl left over from a run whose
+    enrichment step did not happen.
+
+    Args:
+        *paths: Stage files, most processed first
+
+    Returns:
+        Path of the chosen file, or None if none exists
+    """
+    existing = [path for path in paths if os.path.exists(path)]
+    for path, upstream in zip(existing, existing[1:] + [None]):
+        if not is_complete(path):
+            continue
+        if upstream is None or os.path.getmtime(path) >= os.path.getmtime(upstream):
+            return path
+    return existing[-1] if existing else None
+
+
+class RecordWriter:
+    """Appends records to a stage file, flushing each one as it is written."""
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Open a stage file for writing.
+
+        Args:
+            path: .jsonl output file
+            resume: Keep the records of an earlier, interrupted run (their
+                arxiv_ids are in done_ids) and append after them; otherwise
+                the file is truncated
+        """
+        self.path = path
+        self.count = 0
+        self.done_ids: Set[str] = set()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        if resume and os.path.exists(path):
+            kept = []
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.endswith('\n'):
+                        break  # torn record of the crashed run
+                    text = line.strip()
+                    if not text:
+                        continue
+                    record = json.loads(text)
+                    if _is_end(record):
+                        break
+                    kept.append(line)
+                    self.done_ids.add(record.get("arxiv_id"))
+            with open(path, 'w', encoding='utf-8') as f:
+                f.writelines(kept)
+            self.count = len(kept)
+            self._file = open(path, 'a', encoding='utf-8')
+        else:
+            self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, record: Dict):
+        """Append one record and flush it to the file."""
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self.count += 1
+
+    def close(self, complete: bool = True):
+        """
+        Close the file.
+
+        Args:
+            complete: Append the end marker (False leaves the file resumable)
+        """
+        if self._file.closed:
+            return
+        if complete:
+            self._file.write(json.dumps({
+                END_KEY: True,
+                "count": self.count,
+                "finished_at": datetime.now().isoformat(timespec='seconds'),
+            }) + '\n')
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(complete=exc_type is None)
+        return False
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Background prefetching for paged result iterators.
+
+arxiv.Client.results() fetches a page, yields its results one by one and
+only requests the next page once the consumer asks for more. Whatever the
+consumer does per result (conversion, de-duplication, cursor bookkeeping)
+therefore adds to the time between two page requests. prefetch() drains
+the iterator on a background thread into a bounded buffer, so the next
+page is requested as soon as the rate limiter allows while the consumer is
+still working through the previous one.
+"""
+
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+
+T = TypeVar('T')
+
+DEFAULT_BUFFER = 200  # results; two arXiv pages
+
+_DONE = object()
+_POLL_INTERVAL = 0.1  # seconds, how often a blocked producer checks for cancellation
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def prefetch(iterable: Iterable[T], buffer: int = DEFAULT_BUFFER) -> Iterator[T]:
+    """
+    Iterate over iterable while a background thread keeps fetching ahead.
+
+    Args:
+        iterable: Source iterator (consumed on the background thread only)
+        buffer: Maximum items held ahead of the consumer
+
+    Yields:
+        The items of iterable, in order
+
+    Raises:
+        Whatever the source iterator raised, at the point it raised it
+    """
+    items: queue.Queue = queue.Queue(maxsize=max(1, buffer))
+    cancelled = threading.Event()
+
+    def put(item) -> bool:
+        while not cancelled.is_set():
+            try:
+                items.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_Failure(e))
+            return
+        put(_DONE)
+
+    producer = threading.Thread(target=produce, name='prefetch', daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        # Consumer stopped early (or finished): let the producer exit
+        cancelled.set()
@@ -6,27 +6,14 @@ Reads approved papers and adds them to the collection
 
 import argparse
 import json
-import os
 import re
 import subprocess
-import yaml
 from datetime import datetime
 from typing import Dict, List, Optional
 
-
-def load_papers_yaml(filepath: str = "data/papers/papers.yaml") -> dict:
-    """Load the papers.yaml file"""
-    if not os.path.exists(filepath):
-        return {"papers": [], "categories": [], "metadata": {}}
-
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f) or {"papers": [], "categories": [], "metadata": {}}
-
-
-def save_papers_yaml(data: dict, filepath: str = "data/papers/papers.yaml"):
-    """Save the papers.yaml file"""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        yaml.dump(data, f, allow_unicode=True, sort_keys=False, default_flow_style=False)
+from paper_store import PaperStore
+from pipeline_io import AUDIO_PATH, FILTERED_PATH, SUMMARIES_PATH, find_stage_file, read_records
+from seen_set import mark_seen
 
 
 def get_issue_content(issue_number: int) -> str:
@@ -45,20 +32,11 @@ def get_issue_content(issue_number: int) -> str:
 
 
 def load_pending_papers() -> List[dict]:
-    """Load papers from pending directory"""
-    pending_files = [
-        "data/papers/pending/with_audio.json",
-        "data/papers/pending/with_summaries.json",
-        "data/papers/pending/filtered.json"
-    ]
-
-    for filepath in pending_files:
-        if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get("papers", [])
-
-    return []
+    """Load papers from the most processed pending stage file"""
+    filepath = find_stage_file(AUDIO_PATH, SUMMARIES_PATH, FILTERED_PATH)
+    if filepath is None:
+        return []
+    return list(read_records(filepath))
 
 
 def parse_arxiv_id_from_issue(issue_body: str) -> List[str]:
@@ -166,21 +144,19 @@ def process_approved_papers(issue_number: int):
     """Main processing function"""
     print(f"📋 Processing issue #{issue_number}...")
 
-    # Load existing papers database
-    papers_data = load_papers_yaml()
-    existing_papers = papers_data.get("papers", [])
-    existing_categories = papers_data.get("categories", [])
+    # Open existing papers database
+    store = PaperStore("data/papers/papers.yaml")
+    existing_categories = store.get_categories()
 
     # Get existing arXiv IDs to avoid duplicates
-    existing_arxiv_ids = {
-        p.get("arxiv_id") for p in existing_papers if p.get("arxiv_id")
-    }
+    existing_arxiv_ids = store.arxiv_ids()
 
     # Get issue content
     issue_body = get_issue_content(issue_number)
     arxiv_ids = parse_arxiv_id_from_issue(issue_body)
 
     print(f"Found {len(arxiv_ids)} papers in issue")
+    mark_seen([{"arxiv_id": a} for a in arxiv_ids], "reviewed", "approved")
 
     # Load pending papers with full data
     pending_papers = load_pending_papers()
@@ -203,26 +179,35 @@ def process_approved_papers(issue_number: int):
         # Convert to YAML format
         yaml_paper = convert_to_yaml_paper(paper_data, existing_categories)
 
-        # Add to papers list
-        existing_papers.append(yaml_paper)
+        # Add to papers database
+        store.add_paper(yaml_paper)
+        existing_arxiv_ids.add(arxiv_id)
         added_count += 1
         print(f"✅ Added: {yaml_paper['title']}")
 
     if added_count > 0:
         # Update metadata
-        if "metadata" not in papers_data:
-            papers_data["metadata"] = {}
+        store.update_metadata(
+            last_updated=datetime.now().strftime("%Y-%m-%d"),
+            total_papers=store.count_papers()
+        )
 
-        papers_data["metadata"]["last_updated"] = datetime.now().strftime("%Y-%m-%d")
-        papers_data["metadata"]["total_papers"] = len(existing_papers)
-        papers_data["papers"] = existing_papers
-
-        # Save updated database
-        save_papers_yaml(papers_data)
+        # Regenerate papers.yaml for Hugo
+        store.export_yaml()
         print(f"\n✅ Successfully added {added_count} paper(s) to the collection")
     else:
         print("\nℹ️  No new papers to add")
 
+    store.close()
+
+
+def record_rejected_papers(issue_number: int):
+    """Record the papers of a rejected review issue in the seen-set"""
+    print(f"📋 Recording rejected papers from issue #{issue_number}...")
+    arxiv_ids = parse_arxiv_id_from_issue(get_issue_content(issue_number))
+    print(f"Found {len(arxiv_ids)} papers in issue")
+    mark_seen([{"arxiv_id": a} for a in arxiv_ids], "reviewed", "rejected")
+
 
 def main():
     parser = argparse.ArgumentParser(description="Process approved papers from GitHub issue")
@@ -232,11 +217,19 @@ def main():
         required=True,
         help="GitHub issue number to process"
     )
+    parser.add_argument(
+        "--reject",
+        action="store_true",
+        help="Only record the issue's papers as rejected in the seen-set"
+    )
 
     args = parser.parse_args()
 
     try:
-        process_approved_papers(args.issue_number)
+        if args.reject:
+            record_rejected_papers(args.issue_number)
+        else:
+            process_approved_papers(args.issue_number)
     except Exception as e:
         print(f"❌ Error: {e}")
         raise
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+LLM relevance judgments for the last stage of the filter cascade.
+
+RelevanceJudge asks the first available summary provider (see
+MultiAPIGenerator in generate_summaries_multi.py: Gemini, Zhipu, Groq,
+DeepSeek, Kimi, OpenAI, Claude) to rate how relevant a paper is to the
+research interests, as an integer from 0 to 10. SmartFilter.run_cascade()
+only calls it for the few papers whose selection the rating can still
+change.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from generate_summaries_multi import MultiAPIGenerator
+
+
+RELEVANCE_PROMPT = """You are screening new arXiv papers for a researcher interested in: {interests}.
+
+Title: {title}
+Abstract: {abstract}
+
+How relevant is this paper to these interests? Answer with a single integer from 0 (unrelated) to 10 (core topic)."""
+
+_RATING = re.compile(r'\d+(?:\.\d+)?')
+
+
+class RelevanceJudge:
+    """Rate papers 0-10 for relevance with an LLM"""
+
+    def __init__(self, interests: List[str], api_provider: str = "auto"):
+        """
+        Initialize judge
+
+        Args:
+            interests: Research interests named in the prompt
+            api_provider: Provider for MultiAPIGenerator ("auto" = first with an API key)
+        """
+        self.interests = interests
+        self.generator = MultiAPIGenerator(api_provider)
+
+    @property
+    def available(self) -> bool:
+        """Whether a provider was initialized (otherwise every judgment is None)"""
+        return self.generator.api_provider is not None
+
+    def judge(self, paper: Dict) -> Optional[float]:
+        """
+        Rate one paper
+
+        Args:
+            paper: Paper with title and abstract
+
+        Returns:
+            Relevance from 0 to 10, or None if the call failed or the reply had no rating
+        """
+        prompt = RELEVANCE_PROMPT.format(interests=", ".join(self.interests),
+                                         title=paper.get("title", ""),
+                                         abstract=(paper.get("abstract") or "")[:2000])
+        reply = self.generator.complete(prompt, max_tokens=10)
+        match = _RATING.search(reply or "")
+        if not match:
+            return None
+        return min(max(float(match.group()), 0.0), 10.0)
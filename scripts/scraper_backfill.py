@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Resumable, date-partitioned arXiv backfill.
+
+Seeding a collection with years of history as one --days query means a
+multi-hour paged query that loses everything but the pages already fetched
+when it fails. BackfillJob instead splits the range into daily or weekly
+partitions and fetches them in parallel through one rate limiter shared by
+all workers. Every finished partition is checkpointed to its own file:
+
+    data/papers/pending/backfill/
+        job.json                   range, partitioning and query settings
+        2024-01-01_2024-01-07.json papers of one finished partition
+        ...
+
+Re-running the same job (or the same job with a later --to) skips the
+partitions that already have a checkpoint, so after a crash it resumes
+where it stopped. Partitions that
+fail are not checkpointed and are retried on the next run.
+
+A query returns at most partition_max papers, newest first. When a weekly
+partition reaches that cap it is fetched again one day at a time; a day
+that still reaches it fails (raise --partition-max) rather than being
+checkpointed without its oldest papers. Once every
+partition is done the checkpoints are merged (deduplicated by arXiv ID,
+newest first) into the candidates file, minus the papers already in the
+seen-set (checkpoints keep everything that was fetched).
+"""
+
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterator, List, Tuple
+
+from atomic_io import atomic_write
+from http_transport import ARXIV_REQUEST_INTERVAL, RateLimiter
+
+
+DEFAULT_BACKFILL_DIR = "data/papers/pending/backfill"
+PARTITION_SIZES = {"day": 1, "week": 7}
+DEFAULT_PARTITION_MAX = 2000  # papers per partition (arXiv pages past ~10k are unreliable)
+JOB_VERSION = 1
+
+
+def partition_range(start: date, end: date, partition: str = "week") -> List[Tuple[date, date]]:
+    """
+    Split an inclusive date range into consecutive partitions.
+
+    Args:
+        start: First day
+        end: Last day
+        partition: "day" or "week"
+
+    Returns:
+        (first day, last day) of each partition, oldest first
+    """
+    size = PARTITION_SIZES[partition]
+    partitions = []
+    current = start
+    while current <= end:
+        last = min(current + timedelta(days=size - 1), end)
+        partitions.append((current, last))
+        current = last + timedelta(days=1)
+    return partitions
+
+
+class BackfillJob:
+    """Date-partitioned backfill with one checkpoint file per finished partition."""
+
+    def __init__(self, scraper, start: date, end: date, partition: str = "week",
+                 directory: str = DEFAULT_BACKFILL_DIR,
+                 partition_max: int = DEFAULT_PARTITION_MAX):
+        """
+        Args:
+            scraper: ArxivScraper (provides categories, query building and clients)
+            start: First submission day to fetch
+            end: Last submission day to fetch
+            partition: "day" or "week"
+            directory: Checkpoint directory
+            partition_max: Maximum papers fetched per partition
+        """
+        if end < start:
+            raise ValueError(f"Backfill range ends before it starts: {start} > {end}")
+        self.scraper = scraper
+        self.start = start
+        self.end = end
+        self.partition = partition
+        self.directory = directory
+        self.partition_max = partition_max
+        self.partitions = partition_range(start, end, partition)
+
+    @property
+    def job_path(self) -> str:
+        return os.path.join(self.directory, "job.json")
+
+    def _job_spec(self) -> Dict:
+        return {
+            "version": JOB_VERSION,
+            "from": self.start.isoformat(),
+            "to": self.end.isoformat(),
+            "partition": self.partition,
+            "categories": list(self.scraper.categories),
+            "query_mode": self.scraper.query_mode,
+            "keywords": list(self.scraper.keywords),
+        }
+
+    def checkpoint_path(self, first: date, last: date) -> str:
+        return os.path.join(self.directory, f"{first.isoformat()}_{last.isoformat()}.json")
+
+    def prepare(self):
+        """
+        Create the checkpoint directory, or check that it belongs to this job.
+
+        Raises:
+            ValueError: If the directory holds checkpoints of a different job
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        spec = self._job_spec()
+        if os.path.exists(self.job_path):
+            with open(self.job_path, "r", encoding="utf-8") as f:
+                existing = json.load(f)
+            # Moving --to keeps the partition boundaries, so checkpoints stay valid
+            if {k: v for k, v in existing.items() if k != "to"} != \
+                    {k: v for k, v in spec.items() if k != "to"}:
+                raise ValueError(
+                    f"{self.directory} holds checkpoints of a different backfill "
+                    f"(from {existing.get('from')}, {existing.get('partition')} partitions); "
+                    f"use another --backfill-dir or remove it")
+            if existing == spec:
+                return
+        atomic_write(self.job_path, json.dumps(spec, indent=2, ensure_ascii=False) + "\n")
+
+    def pending_partitions(self) -> List[Tuple[date, date]]:
+        """Partitions without a checkpoint yet."""
+        return [p for p in self.partitions if not os.path.exists(self.checkpoint_path(*p))]
+
+    def _fetch_days(self, first: date, last: date, limiter: RateLimiter) -> List[Dict]:
+        """
+        Fetch a date range completely, splitting it into days if a query is capped.
+
+        Raises:
+            ValueError: If a single day has more than partition_max papers
+        """
+        start = datetime.combine(first, time.min, tzinfo=timezone.utc)
+        end = datetime.combine(last, time.min, tzinfo=timezone.utc)
+        capped: Dict[str, datetime] = {}
+        papers = self.scraper.fetch_range(start, end, limiter, self.partition_max, capped)
+        if not capped:
+            return papers
+        if first == last:
+            raise ValueError(f"{first} has more than {self.partition_max} papers for one query; "
+                             f"re-run with a larger --partition-max")
+
+        papers = []
+        for day, _ in partition_range(first, last, "day"):
+            papers.extend(self._fetch_days(day, day, limiter))
+        return papers
+
+    def _fetch_partition(self, first: date, last: date, limiter: RateLimiter) -> int:
+        """Fetch one partition and checkpoint it (runs in a worker thread)."""
+        papers = self._fetch_days(first, last, limiter)
+
+        data = {
+            "from": first.isoformat(),
+            "to": last.isoformat(),
+            "fetched_at": datetime.now().isoformat(),
+            "total_papers": len(papers),
+            "papers": papers,
+        }
+        atomic_write(self.checkpoint_path(first, last),
+                     json.dumps(data, indent=2, ensure_ascii=False))
+        return len(papers)
+
+    def run(self, workers: int = 4) -> List[Tuple[date, date]]:
+        """
+        Fetch every partition that has no checkpoint yet.
+
+        Args:
+            workers: Partitions fetched concurrently (requests still share
+                one rate limiter)
+
+        Returns:
+            Partitions that failed (retried by the next run)
+        """
+        self.prepare()
+        pending = self.pending_partitions()
+        done = len(self.partitions) - len(pending)
+        print(f"🗓️  Backfill {self.start} to {self.end}: {len(self.partitions)} {self.partition} "
+              f"partitions, {done} already checkpointed, {len(pending)} to fetch")
+
+        limiter = RateLimiter(ARXIV_REQUEST_INTERVAL)
+        failed = []
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {
+                pool.submit(self._fetch_partition, first, last, limiter): (first, last)
+                for first, last in pending
+            }
+            for future in as_completed(futures):
+                first, last = futures[future]
+                try:
+                    count = future.result()
+                except Exception as e:
+                    failed.append((first, last))
+                    print(f"   ❌ {first} to {last}: {e}")
+                    continue
+                done += 1
+                print(f"   ✅ {first} to {last}: {count} papers ({done}/{len(self.partitions)})")
+
+        return sorted(failed)
+
+    def merged_papers(self) -> Iterator[Dict]:
+        """
+        Papers of all checkpointed partitions, deduplicated, newest first.
+
+        Partitions cover disjoint date ranges, so only one partition is held
+        in memory at a time (plus the IDs already yielded).
+        """
+        yielded = set()
+        for first, last in reversed(self.partitions):
+            path = self.checkpoint_path(first, last)
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                papers = json.load(f).get("papers") or []
+            for paper in sorted(papers, key=lambda p: p.get("published", ""), reverse=True):
+                if paper["arxiv_id"] not in yielded:
+                    yielded.add(paper["arxiv_id"])
+                    yield paper
+
+
+def parse_day(value: str) -> date:
+    """argparse type for YYYY-MM-DD dates."""
+    return date.fromisoformat(value)
+
+
+def run_backfill(scraper, start: date, end: date, partition: str,
+                 directory: str, workers: int, partition_max: int,
+                 output_file: str, seen=None) -> int:
+    """
+    Run (or resume) a backfill and write the merged candidates.
+
+    Args:
+        seen: SeenSet whose papers are left out of the candidates (None = keep all)
+
+    Returns:
+        Exit code: 0 when every partition is checkpointed, 1 otherwise
+    """
+    try:
+        job = BackfillJob(scraper, start, end, partition, directory, partition_max)
+        failed = job.run(workers)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if failed:
+        print(f"⚠️  {len(failed)} partition(s) failed; re-run the same command to resume")
+        return 1
+
+    count = scraper.save_candidates(scraper.drop_seen(job.merged_papers(), seen), output_file)
+    print(f"🎉 Backfill complete: {count} papers from {len(job.partitions)} partitions")
+    return 0
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Per-category high-water mark for incremental arXiv scraping.
+
+The daily scraper used to query a fixed window (--days 7), so every run
+refetched (and every downstream stage reprocessed) days of papers it had
+already seen. ScraperCursor remembers, for each arXiv category, the latest
+submission time and arXiv ID seen, so the next run only asks for papers
+submitted since then.
+
+arXiv sometimes indexes papers late (their submittedDate lies before papers
+we already fetched), so queries start `overlap` before the cursor. The IDs
+seen inside that overlap window are kept as well, so re-fetched papers are
+dropped and only the late arrivals come through.
+
+File layout (data/papers/pending/scraper_cursor.json):
+
+    {"version": 1,
+     "categories": {"cs.CV": {"submitted": "2025-11-16T17:59:01+00:00",
+                              "arxiv_id": "2511.10518v1",
+                              "seen": {"2511.10518v1": "2025-11-16T17:59:01+00:00"}}}}
+"""
+
+import os
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from atomic_io import atomic_write
+
+
+DEFAULT_CURSOR_PATH = "data/papers/pending/scraper_cursor.json"
+DEFAULT_OVERLAP_HOURS = 24
+CURSOR_VERSION = 1
+
+
+def _parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class ScraperCursor:
+    """Latest submission seen per arXiv category, persisted as JSON."""
+
+    def __init__(self, path: str = DEFAULT_CURSOR_PATH,
+                 overlap_hours: float = DEFAULT_OVERLAP_HOURS):
+        """
+        Load the cursor file (missing file = no cursor yet).
+
+        Args:
+            path: Cursor JSON file
+            overlap_hours: How far before the cursor to start queries
+        """
+        self.path = path
+        self.overlap = timedelta(hours=overlap_hours)
+        self.categories: Dict[str, Dict] = {}
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CURSOR_VERSION:
+                self.categories = data.get('categories') or {}
+
+    def query_start(self, category: str) -> Optional[datetime]:
+        """First submission time to query for a category (None = no cursor)."""
+        entry = self.categories.get(category)
+        if not entry or not entry.get('submitted'):
+            return None
+        return _parse_time(entry['submitted']) - self.overlap
+
+    def is_seen(self, category: str, arxiv_id: str) -> bool:
+        """Whether a paper was already returned by an earlier run for this category."""
+        entry = self.categories.get(category) or {}
+        return arxiv_id in (entry.get('seen') or {})
+
+    def advance(self, category: str, arxiv_id: str, submitted: datetime):
+        """
+        Record a fetched paper, moving the cursor forward if it is newer.
+
+        Args:
+            category: arXiv category the paper was fetched for
+            arxiv_id: arXiv ID (with version)
+            submitted: Submission time (timezone-aware)
+        """
+        entry = self.categories.setdefault(category, {'submitted': None, 'arxiv_id': None, 'seen': {}})
+        entry.setdefault('seen', {})[arxiv_id] = submitted.isoformat()
+
+        current = entry.get('submitted')
+        if current is None or (submitted, arxiv_id) > (_parse_time(current), entry.get('arxiv_id') or ''):
+            entry['submitted'] = submitted.isoformat()
+            entry['arxiv_id'] = arxiv_id
+
+    def reset(self, category: str):
+        """Forget the cursor of a category (next run uses the --days window)."""
+        self.categories.pop(category, None)
+
+    def save(self):
+        """Write the cursor, keeping only seen IDs inside the overlap window."""
+        for entry in self.categories.values():
+            if not entry.get('submitted'):
+                continue
+            horizon = _parse_time(entry['submitted']) - self.overlap
+            entry['seen'] = {
+                arxiv_id: submitted
+                for arxiv_id, submitted in sorted((entry.get('seen') or {}).items())
+                if _parse_time(submitted) >= horizon
+            }
+
+        data = {
+            'version': CURSOR_VERSION,
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+            'categories': dict(sorted(self.categories.items())),
+        }
+        atomic_write(self.path, json.dumps(data, indent=2, ensure_ascii=False) + '\n')
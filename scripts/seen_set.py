@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Cross-run record of the arXiv papers the pipeline has already handled.
+
+The scraper cursor only stops the scraper from refetching; with a --days
+window (or --ignore-cursor) the same paper could be filtered, summarized,
+voiced and proposed again in several consecutive daily issues. SeenSet
+remembers, per version-less arXiv ID, the furthest stage a paper reached
+and the decision taken there, and the scraper drops every seen paper
+before smart_filter.py runs.
+
+Stages, in pipeline order:
+
+    filtered    scored by smart_filter.py (decision: selected / dropped)
+    summarized  AI summaries generated
+    voiced      audio generated
+    proposed    listed in a review issue
+    reviewed    review issue labelled (decision: approved / rejected)
+
+data/papers/pending/seen.jsonl is append-only, one record per line, the
+last record of an ID wins:
+
+    {"id": "2511.10518", "stage": "proposed", "decision": "selected", "date": "2025-11-17"}
+
+Loading builds the exact ID -> record map plus a Bloom filter over the IDs;
+membership tests check the Bloom filter first, so the common case (a new
+paper) is answered without touching the map. The file is compacted to one
+line per ID once it holds mostly superseded records.
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from atomic_io import atomic_open, file_lock
+
+
+DEFAULT_SEEN_PATH = "data/papers/pending/seen.jsonl"
+
+STAGES = ('filtered', 'summarized', 'voiced', 'proposed', 'reviewed')
+
+BLOOM_ERROR_RATE = 0.001
+BLOOM_MIN_CAPACITY = 1024
+
+# Compact once the file holds this many lines per distinct ID
+COMPACT_RATIO = 2
+
+_VERSION_SUFFIX = re.compile(r'v\d+$')
+
+
+def base_arxiv_id(arxiv_id: str) -> str:
+    """arXiv ID without its version suffix ("2511.10518v2" -> "2511.10518")."""
+    return _VERSION_SUFFIX.sub('', arxiv_id.strip())
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)."""
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE):
+        """
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: False positive rate at capacity
+        """
+        self.capacity = max(1, capacity)
+        self.size = max(8, int(math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / self.capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(item))
+
+
+class SeenSet:
+    """Persistent set of handled arXiv IDs with their last stage and decision."""
+
+    def __init__(self, path: str = DEFAULT_SEEN_PATH):
+        """
+        Load the seen-set (missing file = nothing seen yet).
+
+        Args:
+            path: JSONL file with one record per line
+        """
+        self.path = path
+        self.records: Dict[str, Dict] = {}
+        self._lines = 0
+        self._load()
+
+    def _load(self):
+        self.records = {}
+        self._lines = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write from a crash - only the last line can be affected
+                        break
+                    self._lines += 1
+                    self._merge(record)
+        self._rebuild_bloom()
+
+    def _rebuild_bloom(self):
+        self._bloom = BloomFilter(max(BLOOM_MIN_CAPACITY, 2 * len(self.records)))
+        for arxiv_id in self.records:
+            self._bloom.add(arxiv_id)
+
+    def _merge(self, record: Dict) -> Dict:
+        """Fold a record into the map; a stage never moves backwards."""
+        current = self.records.get(record['id'])
+        if current is not None and STAGES.index(record['stage']) < STAGES.index(current['stage']):
+            record = dict(current, decision=record.get('decision') or current.get('decision'),
+                          date=record.get('date', current.get('date')))
+        elif current is not None and not record.get('decision'):
+            record = dict(record, decision=current.get('decision'))
+        self.records[record['id']] = record
+        return record
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, arxiv_id: str) -> bool:
+        key = base_arxiv_id(arxiv_id)
+        return key in self._bloom and key in self.records
+
+    def get(self, arxiv_id: str) -> Optional[Dict]:
+        """Record of a paper (stage, decision, date), or None if unseen."""
+        return self.records.get(base_arxiv_id(arxiv_id)) if arxiv_id in self else None
+
+    def mark(self, arxiv_ids: Iterable[str], stage: str, decision: Optional[str] = None) -> int:
+        """
+        Record that papers reached a stage.
+
+        Args:
+            arxiv_ids: arXiv IDs (with or without version)
+            stage: One of STAGES
+            decision: Outcome at that stage (kept from earlier records if None)
+
+        Returns:
+            Number of records written
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown seen-set stage: {stage}")
+        date = datetime.now().strftime('%Y-%m-%d')
+        records = []
+        for arxiv_id in dict.fromkeys(base_arxiv_id(a) for a in arxiv_ids if a):
+            record = {'id': arxiv_id, 'stage': stage}
+            if decision:
+                record['decision'] = decision
+            record['date'] = date
+            records.append(record)
+        if not records:
+            return 0
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with file_lock(self.path):
+            # Another stage may have appended since we loaded
+            self._load()
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._lines += len(records)
+            for record in records:
+                self._merge(record)
+            if len(self.records) > self._bloom.capacity:
+                self._rebuild_bloom()
+            else:
+                for record in records:
+                    self._bloom.add(record['id'])
+            if self._lines >= COMPACT_RATIO * len(self.records) + BLOOM_MIN_CAPACITY:
+                self.compact()
+        return len(records)
+
+    def compact(self):
+        """Rewrite the file with one (merged) record per ID."""
+        with file_lock(self.path):
+            with atomic_open(self.path) as f:
+                for record in sorted(self.records.values(), key=lambda r: r['id']):
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._lines = len(self.records)
+
+    def stage_counts(self) -> Dict[str, int]:
+        """Number of papers whose furthest stage is each of STAGES."""
+        counts = dict.fromkeys(STAGES, 0)
+        for record in self.records.values():
+            counts[record['stage']] += 1
+        return counts
+
+
+def mark_seen(papers: Iterable[Dict], stage: str, decision: Optional[str] = None,
+              path: str = DEFAULT_SEEN_PATH) -> int:
+    """
+    Record pipeline papers in the seen-set (convenience for the stage scripts).
+
+    Args:
+        papers: Paper dictionaries with 'arxiv_id'
+        stage: One of STAGES
+        decision: Outcome at that stage
+        path: Seen-set file
+
+    Returns:
+        Number of records written
+    """
+    written = SeenSet(path).mark((p.get('arxiv_id') for p in papers), stage, decision)
+    if written:
+        print(f"👁️  Marked {written} paper(s) as {stage} in {path}")
+    return written
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Embedding-based research-interest matching for the daily filter.
+
+Keyword hits are a coarse relevance signal: a paper that says "heart" once
+scores like a core paper, while a relevant paper using other words scores
+low. SemanticScorer embeds candidates with the same model as the Q&A vector
+database (all-MiniLM-L6-v2) and compares them by cosine similarity with a
+research-interest profile: the mean embedding of the collection's starred
+papers (counted twice) and the papers approved in review issues.
+
+    candidates -> SemanticScorer.annotate() -> smart_filter.py
+                  adds "semantic_similarity": 0.4817
+
+smart_filter.py uses the similarity for its field match score when a
+candidate has it. Embeddings are cached on disk by content hash
+(.cache/embeddings.db, not committed), so the profile papers and any
+re-scored candidate are embedded only once.
+
+The cost is in the cache misses, tens of milliseconds per paper on one CPU
+core. Texts are cut to the 128 tokens all-MiniLM-L6-v2 was trained on (256
+costs twice as much), and the profile uses at most PROFILE_MAX_PAPERS
+papers, so a cold cache never embeds a large collection in full.
+
+Requires sentence-transformers (and NumPy); without them the filter keeps
+its keyword score.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+
+from paper_store import PaperStore
+from seen_set import DEFAULT_SEEN_PATH, SeenSet, base_arxiv_id
+
+HAS_SENTENCE_TRANSFORMERS = False
+SentenceTransformer = None
+np = None
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    HAS_SENTENCE_TRANSFORMERS = True
+except ImportError:
+    # Semantic scoring is optional
+    pass
+
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"  # same model as setup_vectordb.py
+DEFAULT_CACHE_PATH = ".cache/embeddings.db"
+EMBED_BATCH_SIZE = 32  # faster than larger batches on CPU (less padding per batch)
+EMBED_MAX_TOKENS = 128  # training length of all-MiniLM-L6-v2
+STARRED_WEIGHT = 2.0
+PROFILE_MAX_PAPERS = 200  # bounds the one-off cold-start cost of the profile
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    vector BLOB NOT NULL
+);
+"""
+
+
+def paper_text(paper: Dict) -> str:
+    """Text embedded for a paper (same layout as the vector database's abstract chunk)."""
+    abstract = paper.get("abstract") or paper.get("ai_summary") or ""
+    return f"Title: {paper.get('title', '')}\n\nAbstract: {abstract}"
+
+
+class EmbeddingCache:
+    """Persistent content-hash -> embedding map in a small SQLite file."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, model_name: str = EMBEDDING_MODEL,
+                 max_tokens: int = EMBED_MAX_TOKENS):
+        """
+        Args:
+            path: SQLite file
+            model_name: Embedding model (part of every key, so models never mix)
+            max_tokens: Truncation length (also part of every key)
+        """
+        self.model_name = model_name
+        self.max_tokens = max_tokens
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(CACHE_SCHEMA)
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}@{self.max_tokens}\n{text}".encode('utf-8')).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, "np.ndarray"]:
+        """Cached embeddings of the given keys (missing keys are left out)."""
+        found = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk)
+            for key, vector in rows:
+                found[key] = np.frombuffer(vector, dtype=np.float32)
+        return found
+
+    def put_many(self, items: Dict[str, "np.ndarray"]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+            [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()])
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class SemanticScorer:
+    """Cosine similarity of papers to the collection's research-interest profile."""
+
+    def __init__(self, papers_yaml_path: str = "data/papers/papers.yaml",
+                 seen_path: str = DEFAULT_SEEN_PATH, cache_path: str = DEFAULT_CACHE_PATH,
+                 model_name: str = EMBEDDING_MODEL, batch_size: int = EMBED_BATCH_SIZE,
+                 max_tokens: int = EMBED_MAX_TOKENS):
+        """
+        Load the model and build the profile.
+
+        Args:
+            papers_yaml_path: Collection whose starred and approved papers form the profile
+            seen_path: Seen-set with the review decisions
+            cache_path: Embedding cache file
+            model_name: sentence-transformers model
+            batch_size: Papers embedded per model call
+            max_tokens: Texts are truncated to this many tokens
+
+        Raises:
+            ImportError: If sentence-transformers or NumPy is not installed
+            ValueError: If the collection has no papers to build a profile from
+        """
+        if not HAS_SENTENCE_TRANSFORMERS:
+            raise ImportError("Semantic scoring needs: pip install sentence-transformers")
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+        self.cache_path = cache_path
+        self.cache = EmbeddingCache(cache_path, model_name, max_tokens)
+        self.embedded = 0  # papers that missed the cache
+        self.embed_seconds = 0.0  # model time spent on them
+        self._model = None
+        self.profile = self.build_profile(papers_yaml_path, seen_path)
+
+    @property
+    def model(self):
+        # Loaded on the first cache miss only
+        if self._model is None:
+            print(f"Loading embedding model ({self.model_name})...")
+            self._model = SentenceTransformer(self.model_name)
+            self._model.max_seq_length = self.max_tokens
+        return self._model
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        """
+        Unit-length embeddings of texts, from the cache where possible.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Array of shape (len(texts), dimensions)
+        """
+        keys = [self.cache.key(text) for text in texts]
+        found = self.cache.get_many(list(dict.fromkeys(keys)))
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            started = time.time()
+            vectors = self.model.encode(list(missing.values()), batch_size=self.batch_size,
+                                        normalize_embeddings=True, show_progress_bar=False)
+            new = dict(zip(missing, np.asarray(vectors, dtype=np.float32)))
+            self.cache.put_many(new)
+            found.update(new)
+            self.embedded += len(new)
+            self.embed_seconds += time.time() - started
+        return np.vstack([found[key] for key in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
+
+    def build_profile(self, papers_yaml_path: str, seen_path: str = DEFAULT_SEEN_PATH) -> "np.ndarray":
+        """
+        Research-interest profile: weighted mean embedding of starred and approved papers.
+
+        Falls back to the whole collection when nothing is starred or approved
+        yet. At most PROFILE_MAX_PAPERS papers are used, starred first, then
+        the most recently added, so a cold cache never embeds a large
+        collection in full.
+        """
+        store = PaperStore(papers_yaml_path)
+        try:
+            papers = [p for p in store.iter_papers() if p.get("title")]
+        finally:
+            store.close()
+        seen = SeenSet(seen_path)
+
+        def approved(paper: Dict) -> bool:
+            record = seen.get(base_arxiv_id(paper["arxiv_id"])) if paper.get("arxiv_id") else None
+            return bool(record) and record.get("decision") == "approved"
+
+        chosen = [p for p in papers if p.get("starred") or approved(p)] or papers
+        if not chosen:
+            raise ValueError(f"No papers in {papers_yaml_path} to build a research profile from")
+        if len(chosen) > PROFILE_MAX_PAPERS:
+            chosen = sorted(chosen, key=lambda p: (bool(p.get("starred")), str(p.get("date_added") or "")),
+                            reverse=True)[:PROFILE_MAX_PAPERS]
+
+        weights = np.array([STARRED_WEIGHT if p.get("starred") else 1.0 for p in chosen],
+                           dtype=np.float32)
+        profile = weights @ self.embed([paper_text(p) for p in chosen])
+        print(f"🧭 Research profile from {len(chosen)} papers "
+              f"({sum(1 for p in chosen if p.get('starred'))} starred)")
+        return profile / (np.linalg.norm(profile) or 1.0)
+
+    def similarities(self, papers: List[Dict]) -> "np.ndarray":
+        """Cosine similarity of each paper to the profile."""
+        if not papers:
+            return np.zeros(0, dtype=np.float32)
+        return self.embed([paper_text(p) for p in papers]) @ self.profile
+
+    def annotate(self, papers: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Add "semantic_similarity" to streamed papers, embedding one batch at a time.
+
+        Args:
+            papers: Candidate papers
+
+        Yields:
+            The same papers, in order
+        """
+        papers = iter(papers)
+        while True:
+            batch = list(islice(papers, self.batch_size))
+            if not batch:
+                return
+            for paper, similarity in zip(batch, self.similarities(batch).tolist()):
+                paper["semantic_similarity"] = round(similarity, 4)
+            yield from batch
+
+    def close(self):
+        self.cache.close()
@@ -8,7 +8,6 @@ papers.yaml database. It uses sentence-transformers for embedding generation.
 
 import os
 import sys
-import yaml
 import argparse
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -23,10 +22,15 @@ except ImportError as e:
     print("Please install: pip install chromadb sentence-transformers")
     sys.exit(1)
 
+from paper_store import PaperStore
+
 
 class PaperVectorDB:
     """Manage vector database for paper search and Q&A."""
 
+    # Chunks embedded and added per round trip while indexing
+    EMBED_BATCH_SIZE = 256
+
     def __init__(self, db_path: str = "data/vectordb", collection_name: str = "papers"):
         """
         Initialize the vector database.
@@ -161,73 +165,82 @@ class PaperVectorDB:
                 metadata={"description": "Research paper embeddings for Q&A"}
             )
 
-        # Load papers
-        with open(papers_yaml_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-
-        papers = data.get('papers', [])
-        if not papers:
-            print("⚠️  No papers found in database")
-            return {'total': 0, 'indexed': 0, 'chunks': 0}
-
-        print(f"\n📚 Indexing {len(papers)} papers...")
-
         stats = {
-            'total': len(papers),
+            'total': 0,
             'indexed': 0,
             'chunks': 0,
             'errors': []
         }
 
-        all_ids = []
-        all_texts = []
-        all_metadatas = []
-
-        for i, paper in enumerate(papers, 1):
-            paper_id = paper.get('id', f'paper_{i}')
-            title = paper.get('title', 'Unknown')
-
-            try:
-                # Create chunks for this paper
-                chunks = self.create_paper_chunks(paper)
+        batch_ids = []
+        batch_texts = []
+        batch_metadatas = []
+
+        print(f"\n📚 Indexing papers from {papers_yaml_path}...")
+
+        # Papers are streamed from the store (which includes journaled edits not
+        # yet exported) and embedded in fixed-size batches, so memory stays
+        # bounded regardless of collection size
+        with PaperStore(papers_yaml_path) as store:
+            for i, paper in enumerate(store.iter_papers(), 1):
+                stats['total'] = i
+                paper_id = paper.get('id', f'paper_{i}')
+                title = paper.get('title', 'Unknown')
+
+                try:
+                    # Create chunks for this paper
+                    chunks = self.create_paper_chunks(paper)
+
+                    if not chunks:
+                        print(f"  [{i}] ⚠️  No content to index: {title[:60]}")
+                        continue
+
+                    # Add chunks to batch
+                    for chunk in chunks:
+                        batch_ids.append(chunk['id'])
+                        batch_texts.append(chunk['text'])
+                        batch_metadatas.append(chunk['metadata'])
+
+                    stats['indexed'] += 1
+                    stats['chunks'] += len(chunks)
+
+                    print(f"  [{i}] ✅ {title[:60]}... ({len(chunks)} chunks)")
+
+                except Exception as e:
+                    print(f"  [{i}] ❌ Error: {title[:60]}")
+                    stats['errors'].append({
+                        'paper_id': paper_id,
+                        'title': title,
+                        'error': str(e)
+                    })
+
+                if len(batch_texts) >= self.EMBED_BATCH_SIZE:
+                    self._add_chunks(batch_ids, batch_texts, batch_metadatas)
+                    batch_ids, batch_texts, batch_metadatas = [], [], []
+
+        if stats['total'] == 0:
+            print("⚠️  No papers found in database")
+            return {'total': 0, 'indexed': 0, 'chunks': 0}
 
-                if not chunks:
-                    print(f"  [{i}/{len(papers)}] ⚠️  No content to index: {title[:60]}")
-                    continue
+        self._add_chunks(batch_ids, batch_texts, batch_metadatas)
 
-                # Add chunks to batch
-                for chunk in chunks:
-                    all_ids.append(chunk['id'])
-                    all_texts.append(chunk['text'])
-                    all_metadatas.append(chunk['metadata'])
+        return stats
 
-                stats['indexed'] += 1
-                stats['chunks'] += len(chunks)
+    def _add_chunks(self, ids: List[str], texts: List[str], metadatas: List[Dict]):
+        """Generate embeddings for a batch of chunks and add them to the collection."""
+        if not texts:
+            return
 
-                print(f"  [{i}/{len(papers)}] ✅ {title[:60]}... ({len(chunks)} chunks)")
+        print(f"\n🔄 Generating embeddings for {len(texts)} chunks...")
+        embeddings = self.embedding_model.encode(texts, show_progress_bar=True)
 
-            except Exception as e:
-                print(f"  [{i}/{len(papers)}] ❌ Error: {title[:60]}")
-                stats['errors'].append({
-                    'paper_id': paper_id,
-                    'title': title,
-                    'error': str(e)
-                })
-
-        # Generate embeddings and add to collection
-        if all_texts:
-            print(f"\n🔄 Generating embeddings for {len(all_texts)} chunks...")
-            embeddings = self.embedding_model.encode(all_texts, show_progress_bar=True)
-
-            print(f"💾 Adding to vector database...")
-            self.collection.add(
-                ids=all_ids,
-                embeddings=embeddings.tolist(),
-                documents=all_texts,
-                metadatas=all_metadatas
-            )
-
-        return stats
+        print(f"💾 Adding to vector database...")
+        self.collection.add(
+            ids=ids,
+            embeddings=embeddings.tolist(),
+            documents=texts,
+            metadatas=metadatas
+        )
 
     def search(self, query: str, n_results: int = 5) -> Dict:
         """
@@ -3,15 +3,163 @@
 Smart Paper Filter
 Multi-dimensional scoring and ranking system for papers
 Based on: field match, venue quality, citations, code availability, practicality
+
+Venue and citation scores use the Semantic Scholar data attached by
+enrich_candidates.py ("s2": venue, author h-index, early citations) when a
+candidate has it, and fall back to keyword heuristics otherwise. Likewise
+the field match score uses the candidate's similarity to the collection's
+research profile ("semantic_similarity", see semantic_scorer.py, enabled
+with --semantic) instead of keyword weights when it is present.
+
+Large candidate pools (e.g. a backfill) are ranked in batch mode when NumPy
+is installed: the keyword hits of all papers form one sparse paper x keyword
+matrix, the component scores are array operations over it, and score
+breakdowns are only built for the selected papers. Scores and order are the
+same as the per-paper loop.
+
+The command line filter streams the candidates file through rank_stream(),
+which keeps only the best top_n papers in a heap, so its memory does not
+grow with the number of candidates.
+
+With --cascade the selection runs in stages of increasing cost, each with
+its own count and time budget (see run_cascade()):
+
+    keyword     every candidate          -> best 200 by keyword score
+    embedding   similarity to profile    -> best 30
+    llm         0-10 relevance judgment  -> top_n (at most 10 calls)
+
+The embedding and LLM stages only score papers whose outcome their score
+can still change: a paper that stays in (or out) whatever it gets keeps its
+cheaper score.
 """
 
-import json
 import yaml
 import os
-from typing import List, Dict, Tuple
+import math
+import time
+import heapq
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Optional, Set, Tuple
 import re
 from collections import defaultdict
 
+from keyword_matcher import KeywordMatcher
+from pipeline_io import (CANDIDATES_PATH, CARRYOVER_PATH, ENRICHED_PATH, FILTERED_PATH, RecordWriter,
+                         current_stage_file, read_records)
+from seen_set import DEFAULT_SEEN_PATH, mark_seen
+from semantic_scorer import SemanticScorer
+from relevance_judge import RelevanceJudge
+
+# NumPy is optional: without it papers are always scored one at a time
+HAS_NUMPY = False
+np = None
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    pass
+
+# Below this many papers the per-paper loop is as fast as batch scoring
+BATCH_MIN_PAPERS = 1000
+
+# Papers scored together by rank_stream()
+STREAM_CHUNK_SIZE = BATCH_MIN_PAPERS
+
+# Cosine similarity to the research profile mapped onto the 0-10 field match
+# score (typical all-MiniLM-L6-v2 range: unrelated ~0.1, same topic ~0.6+)
+SIMILARITY_FLOOR = 0.15
+SIMILARITY_CEILING = 0.65
+
+# Stage budgets of run_cascade(): papers passed on (or LLM calls) and seconds (None = no limit)
+CASCADE_BUDGETS = {
+    "keyword": {"keep": 200, "seconds": None},
+    "embedding": {"keep": 30, "seconds": 60.0},
+    "llm": {"calls": 10, "seconds": 120.0},
+}
+
+# Share of the final score given to the LLM relevance judgment (0-10)
+LLM_WEIGHT = 0.3
+
+
+def similarity_score(similarity: float) -> float:
+    """Field match score (0-10) for a semantic similarity"""
+    fraction = (similarity - SIMILARITY_FLOOR) / (SIMILARITY_CEILING - SIMILARITY_FLOOR)
+    return min(max(fraction, 0.0), 1.0) * 10
+
+
+def _chunks(papers: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    papers = iter(papers)
+    while True:
+        chunk = list(islice(papers, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_candidates(path: str, carryover_path: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Candidates of one filter run: papers carried over from the previous run, then the input
+
+    Args:
+        path: Candidates stage file
+        carryover_path: Carry-over file written by save_carryover() (None or missing = none)
+
+    Yields:
+        Carried-over papers first, then the input's papers that were not carried over
+    """
+    carried: Set[str] = set()
+    if carryover_path and os.path.exists(carryover_path):
+        for paper in read_records(carryover_path):
+            carried.add(paper.get("arxiv_id"))
+            yield paper
+    for paper in read_records(path):
+        if not paper.get("arxiv_id") or paper["arxiv_id"] not in carried:
+            yield paper
+
+
+def save_carryover(papers: Iterable[Dict], carryover_path: str) -> int:
+    """
+    Keep candidates a time budget left unread for the next run (removes the file if there are none)
+
+    Args:
+        papers: Unread candidates (may be read from the current carry-over file)
+        carryover_path: Carry-over file
+
+    Returns:
+        Number of papers carried over
+    """
+    # Written next to the file first: papers may still be streaming from it
+    with RecordWriter(carryover_path + ".tmp") as out:
+        for paper in papers:
+            out.write(paper)
+    if out.count:
+        os.replace(out.path, carryover_path)
+    else:
+        os.remove(out.path)
+        if os.path.exists(carryover_path):
+            os.remove(carryover_path)
+    return out.count
+
+
+def _undecided(ranges: List[Tuple[float, float]], keep: int) -> List[int]:
+    """
+    Papers whose place in the best `keep` depends on scores not known yet
+
+    Args:
+        ranges: (lowest, highest) possible score per paper
+        keep: Number of papers selected
+
+    Returns:
+        Indices of the papers that are neither certainly in nor certainly out
+    """
+    undecided = []
+    for i, (low, high) in enumerate(ranges):
+        could_beat = sum(1 for j, (_, other_high) in enumerate(ranges) if j != i and other_high >= low)
+        must_beat = sum(1 for j, (other_low, _) in enumerate(ranges) if j != i and other_low > high)
+        if could_beat >= keep and must_beat < keep:
+            undecided.append(i)
+    return undecided
+
 
 class SmartFilter:
     """Intelligent paper filtering and scoring system"""
@@ -72,38 +220,81 @@ class SmartFilter:
             "dataset", "benchmark"
         ]
 
-    def calculate_field_match_score(self, paper: Dict) -> float:
+        # Terms behind the smaller bonuses
+        self.novelty_terms = ["novel", "new", "first", "state-of-the-art", "sota", "breakthrough"]
+        self.survey_terms = ["survey", "review"]
+        self.evaluation_terms = ["benchmark", "evaluation"]
+        self.code_terms = ["github", "code"]
+
+        self.matcher = self._build_matcher()
+
+    def _build_matcher(self) -> KeywordMatcher:
+        """Compile all keyword families (call again after changing the keyword lists)"""
+        self._batch_columns = None
+        return KeywordMatcher({
+            "field": self.field_keywords,
+            # Venue text was always compared upper-cased, so only all-caps names can match
+            "venue": [venue for venue in self.top_venues if venue == venue.upper()],
+            "novelty": self.novelty_terms,
+            "survey": self.survey_terms,
+            "evaluation": self.evaluation_terms,
+            "code": self.code_terms,
+            "practicality": self.practicality_keywords,
+        })
+
+    def match_keywords(self, paper: Dict) -> Dict[str, Set[str]]:
+        """Find the keywords of every family, normalizing each text field once"""
+        matcher = self.matcher
+        title = matcher.scan(paper.get("title"))
+        abstract = matcher.scan(paper.get("abstract"))
+        comment = matcher.scan(paper.get("comment"))
+        title_abstract = matcher.join(title, abstract)
+        venues = matcher.join(matcher.scan((paper.get("s2") or {}).get("venue"),
+                                           paper.get("journal_ref")), comment)
+        return {
+            "field": matcher.find("field", title_abstract),
+            "venue": matcher.find("venue", venues),
+            "novelty": matcher.find("novelty", title_abstract),
+            "survey": matcher.find("survey", title),
+            "evaluation": matcher.find("evaluation", abstract),
+            "code": matcher.find("code", comment),
+            "practicality": matcher.find("practicality", matcher.join(abstract, comment)),
+        }
+
+    def calculate_field_match_score(self, paper: Dict, hits: Optional[Dict] = None) -> float:
         """Calculate how well paper matches research fields (0-10)"""
-        title = paper.get("title", "").lower()
-        abstract = paper.get("abstract", "").lower()
-        text = title + " " + abstract
+        hits = hits or self.match_keywords(paper)
 
         score = 0.0
         matches = []
 
         for keyword, importance in self.field_keywords.items():
-            if keyword.lower() in text:
+            if keyword in hits["field"]:
                 score += importance
                 matches.append(keyword)
 
-        # Normalize to 0-10 range
-        max_possible = sum(self.field_keywords.values())
-        normalized_score = min((score / max_possible) * 10, 10)
+        similarity = paper.get("semantic_similarity")
+        if similarity is not None:
+            # Similarity to the research profile replaces the keyword weights
+            normalized_score = similarity_score(similarity)
+        else:
+            # Normalize to 0-10 range
+            max_possible = sum(self.field_keywords.values())
+            normalized_score = min((score / max_possible) * 10, 10)
 
         return normalized_score, matches
 
-    def calculate_venue_quality_score(self, paper: Dict) -> float:
+    def calculate_venue_quality_score(self, paper: Dict, hits: Optional[Dict] = None) -> float:
         """Calculate venue quality score (0-10)"""
-        # Extract venue from journal_ref or categories
-        journal_ref = paper.get("journal_ref", "").upper()
-        comment = paper.get("comment", "").upper()
+        # Venue mentions in Semantic Scholar venue, journal_ref or comment
+        hits = hits or self.match_keywords(paper)
 
         score = 0.0
         matched_venue = None
 
         # Check if any top venue is mentioned
         for venue, venue_score in self.top_venues.items():
-            if venue in journal_ref or venue in comment:
+            if venue in hits["venue"]:
                 score = venue_score
                 matched_venue = venue
                 break
@@ -114,69 +305,73 @@ class SmartFilter:
 
         return score, matched_venue
 
-    def calculate_citation_potential(self, paper: Dict) -> float:
+    def calculate_citation_potential(self, paper: Dict, hits: Optional[Dict] = None) -> float:
         """Estimate citation potential based on various factors (0-10)"""
         score = 5.0  # Start with baseline
 
-        title = paper.get("title", "").lower()
-        abstract = paper.get("abstract", "").lower()
+        hits = hits or self.match_keywords(paper)
         authors = paper.get("authors", [])
 
         # Novel terms often get cited
-        novelty_terms = ["novel", "new", "first", "state-of-the-art", "sota", "breakthrough"]
-        for term in novelty_terms:
-            if term in title or term in abstract:
-                score += 1.0
+        score += 1.0 * len(hits["novelty"])
 
         # Survey/review papers tend to get more citations
-        if "survey" in title or "review" in title:
+        if hits["survey"]:
             score += 2.0
 
-        # More authors might indicate collaboration (controversial, but sometimes true)
-        if len(authors) >= 5:
+        s2 = paper.get("s2")
+        if s2:
+            # Established authors (Semantic Scholar h-index)
+            h_index = s2.get("max_author_h_index") or 0
+            if h_index >= 40:
+                score += 2.0
+            elif h_index >= 20:
+                score += 1.0
+
+            # Early citations: 1 -> +1, 3 -> +2, 7+ -> +3
+            citations = s2.get("citation_count") or 0
+            score += min(3.0, math.log2(1 + citations))
+        elif len(authors) >= 5:
+            # More authors might indicate collaboration (controversial, but sometimes true)
             score += 1.0
 
         # Comprehensive evaluation
-        if "benchmark" in abstract or "evaluation" in abstract:
+        if hits["evaluation"]:
             score += 1.0
 
         return min(score, 10.0)
 
-    def calculate_code_availability_score(self, paper: Dict) -> float:
+    def calculate_code_availability_score(self, paper: Dict, hits: Optional[Dict] = None) -> float:
         """Score based on code availability (0-10)"""
         has_code = paper.get("has_code", False)
-        comment = paper.get("comment", "").lower()
 
         if has_code:
             return 10.0
-        elif "github" in comment or "code" in comment:
+        elif (hits or self.match_keywords(paper))["code"]:
             return 8.0
         else:
             return 3.0  # Base score for papers without code mention
 
-    def calculate_practicality_score(self, paper: Dict) -> float:
+    def calculate_practicality_score(self, paper: Dict, hits: Optional[Dict] = None) -> float:
         """Score based on practical applicability (0-10)"""
-        abstract = paper.get("abstract", "").lower()
-        comment = paper.get("comment", "").lower()
-        text = abstract + " " + comment
+        hits = hits or self.match_keywords(paper)
 
         score = 5.0  # Baseline
 
         # Count practicality indicators
-        for keyword in self.practicality_keywords:
-            if keyword in text:
-                score += 0.5
+        score += 0.5 * len(hits["practicality"])
 
         return min(score, 10.0)
 
     def calculate_total_score(self, paper: Dict) -> Tuple[float, Dict]:
         """Calculate total score for a paper"""
-        # Calculate individual scores
-        field_score, field_matches = self.calculate_field_match_score(paper)
-        venue_score, matched_venue = self.calculate_venue_quality_score(paper)
-        citation_score = self.calculate_citation_potential(paper)
-        code_score = self.calculate_code_availability_score(paper)
-        practicality_score = self.calculate_practicality_score(paper)
+        # Calculate individual scores from one keyword scan
+        hits = self.match_keywords(paper)
+        field_score, field_matches = self.calculate_field_match_score(paper, hits)
+        venue_score, matched_venue = self.calculate_venue_quality_score(paper, hits)
+        citation_score = self.calculate_citation_potential(paper, hits)
+        code_score = self.calculate_code_availability_score(paper, hits)
+        practicality_score = self.calculate_practicality_score(paper, hits)
 
         # Weighted sum
         total_score = (
@@ -193,6 +388,7 @@ class SmartFilter:
             "field_match": {
                 "score": round(field_score, 2),
                 "matches": field_matches,
+                "similarity": paper.get("semantic_similarity"),
                 "weight": self.weights["field_match"]
             },
             "venue_quality": {
@@ -202,6 +398,8 @@ class SmartFilter:
             },
             "citation_potential": {
                 "score": round(citation_score, 2),
+                "max_author_h_index": (paper.get("s2") or {}).get("max_author_h_index"),
+                "citations": (paper.get("s2") or {}).get("citation_count"),
                 "weight": self.weights["citation_potential"]
             },
             "code_availability": {
@@ -217,23 +415,163 @@ class SmartFilter:
 
         return total_score, breakdown
 
-    def filter_and_rank(self, papers: List[Dict], top_n: int = 10) -> List[Dict]:
-        """Filter and rank papers by relevance"""
+    def _batch_weights(self) -> Dict:
+        """Column layout of the batch hit matrix and per-column weights of each score"""
+        if self._batch_columns is None:
+            # One column per (family, keyword), families laid out one after another
+            columns = {}
+            offset = 0
+            for family, entries in self.matcher.families.items():
+                columns[family] = {keyword: offset + i for i, (keyword, _) in enumerate(entries)}
+                offset += len(entries)
+
+            def indicator(family: str, values=None) -> "np.ndarray":
+                weights = np.zeros(offset)
+                for keyword, column in columns[family].items():
+                    weights[column] = 1.0 if values is None else values[keyword]
+                return weights
+
+            venues = list(columns["venue"])
+            venue_rank = np.full(offset, len(venues))
+            for rank, venue in enumerate(venues):
+                venue_rank[columns["venue"][venue]] = rank
+            self._batch_columns = {
+                "columns": columns,
+                "field": indicator("field", self.field_keywords),
+                "novelty": indicator("novelty"),
+                "survey": indicator("survey"),
+                "evaluation": indicator("evaluation"),
+                "code": indicator("code"),
+                "practicality": indicator("practicality"),
+                "venue_rank": venue_rank,
+                # Score by venue rank; the extra last entry is "no top venue"
+                "venue_scores": np.array([self.top_venues[v] for v in venues] + [5.0], dtype=float),
+            }
+        return self._batch_columns
+
+    def score_batch(self, papers: List[Dict]) -> "np.ndarray":
+        """
+        Total scores of many papers, computed as NumPy array operations (requires NumPy)
+
+        Gives exactly the totals of calculate_total_score, in the same
+        floating point order, without building breakdowns.
+        """
+        layout = self._batch_weights()
+        columns = layout["columns"]
+        n = len(papers)
+
+        # Sparse paper x keyword hit matrix as (row, column) pairs
+        rows: List[int] = []
+        cols: List[int] = []
+        has_code = np.zeros(n, dtype=bool)
+        has_s2 = np.zeros(n, dtype=bool)
+        author_bonus = np.zeros(n)
+        h_index_bonus = np.zeros(n)
+        early_citations = np.zeros(n)
+        semantic_field = np.full(n, np.nan)
+        for i, paper in enumerate(papers):
+            for family, keywords in self.match_keywords(paper).items():
+                family_columns = columns[family]
+                for keyword in keywords:
+                    rows.append(i)
+                    cols.append(family_columns[keyword])
+            has_code[i] = bool(paper.get("has_code", False))
+            if paper.get("semantic_similarity") is not None:
+                semantic_field[i] = similarity_score(paper["semantic_similarity"])
+            s2 = paper.get("s2")
+            if s2:
+                has_s2[i] = True
+                h_index = s2.get("max_author_h_index") or 0
+                h_index_bonus[i] = 2.0 if h_index >= 40 else 1.0 if h_index >= 20 else 0.0
+                early_citations[i] = min(3.0, math.log2(1 + (s2.get("citation_count") or 0)))
+            elif len(paper.get("authors", [])) >= 5:
+                author_bonus[i] = 1.0
+
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+
+        def per_paper(weights: "np.ndarray") -> "np.ndarray":
+            return np.bincount(rows, weights=weights[cols], minlength=n)
+
+        field_score = np.minimum(per_paper(layout["field"]) / sum(self.field_keywords.values()) * 10, 10)
+        field_score = np.where(np.isnan(semantic_field), field_score, semantic_field)
+
+        venue_rank = np.full(n, len(layout["venue_scores"]) - 1)
+        np.minimum.at(venue_rank, rows, layout["venue_rank"][cols])
+        venue_score = layout["venue_scores"][venue_rank]
+
+        # Integer bonuses first, like the per-paper sum, so the totals are bit-identical
+        citation_score = (5.0 + per_paper(layout["novelty"])
+                          + 2.0 * (per_paper(layout["survey"]) > 0)
+                          + np.where(has_s2, h_index_bonus, author_bonus))
+        citation_score = np.minimum(citation_score + early_citations
+                                    + 1.0 * (per_paper(layout["evaluation"]) > 0), 10.0)
+
+        code_score = np.where(has_code, 10.0, np.where(per_paper(layout["code"]) > 0, 8.0, 3.0))
+        practicality_score = np.minimum(5.0 + 0.5 * per_paper(layout["practicality"]), 10.0)
+
+        return (field_score * self.weights["field_match"] +
+                venue_score * self.weights["venue_quality"] +
+                citation_score * self.weights["citation_potential"] +
+                code_score * self.weights["code_availability"] +
+                practicality_score * self.weights["practicality"])
+
+    @staticmethod
+    def top_indices(scores: "np.ndarray", top_n: int) -> "np.ndarray":
+        """Indices of the top_n scores, best first, ties in input order (like a stable sort)"""
+        candidates = np.arange(len(scores))
+        if 0 < top_n < len(scores):
+            # argpartition finds the cut-off score; keep every tie at the cut-off
+            cutoff = scores[np.argpartition(-scores, top_n - 1)[top_n - 1]]
+            candidates = np.flatnonzero(scores >= cutoff)
+        order = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return order[:max(top_n, 0)]
+
+    def filter_and_rank(self, papers: List[Dict], top_n: int = 10,
+                        batch: Optional[bool] = None) -> List[Dict]:
+        """
+        Filter and rank papers by relevance
+
+        Args:
+            papers: Candidate papers
+            top_n: Number of papers to select
+            batch: Score with NumPy array operations and only add score
+                breakdowns to the selected papers (default: when NumPy is
+                installed and there are at least BATCH_MIN_PAPERS papers)
+
+        Returns:
+            The top_n papers, best first, with relevance_score and score_breakdown
+        """
         print(f"\n🎯 Filtering and ranking {len(papers)} papers...")
 
-        scored_papers = []
+        if batch is None:
+            batch = len(papers) >= BATCH_MIN_PAPERS
+        if batch and not HAS_NUMPY:
+            print("   ⚠️  NumPy not installed, scoring papers one at a time")
+            batch = False
+
+        if batch:
+            top_papers = []
+            for i in self.top_indices(self.score_batch(papers), top_n):
+                paper = papers[i]
+                score, breakdown = self.calculate_total_score(paper)
+                paper["relevance_score"] = score
+                paper["score_breakdown"] = breakdown
+                top_papers.append(paper)
+        else:
+            scored_papers = []
 
-        for paper in papers:
-            score, breakdown = self.calculate_total_score(paper)
-            paper["relevance_score"] = score
-            paper["score_breakdown"] = breakdown
-            scored_papers.append(paper)
+            for paper in papers:
+                score, breakdown = self.calculate_total_score(paper)
+                paper["relevance_score"] = score
+                paper["score_breakdown"] = breakdown
+                scored_papers.append(paper)
 
-        # Sort by score (descending)
-        scored_papers.sort(key=lambda x: x["relevance_score"], reverse=True)
+            # Sort by score (descending)
+            scored_papers.sort(key=lambda x: x["relevance_score"], reverse=True)
 
-        # Get top N
-        top_papers = scored_papers[:top_n]
+            # Get top N
+            top_papers = scored_papers[:top_n]
 
         print(f"✅ Selected top {len(top_papers)} papers")
         if top_papers:
@@ -243,18 +581,233 @@ class SmartFilter:
 
         return top_papers
 
-    def save_filtered_papers(self, papers: List[Dict], output_file: str = "data/papers/pending/filtered.json"):
-        """Save filtered papers"""
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    def rank_stream(self, papers: Iterable[Dict], top_n: int = 10,
+                    chunk_size: int = STREAM_CHUNK_SIZE, seconds: Optional[float] = None,
+                    stats: Optional[Dict] = None) -> List[Dict]:
+        """
+        Select the top papers from a stream of candidates
+
+        Only the best top_n papers seen so far (plus one chunk being scored)
+        are held in memory; the rest are dropped as soon as they are scored.
+        The result is the same as filter_and_rank on the full list.
+
+        Args:
+            papers: Candidate papers, e.g. read_records() of a stage file
+            top_n: Number of papers to select
+            chunk_size: Papers scored together (with NumPy, as one batch)
+            seconds: Stop reading candidates after this long (None = read all)
+            stats: Optional dict that receives 'scored' and 'budget_hit'
+
+        Returns:
+            The top_n papers, best first, with relevance_score and score_breakdown
+        """
+        print(f"\n🎯 Streaming candidates through the filter (keeping the top {top_n})...")
+
+        # Min-heap of (score, -position, paper): the root is the weakest paper kept,
+        # and of two equal scores the later paper counts as weaker (stable order)
+        heap: List[Tuple[float, int, Dict]] = []
+        position = 0
+        budget_hit = False
+        start = time.monotonic()
+        for chunk in _chunks(papers, chunk_size):
+            if HAS_NUMPY:
+                scores = self.score_batch(chunk).tolist()
+            else:
+                scores = [self.calculate_total_score(paper)[0] for paper in chunk]
+            for paper, score in zip(chunk, scores):
+                entry = (score, -position, paper)
+                position += 1
+                if len(heap) < top_n:
+                    heapq.heappush(heap, entry)
+                elif top_n > 0 and entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+            if seconds is not None and time.monotonic() - start > seconds:
+                budget_hit = True
+                print(f"   ⏱️  Time budget of {seconds:g}s reached after {position} papers")
+                break
 
-        data = {
-            "filtered_at": json.dumps({"timestamp": "now"}),
-            "total_papers": len(papers),
-            "papers": papers
-        }
+        top_papers = []
+        for _, _, paper in sorted(heap, key=lambda entry: entry[:2], reverse=True):
+            score, breakdown = self.calculate_total_score(paper)
+            paper["relevance_score"] = score
+            paper["score_breakdown"] = breakdown
+            top_papers.append(paper)
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if stats is not None:
+            stats.update(scored=position, budget_hit=budget_hit)
+        print(f"✅ Selected top {len(top_papers)} of {position} papers")
+        if top_papers:
+            print(f"   Score range: {top_papers[0]['relevance_score']:.2f} - {top_papers[-1]['relevance_score']:.2f}")
+        else:
+            print(f"   ⚠️  No papers found matching the criteria")
+
+        return top_papers
+
+    def run_cascade(self, papers: Iterable[Dict], top_n: int = 10, budgets: Optional[Dict] = None,
+                    semantic: Optional[SemanticScorer] = None,
+                    judge: Optional[RelevanceJudge] = None) -> List[Dict]:
+        """
+        Select the top papers in stages of increasing cost
+
+        1. keyword: rank_stream() over all candidates keeps the best "keep"
+        2. embedding: semantic similarity replaces the keyword field match
+           score; the best "keep" go on (skipped without a SemanticScorer)
+        3. llm: up to "calls" relevance judgments, blended into the score
+           with LLM_WEIGHT; the best top_n are selected (skipped without an
+           available RelevanceJudge)
+
+        Stages 2 and 3 work through the undecided papers best first, so a
+        paper whose selection cannot change keeps its cheaper score. When a
+        stage runs out of budget, the papers it has not scored keep theirs
+        too. Per-stage counts and timings are left in self.cascade_stats.
+
+        Args:
+            papers: Candidate papers (streamed)
+            top_n: Number of papers to select
+            budgets: Per-stage overrides of CASCADE_BUDGETS
+            semantic: Scorer for the embedding stage
+            judge: Judge for the LLM stage
+
+        Returns:
+            The top_n papers, best first, with relevance_score and score_breakdown
+        """
+        budgets = {stage: {**limits, **((budgets or {}).get(stage) or {})}
+                   for stage, limits in CASCADE_BUDGETS.items()}
+        self.cascade_stats = []
+
+        # Stage 1: cheap keyword score of everything
+        start = time.monotonic()
+        stats = {}
+        survivors = self.rank_stream(papers, max(budgets["keyword"]["keep"], top_n),
+                                     seconds=budgets["keyword"]["seconds"], stats=stats)
+        self.cascade_stats.append({"stage": "keyword", "in": stats["scored"], "scored": stats["scored"],
+                                   "out": len(survivors), "seconds": time.monotonic() - start,
+                                   "budget_hit": stats["budget_hit"]})
+
+        def final_range(low: float, high: float) -> Tuple[float, float]:
+            # What the LLM stage may still do to a score
+            if judge is None or not judge.available:
+                return low, high
+            return (1 - LLM_WEIGHT) * low, (1 - LLM_WEIGHT) * high + 10 * LLM_WEIGHT
+
+        # Stage 2: embedding similarity, which can move the field match score anywhere in 0-10
+        if semantic is not None:
+            field_weight = self.weights["field_match"]
+
+            def field_range(paper: Dict) -> Tuple[float, float]:
+                field_score = self.calculate_field_match_score(paper)[0]
+                score = paper["relevance_score"]
+                return score - field_weight * field_score, score + field_weight * (10 - field_score)
+
+            def embed(batch: List[Dict]) -> List[float]:
+                for paper, similarity in zip(batch, semantic.similarities(batch).tolist()):
+                    paper["semantic_similarity"] = round(similarity, 4)
+                return [self.calculate_total_score(paper)[0] for paper in batch]
+
+            survivors = self._cascade_stage("embedding", survivors, max(budgets["embedding"]["keep"], top_n),
+                                            field_range, embed, semantic.batch_size,
+                                            budgets["embedding"]["seconds"], top_n=top_n,
+                                            final_range=final_range)
+
+        # Stage 3: LLM relevance for the papers still at the top_n boundary
+        if judge is not None and judge.available:
+            def llm_range(paper: Dict) -> Tuple[float, float]:
+                return final_range(paper["relevance_score"], paper["relevance_score"])
+
+            def ask(batch: List[Dict]) -> List[float]:
+                scores = []
+                for paper in batch:
+                    relevance = judge.judge(paper)
+                    score = paper["relevance_score"]
+                    if relevance is not None:
+                        paper["llm_relevance"] = relevance
+                        score = (1 - LLM_WEIGHT) * score + LLM_WEIGHT * relevance
+                    scores.append(score)
+                return scores
+
+            survivors = self._cascade_stage("llm", survivors, top_n, llm_range, ask, 1,
+                                            budgets["llm"]["seconds"], budgets["llm"]["calls"])
+        top_papers = survivors[:top_n]
+
+        print("\n⏱️  Cascade stages:")
+        for stage in self.cascade_stats:
+            print(f"   {stage['stage']:<10} {stage['in']:>7} -> {stage['out']:<5} "
+                  f"scored {stage['scored']:<6} {stage['seconds']:7.2f}s"
+                  f"{'  (budget reached)' if stage['budget_hit'] else ''}")
+        return top_papers
+
+    def _cascade_stage(self, name: str, papers: List[Dict], keep: int, score_range,
+                       rescore, batch_size: int, seconds: Optional[float],
+                       max_scored: Optional[int] = None, top_n: Optional[int] = None,
+                       final_range=None) -> List[Dict]:
+        """
+        Rescore the undecided papers of one cascade stage and keep the best
+
+        A paper is undecided if its score could move it across the `keep`
+        boundary, or, with final_range, across the final top_n boundary
+        once later stages have changed the scores too.
+
+        Args:
+            name: Stage name for cascade_stats
+            papers: Papers ranked by the previous stage (relevance_score set)
+            keep: Papers passed on
+            score_range: paper -> (lowest, highest) score the stage could give it
+            rescore: batch of papers -> their new scores
+            batch_size: Papers rescored together
+            seconds: Time budget (None = no limit)
+            max_scored: Papers rescored at most (None = no limit)
+            top_n: Final number of papers selected (with final_range)
+            final_range: (lowest, highest) -> the range later stages could widen it to
+
+        Returns:
+            The best `keep` papers, best first
+        """
+        start = time.monotonic()
+        scores = [paper["relevance_score"] for paper in papers]
+        ranges = [score_range(paper) for paper in papers]
+        rescored: Set[int] = set()
+        budget_hit = False
+        while True:
+            undecided = set(_undecided(ranges, keep))
+            if final_range is not None:
+                undecided.update(_undecided([final_range(*r) for r in ranges], top_n))
+            pending = sorted(i for i in undecided if i not in rescored)
+            if not pending:
+                break
+            if ((seconds is not None and time.monotonic() - start > seconds)
+                    or (max_scored is not None and len(rescored) >= max_scored)):
+                budget_hit = True
+                break
+            size = batch_size if max_scored is None else min(batch_size, max_scored - len(rescored))
+            batch = pending[:size]
+            for i, score in zip(batch, rescore([papers[i] for i in batch])):
+                scores[i] = score
+                ranges[i] = (score, score)
+                rescored.add(i)
+
+        # Stable: equal scores keep the previous stage's order
+        order = sorted(range(len(papers)), key=lambda i: -scores[i])[:keep]
+        kept = []
+        for i in order:
+            paper = papers[i]
+            if i in rescored:
+                breakdown = self.calculate_total_score(paper)[1]
+                if paper.get("llm_relevance") is not None:
+                    breakdown["llm_relevance"] = {"score": paper["llm_relevance"], "weight": LLM_WEIGHT}
+                breakdown["total_score"] = round(scores[i], 2)
+                paper["score_breakdown"] = breakdown
+            paper["relevance_score"] = scores[i]
+            kept.append(paper)
+
+        self.cascade_stats.append({"stage": name, "in": len(papers), "scored": len(rescored), "out": len(kept),
+                                   "seconds": time.monotonic() - start, "budget_hit": budget_hit})
+        return kept
+
+    def save_filtered_papers(self, papers: List[Dict], output_file: str = FILTERED_PATH):
+        """Save filtered papers as a JSONL stage file"""
+        with RecordWriter(output_file) as out:
+            for paper in papers:
+                out.write(paper)
 
         print(f"💾 Saved filtered papers to {output_file}")
 
@@ -264,11 +817,43 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="Filter and rank papers")
-    parser.add_argument("--input", default="data/papers/pending/candidates.json", help="Input JSON file")
-    parser.add_argument("--output", default="data/papers/pending/filtered.json", help="Output JSON file")
+    parser.add_argument("--input", default=None,
+                        help=f"Input JSONL file (default: {ENRICHED_PATH} if up to date, "
+                             f"else {CANDIDATES_PATH})")
+    parser.add_argument("--output", default=FILTERED_PATH, help="Output JSONL file")
     parser.add_argument("--top-n", type=int, default=10, help="Number of top papers to select")
+    parser.add_argument("--seen-file", default=DEFAULT_SEEN_PATH,
+                        help="Seen-set to record scored papers in ('' to skip, e.g. diagnostic runs)")
+    parser.add_argument("--semantic", action="store_true",
+                        help="Score field match by embedding similarity to the collection's "
+                             "starred and approved papers (needs sentence-transformers)")
+    parser.add_argument("--papers-yaml", default="data/papers/papers.yaml",
+                        help="Collection the --semantic research profile is built from")
+    parser.add_argument("--cascade", action="store_true",
+                        help="Select in stages: keyword prefilter, then embedding similarity "
+                             "(with --semantic), then LLM relevance (with --llm-judge)")
+    parser.add_argument("--keyword-keep", type=int, default=CASCADE_BUDGETS["keyword"]["keep"],
+                        help="Cascade: papers kept by the keyword stage")
+    parser.add_argument("--keyword-seconds", type=float, default=CASCADE_BUDGETS["keyword"]["seconds"],
+                        help="Cascade: time budget of the keyword stage (default: none)")
+    parser.add_argument("--embedding-keep", type=int, default=CASCADE_BUDGETS["embedding"]["keep"],
+                        help="Cascade: papers kept by the embedding stage")
+    parser.add_argument("--embedding-seconds", type=float, default=CASCADE_BUDGETS["embedding"]["seconds"],
+                        help="Cascade: time budget of the embedding stage")
+    parser.add_argument("--llm-judge", nargs="?", const="auto", default=None,
+                        choices=["auto", "gemini", "zhipu", "groq", "deepseek", "kimi", "openai", "claude"],
+                        help="Cascade: judge relevance of the boundary papers with an LLM "
+                             "(provider as in generate_summaries_multi.py, default: auto)")
+    parser.add_argument("--llm-calls", type=int, default=CASCADE_BUDGETS["llm"]["calls"],
+                        help="Cascade: maximum LLM relevance judgments")
+    parser.add_argument("--llm-seconds", type=float, default=CASCADE_BUDGETS["llm"]["seconds"],
+                        help="Cascade: time budget of the LLM stage")
+    parser.add_argument("--carryover-file", default=CARRYOVER_PATH,
+                        help="Candidates left unread by --keyword-seconds, read first by the "
+                             "next run ('' to disable)")
 
     args = parser.parse_args()
+    args.input = args.input or current_stage_file(ENRICHED_PATH, CANDIDATES_PATH) or CANDIDATES_PATH
 
     # Load candidates
     if not os.path.exists(args.input):
@@ -276,17 +861,62 @@ def main():
         print("   Run arxiv_scraper.py first")
         return
 
-    with open(args.input, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        papers = data.get("papers", [])
-
-    # Filter and rank
+    # Filter and rank, holding only the current top N in memory
+    print(f"📥 Reading candidates from {args.input}")
     filter_system = SmartFilter()
-    top_papers = filter_system.filter_and_rank(papers, args.top_n)
+    candidates = read_candidates(args.input, args.carryover_file)
+    semantic = None
+    if args.semantic:
+        try:
+            semantic = SemanticScorer(args.papers_yaml, seen_path=args.seen_file or DEFAULT_SEEN_PATH)
+            if not args.cascade:
+                candidates = semantic.annotate(candidates)
+        except (ImportError, OSError, ValueError) as e:
+            print(f"⚠️  Semantic scoring unavailable ({e}), using keyword scores")
+    stats = {}
+    if args.cascade:
+        judge = None
+        if args.llm_judge:
+            judge = RelevanceJudge(list(filter_system.field_keywords), args.llm_judge)
+            if not judge.available:
+                print("⚠️  No LLM provider available, skipping the LLM stage")
+        budgets = {
+            "keyword": {"keep": args.keyword_keep, "seconds": args.keyword_seconds},
+            "embedding": {"keep": args.embedding_keep, "seconds": args.embedding_seconds},
+            "llm": {"calls": args.llm_calls, "seconds": args.llm_seconds},
+        }
+        top_papers = filter_system.run_cascade(candidates, args.top_n, budgets, semantic, judge)
+        stats["scored"] = filter_system.cascade_stats[0]["scored"]
+    else:
+        top_papers = filter_system.rank_stream(candidates, args.top_n, stats=stats)
+    if semantic:
+        print(f"🧠 Embedded {semantic.embedded} new papers in {semantic.embed_seconds:.1f}s "
+              f"(others from {semantic.cache_path})")
+        semantic.close()
 
     # Save results
     filter_system.save_filtered_papers(top_papers, args.output)
 
+    # Every scored paper has had its chance; later runs skip it
+    if args.seen_file:
+        selected = {p.get("arxiv_id") for p in top_papers}
+        mark_seen(top_papers, "filtered", "selected", args.seen_file)
+        mark_seen((p for p in islice(read_candidates(args.input, args.carryover_file), stats["scored"])
+                   if p.get("arxiv_id") not in selected),
+                  "filtered", "dropped", args.seen_file)
+
+    # Papers a time budget left unread are not marked; the next run reads them first
+    unread = islice(read_candidates(args.input, args.carryover_file), stats["scored"], None)
+    if args.carryover_file:
+        carried = save_carryover(unread, args.carryover_file)
+        if carried:
+            print(f"⏭️  {carried} candidate(s) left unread by the time budget, "
+                  f"carried over to {args.carryover_file}")
+    else:
+        skipped = sum(1 for _ in unread)
+        if skipped:
+            print(f"⚠️  {skipped} candidate(s) left unread by the time budget (no carry-over file)")
+
     # Print summary
     print("\n📊 Top Papers:")
     for i, paper in enumerate(top_papers[:5], 1):
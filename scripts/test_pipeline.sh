@@ -8,22 +8,22 @@ echo ""
 
 # Step 1: Test arXiv fetch
 echo "🧪 Test 1: Fetch papers from arXiv"
-echo "   Running: python scripts/arxiv_scraper.py --max-results 20 --days 7"
+echo "   Running: python scripts/arxiv_scraper.py --max-results 20 --days 7 --ignore-cursor --include-seen"
 echo ""
-python scripts/arxiv_scraper.py --max-results 20 --days 7
+python scripts/arxiv_scraper.py --max-results 20 --days 7 --ignore-cursor --include-seen
 STEP1_EXIT=$?
 
 echo ""
 echo "---"
 echo ""
 
-# Check if candidates.json was created
-if [ -f "data/papers/pending/candidates.json" ]; then
-    PAPER_COUNT=$(python3 -c "import json; data=json.load(open('data/papers/pending/candidates.json')); print(data.get('total_papers', 0))")
+# Check if candidates.jsonl was created
+if [ -f "data/papers/pending/candidates.jsonl" ]; then
+    PAPER_COUNT=$(cd scripts && python3 -c "from pipeline_io import read_records; print(sum(1 for _ in read_records('../data/papers/pending/candidates.jsonl')))")
     echo "✅ Step 1 Result: Found $PAPER_COUNT papers"
-    echo "   File: data/papers/pending/candidates.json"
+    echo "   File: data/papers/pending/candidates.jsonl"
 else
-    echo "❌ Step 1 Failed: candidates.json not created"
+    echo "❌ Step 1 Failed: candidates.jsonl not created"
     echo "   This means arXiv fetch failed"
     exit 1
 fi
@@ -34,22 +34,22 @@ echo ""
 
 # Step 2: Test filter
 echo "🧪 Test 2: Filter and rank papers"
-echo "   Running: python scripts/smart_filter.py --top-n 5"
+echo "   Running: python scripts/smart_filter.py --top-n 5 --seen-file ''"
 echo ""
-python scripts/smart_filter.py --top-n 5
+python scripts/smart_filter.py --top-n 5 --seen-file ''
 STEP2_EXIT=$?
 
 echo ""
 echo "---"
 echo ""
 
-# Check if filtered.json was created
-if [ -f "data/papers/pending/filtered.json" ]; then
-    FILTERED_COUNT=$(python3 -c "import json; data=json.load(open('data/papers/pending/filtered.json')); print(len(data.get('papers', [])))")
+# Check if filtered.jsonl was created
+if [ -f "data/papers/pending/filtered.jsonl" ]; then
+    FILTERED_COUNT=$(cd scripts && python3 -c "from pipeline_io import read_records; print(sum(1 for _ in read_records('../data/papers/pending/filtered.jsonl')))")
     echo "✅ Step 2 Result: $FILTERED_COUNT papers selected"
-    echo "   File: data/papers/pending/filtered.json"
+    echo "   File: data/papers/pending/filtered.jsonl"
 else
-    echo "❌ Step 2 Failed: filtered.json not created"
+    echo "❌ Step 2 Failed: filtered.jsonl not created"
     exit 1
 fi
 
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Canonical YAML serializer for the paper data files.
+
+Every writer of papers.yaml, the year shards and stats.yaml goes through
+dump(), so the same data always produces the same bytes:
+
+- the C emitter (libyaml) when PyYAML was built with it, except for the
+  rare block with characters libyaml would escape (emoji)
+- fixed section and paper key order (unknown keys follow, sorted)
+- fixed line width and indentation, multi-line text as literal blocks
+- no anchors/aliases, so output never depends on object identity
+- each paper is a self-contained "- id: ..." block at column 0
+
+Because paper blocks are independent, patch() can re-emit only the papers
+that changed and copy every other block from the existing file text.
+"""
+
+from typing import Dict, List, Optional
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as _FastDumper
+except ImportError:  # PyYAML built without libyaml
+    _FastDumper = None
+
+
+LINE_WIDTH = 100
+INDENT = 2
+
+# Top-level keys of papers.yaml, the shard manifest and stats.yaml
+SECTION_ORDER = (
+    'version', 'total_papers', 'starred_papers', 'total_citations', 'last_updated',
+    'metadata', 'categories', 'automation', 'shards', 'years',
+    'papers', 'recent_papers', 'citation_history',
+)
+
+PAPER_KEY_ORDER = (
+    'id', 'title', 'authors', 'venue', 'year', 'month', 'categories', 'type',
+    'abstract', 'links', 'arxiv_id', 'citation_count', 'starred', 'date_added',
+    'notes', 'ai_summary', 'key_contributions', 'relevance_score',
+    'influential_citation_count', 'citation_last_checked', 'mindmap',
+)
+
+CATEGORY_KEY_ORDER = ('id', 'name', 'description', 'color', 'icon')
+
+LINK_KEY_ORDER = ('paper', 'code', 'project', 'video')
+
+# Sections whose list items are papers
+PAPER_LIST_SECTIONS = ('papers', 'recent_papers')
+
+
+def _represent_str(dumper, data):
+    style = '|' if '\n' in data else None
+    return dumper.represent_scalar('tag:yaml.org,2002:str', data, style=style)
+
+
+def _canonical_dumper(base):
+    """Safe dumper without aliases that writes multi-line text as literal blocks."""
+    dumper = type(f'Canonical{base.__name__}', (base,),
+                  {'ignore_aliases': lambda self, data: True})
+    dumper.add_representer(str, _represent_str)
+    return dumper
+
+
+CanonicalDumper = _canonical_dumper(yaml.SafeDumper)
+FastCanonicalDumper = _canonical_dumper(_FastDumper) if _FastDumper else None
+
+
+def _ordered(mapping: Dict, order) -> Dict:
+    """Copy of mapping with the known keys first (in order), the rest sorted."""
+    result = {key: mapping[key] for key in order if key in mapping}
+    if len(result) != len(mapping):
+        for key in sorted((k for k in mapping if k not in result), key=str):
+            result[key] = mapping[key]
+    return result
+
+
+def canonical_paper(paper: Dict) -> Dict:
+    """Paper dict in canonical key order."""
+    paper = _ordered(paper, PAPER_KEY_ORDER)
+    if isinstance(paper.get('links'), dict):
+        paper['links'] = _ordered(paper['links'], LINK_KEY_ORDER)
+    return paper
+
+
+def canonical_document(data: Dict) -> Dict:
+    """Document in canonical section and key order."""
+    data = _ordered(data, SECTION_ORDER)
+    for name in PAPER_LIST_SECTIONS:
+        if isinstance(data.get(name), list):
+            data[name] = [canonical_paper(p) if isinstance(p, dict) else p
+                          for p in data[name]]
+    if isinstance(data.get('categories'), list):
+        data['categories'] = [_ordered(c, CATEGORY_KEY_ORDER) if isinstance(c, dict) else c
+                              for c in data['categories']]
+    return data
+
+
+def _emit(data) -> str:
+    options = dict(allow_unicode=True, sort_keys=False, default_flow_style=False,
+                   width=LINE_WIDTH, indent=INDENT)
+    if FastCanonicalDumper is not None:
+        text = yaml.dump(data, Dumper=FastCanonicalDumper, **options)
+        # libyaml escapes characters outside the BMP (emoji icons); the Python
+        # emitter writes them as-is. Same data, same choice, same bytes.
+        if '\\U' not in text:
+            return text
+    return yaml.dump(data, Dumper=CanonicalDumper, **options)
+
+
+def dump(data: Dict) -> str:
+    """
+    Serialize a document canonically.
+
+    Args:
+        data: Document (papers.yaml, a shard, the manifest or stats.yaml)
+
+    Returns:
+        YAML text
+    """
+    parts = []
+    for name, value in canonical_document(data).items():
+        if name == 'papers' and isinstance(value, list) and value:
+            # One emitter run per paper is faster than one for the whole list
+            parts.append('papers:\n')
+            parts.extend(_emit([paper]) for paper in value)
+        else:
+            parts.append(_emit({name: value}))
+    return ''.join(parts)
+
+
+def dump_paper(paper: Dict) -> str:
+    """Serialize one paper as its "- id: ..." block."""
+    return _emit([canonical_paper(paper)])
+
+
+def _split_sections(text: str) -> Optional[Dict[str, str]]:
+    """Split canonical YAML text into top-level sections (name -> text)."""
+    sections: Dict[str, str] = {}
+    name = None
+    lines: List[str] = []
+    for line in text.splitlines(keepends=True):
+        if line[:1] not in ('', ' ', '-', '\n'):
+            if name is not None:
+                sections[name] = ''.join(lines)
+            name = line.split(':', 1)[0]
+            if name.startswith(("'", '"')) or name in sections:
+                return None
+            lines = []
+        elif name is None:
+            return None
+        lines.append(line)
+    if name is not None:
+        sections[name] = ''.join(lines)
+    return sections
+
+
+def _split_items(section_text: str) -> List[str]:
+    """Split a top-level sequence section into its "- ..." item blocks."""
+    body = section_text.split('\n', 1)[1] if '\n' in section_text else ''
+    blocks: List[str] = []
+    for line in body.splitlines(keepends=True):
+        if line.startswith('- ') or line == '-\n' or not blocks:
+            blocks.append(line)
+        else:
+            blocks[-1] += line
+    return blocks
+
+
+def patch(old_text: str, old_data: Dict, data: Dict) -> str:
+    """
+    Serialize data, reusing the unchanged parts of a previous dump().
+
+    Papers equal to their counterpart (same ID) in old_data, and sections
+    equal to the old ones, are copied from old_text instead of re-emitted.
+    The result is byte-identical to dump(data).
+
+    Args:
+        old_text: File text previously produced by dump(old_data)
+        old_data: Document old_text was produced from
+        data: Document to serialize
+
+    Returns:
+        YAML text
+    """
+    sections = _split_sections(old_text)
+    if sections is None or list(sections) != list(_ordered(old_data or {}, SECTION_ORDER)):
+        return dump(data)
+
+    old_papers = old_data.get('papers')
+    reusable: Dict = {}
+    if isinstance(old_papers, list) and old_papers:
+        blocks = _split_items(sections['papers'])
+        if len(blocks) != len(old_papers):
+            return dump(data)
+        for paper, block in zip(old_papers, blocks):
+            if isinstance(paper, dict):
+                reusable.setdefault(paper.get('id'), (paper, block))
+
+    parts = []
+    for name, value in _ordered(data, SECTION_ORDER).items():
+        if name == 'papers' and isinstance(value, list) and value:
+            parts.append('papers:\n')
+            for paper in value:
+                old = reusable.get(paper.get('id')) if isinstance(paper, dict) else None
+                parts.append(old[1] if old and old[0] == paper else dump_paper(paper))
+        elif name in sections and old_data.get(name) == value:
+            parts.append(sections[name])
+        else:
+            parts.append(dump({name: value}))
+    return ''.join(parts)
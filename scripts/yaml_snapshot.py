@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Cached YAML loading for papers.yaml.
+
+Parsing papers.yaml in Python dominates the startup time of most scripts.
+load_yaml() keeps a pickle snapshot of the parsed document next to the YAML
+file (papers.yaml -> papers.snapshot.pickle), keyed by the file's size,
+mtime and content hash, and only re-parses the YAML when it actually changed.
+"""
+
+import os
+import pickle
+import hashlib
+from typing import Any, Dict, Optional
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_path(yaml_path: str) -> str:
+    """Return the snapshot path that belongs to a YAML file."""
+    root, _ = os.path.splitext(yaml_path)
+    return root + '.snapshot.pickle'
+
+
+def _content_hash(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _read_header(path: str) -> Optional[Dict]:
+    try:
+        with open(path, 'rb') as f:
+            header = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+    if not isinstance(header, dict) or header.get('version') != SNAPSHOT_VERSION:
+        return None
+    return header
+
+
+def _read_data(path: str) -> Any:
+    with open(path, 'rb') as f:
+        pickle.load(f)  # header
+        return pickle.load(f)
+
+
+def _write_snapshot(path: str, header: Dict, data: Any):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        # A missing snapshot only costs a re-parse next time
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def save_snapshot(yaml_path: str, data: Any):
+    """
+    Store the parsed form of a YAML file that was just written.
+
+    Args:
+        yaml_path: YAML file whose current contents correspond to data
+        data: Parsed document
+    """
+    stat = os.stat(yaml_path)
+    header = {
+        'version': SNAPSHOT_VERSION,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': _content_hash(yaml_path),
+    }
+    _write_snapshot(snapshot_path(yaml_path), header, data)
+
+
+def load_yaml(yaml_path: str, use_snapshot: bool = True) -> Any:
+    """
+    Load a YAML file, reusing the pickle snapshot when the file is unchanged.
+
+    Args:
+        yaml_path: Path to the YAML file
+        use_snapshot: Read and maintain the snapshot (False: plain parse)
+
+    Returns:
+        Parsed YAML document
+    """
+    if not use_snapshot:
+        with open(yaml_path, 'r', encoding='utf-8') as f:
+            return yaml.load(f, Loader=SafeLoader)
+
+    cache_path = snapshot_path(yaml_path)
+    stat = os.stat(yaml_path)
+    header = _read_header(cache_path)
+
+    if header and header['size'] == stat.st_size and header['mtime_ns'] == stat.st_mtime_ns:
+        return _read_data(cache_path)
+
+    digest = _content_hash(yaml_path)
+    if header and header['size'] == stat.st_size and header['sha256'] == digest:
+        # Touched but unchanged (e.g. git checkout): refresh the key only
+        data = _read_data(cache_path)
+    else:
+        with open(yaml_path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=SafeLoader)
+
+    header = {
+        'version': SNAPSHOT_VERSION,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': digest,
+    }
+    _write_snapshot(cache_path, header, data)
+    return data
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for papers.yaml.
+
+yaml.safe_load materializes the whole document, including the
+citation_history block that grows every week. The functions here walk the
+YAML event stream instead (libyaml parser when available) and build only
+the values the caller asks for:
+
+- iter_papers() yields one paper mapping at a time
+- iter_document() yields every top-level section in file order, with the
+  large sequences (papers, citation_history) as lazy item iterators
+- load_sections() returns the top-level sections except the skipped ones
+
+PaperStore imports papers.yaml through iter_document() and iter_papers(),
+inserting one paper at a time.
+
+Skipped sections are consumed event by event without constructing any
+Python objects, so read-only consumers run with memory bounded by the size
+of a single paper.
+"""
+
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import yaml
+from yaml.events import (
+    AliasEvent, DocumentStartEvent, MappingEndEvent, MappingStartEvent, ScalarEvent,
+    SequenceEndEvent, SequenceStartEvent,
+)
+from yaml.nodes import ScalarNode
+
+from paper_shards import shard_paths
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+
+class _EventReader:
+    """Builds Python values from a SafeLoader event stream."""
+
+    def __init__(self, stream):
+        self.loader = SafeLoader(stream)
+        self.anchors: Dict[str, Any] = {}
+
+    def close(self):
+        self.loader.dispose()
+
+    def next_event(self):
+        return self.loader.get_event()
+
+    def peek(self):
+        return self.loader.peek_event()
+
+    def _scalar(self, event: ScalarEvent) -> Any:
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = self.loader.resolve(ScalarNode, event.value, event.implicit)
+        node = ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style)
+        constructor = self.loader.yaml_constructors.get(tag)
+        if constructor is None:
+            constructor = self.loader.yaml_constructors[None]
+        return constructor(self.loader, node)
+
+    def build(self) -> Any:
+        """Consume one complete value from the stream and return it."""
+        event = self.next_event()
+
+        if isinstance(event, AliasEvent):
+            return self.anchors[event.anchor]
+
+        if isinstance(event, ScalarEvent):
+            value = self._scalar(event)
+
+        elif isinstance(event, SequenceStartEvent):
+            value = []
+            if event.anchor:
+                self.anchors[event.anchor] = value
+            while not isinstance(self.peek(), SequenceEndEvent):
+                value.append(self.build())
+            self.next_event()
+            return value
+
+        elif isinstance(event, MappingStartEvent):
+            value = {}
+            if event.anchor:
+                self.anchors[event.anchor] = value
+            while not isinstance(self.peek(), MappingEndEvent):
+                key = self.build()
+                value[key] = self.build()
+            self.next_event()
+            return value
+
+        else:
+            raise yaml.YAMLError(f"Unexpected YAML event: {event}")
+
+        if event.anchor:
+            self.anchors[event.anchor] = value
+        return value
+
+    def skip(self):
+        """Consume one complete value without constructing it."""
+        depth = 0
+        while True:
+            event = self.next_event()
+            if isinstance(event, (SequenceStartEvent, MappingStartEvent)):
+                depth += 1
+            elif isinstance(event, (SequenceEndEvent, MappingEndEvent)):
+                depth -= 1
+            if depth == 0:
+                return
+
+    def top_level(self) -> Iterator[str]:
+        """
+        Walk the keys of the top-level mapping.
+
+        The caller must consume (build or skip) the value after each key.
+        """
+        self.next_event()  # StreamStart
+        if not isinstance(self.peek(), DocumentStartEvent):
+            return
+        self.next_event()
+        if not isinstance(self.peek(), MappingStartEvent):
+            return
+        self.next_event()
+        while not isinstance(self.peek(), MappingEndEvent):
+            yield self.build()
+
+
+def iter_section_items(path: str, section: str = 'papers') -> Iterator[Any]:
+    """
+    Yield the items of a top-level sequence one by one.
+
+    Args:
+        path: YAML file
+        section: Top-level key holding a sequence
+
+    Yields:
+        Each item of the sequence
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _EventReader(f)
+        try:
+            for key in reader.top_level():
+                if key != section or not isinstance(reader.peek(), SequenceStartEvent):
+                    reader.skip()
+                    continue
+                reader.next_event()
+                while not isinstance(reader.peek(), SequenceEndEvent):
+                    yield reader.build()
+                return
+        finally:
+            reader.close()
+
+
+def iter_papers(path: str) -> Iterator[Dict]:
+    """Yield the papers of a papers.yaml file one at a time (from its year shards if sharded)."""
+    paths = shard_paths(path)
+    if paths is None:
+        yield from iter_section_items(path, 'papers')
+        return
+
+    for shard_path in paths:
+        if os.path.exists(shard_path):
+            yield from iter_section_items(shard_path, 'papers')
+
+
+def iter_document(path: str, streamed: Iterable[str] = ('papers', 'citation_history')
+                  ) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (name, value) for every top-level section of a YAML file, in order.
+
+    Sequence sections named in streamed are yielded as iterators over their
+    items. Consume such an iterator before asking for the next section;
+    items left unconsumed are skipped without being constructed.
+
+    Args:
+        path: YAML file
+        streamed: Sections to stream item by item
+
+    Yields:
+        (section name, section value or item iterator) pairs in file order
+    """
+    streamed = set(streamed)
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _EventReader(f)
+        try:
+            for key in reader.top_level():
+                if key not in streamed or not isinstance(reader.peek(), SequenceStartEvent):
+                    yield key, reader.build()
+                    continue
+
+                reader.next_event()
+                state = {'done': False}
+
+                def items() -> Iterator[Any]:
+                    while not isinstance(reader.peek(), SequenceEndEvent):
+                        yield reader.build()
+                    reader.next_event()
+                    state['done'] = True
+
+                section = items()
+                yield key, section
+                if not state['done']:
+                    section.close()
+                    while not isinstance(reader.peek(), SequenceEndEvent):
+                        reader.skip()
+                    reader.next_event()
+        finally:
+            reader.close()
+
+
+def top_level_keys(path: str) -> List[str]:
+    """Names of the top-level sections of a YAML file (values are skipped, not built)."""
+    keys = []
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _EventReader(f)
+        try:
+            for key in reader.top_level():
+                keys.append(key)
+                reader.skip()
+        finally:
+            reader.close()
+    return keys
+
+
+def iter_sections(path: str, skip: Iterable[str] = ('citation_history',),
+                  include: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (name, value) for the top-level sections of a YAML file.
+
+    Args:
+        path: YAML file
+        skip: Sections to skip without constructing them
+        include: If given, only these sections are constructed
+
+    Yields:
+        (section name, section value) pairs in file order
+    """
+    skip = set(skip)
+    include = set(include) if include is not None else None
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _EventReader(f)
+        try:
+            for key in reader.top_level():
+                if key in skip or (include is not None and key not in include):
+                    reader.skip()
+                else:
+                    yield key, reader.build()
+        finally:
+            reader.close()
+
+
+def load_sections(path: str, skip: Iterable[str] = ('citation_history',),
+                  include: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Load a YAML document without the skipped top-level sections."""
+    return dict(iter_sections(path, skip=skip, include=include))
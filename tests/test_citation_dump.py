@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for citation_dump.py and CitationTracker.import_citation_dump().
+
+The dumps are small gzipped JSON-lines files written to tmp_path in the
+layouts of the Semantic Scholar "papers" dataset and the OpenAlex "works"
+snapshot:
+
+    python -m pytest tests/test_citation_dump.py
+"""
+
+import gzip
+import json
+import os
+import sys
+from typing import Dict, List
+
+import pytest
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from citation_dump import record_counts, scan_dumps  # noqa: E402
+from citation_tracker import CitationTracker  # noqa: E402
+from paper_store import PaperStore  # noqa: E402
+
+
+S2_RECORDS = [
+    # Bulk dataset: lower-case keys, ID under externalids.ArXiv
+    {"corpusid": 1, "externalids": {"ArXiv": "2308.04079", "DOI": "10.1145/3592433"},
+     "title": "3D Gaussian Splatting for Real-Time Radiance Field Rendering",
+     "citationcount": 812, "influentialcitationcount": 95},
+    # Versioned ID
+    {"corpusid": 2, "externalids": {"ArXiv": "1706.03762v5"},
+     "title": "Attention Is All You Need", "citationcount": 120000, "influentialcitationcount": 15000},
+    # Not an arXiv paper
+    {"corpusid": 3, "externalids": {"DOI": "10.1000/xyz"}, "citationcount": 7},
+]
+
+OPENALEX_RECORDS = [
+    # Preprint matched by its arXiv DOI
+    {"id": "https://openalex.org/W1", "doi": "https://doi.org/10.48550/arxiv.2003.08934",
+     "cited_by_count": 9000},
+    # Published version of the same paper, matched by location URL: larger count wins
+    {"id": "https://openalex.org/W2", "doi": "https://doi.org/10.1145/3503250",
+     "cited_by_count": 9500,
+     "locations": [{"landing_page_url": "https://dl.acm.org/doi/10.1145/3503250"},
+                   {"landing_page_url": "https://arxiv.org/abs/2003.08934v2"}]},
+    # A third, smaller duplicate after the larger one must not lower the count
+    {"id": "https://openalex.org/W3", "doi": None, "cited_by_count": 12,
+     "primary_location": {"pdf_url": "https://arxiv.org/pdf/2003.08934v1.pdf"}},
+    # Only a location URL
+    {"id": "https://openalex.org/W4", "doi": "https://doi.org/10.1109/cvpr.2022.01042",
+     "cited_by_count": 4000,
+     "best_oa_location": {"landing_page_url": "https://arxiv.org/abs/2112.10752"}},
+    # Not an arXiv paper
+    {"id": "https://openalex.org/W5", "doi": "https://doi.org/10.1000/abc", "cited_by_count": 3},
+]
+
+# Truncated line that mentions arXiv, so it gets past the prefilter
+MALFORMED_LINE = '{"id": "https://openalex.org/W6", "doi": "https://doi.org/10.48550/arxiv.2401.00001", "cited_by'
+
+
+def write_dump(path: str, records: List[Dict], extra_lines: List[str] = ()) -> str:
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+        for line in extra_lines:
+            f.write(line + '\n')
+    return path
+
+
+@pytest.fixture
+def dumps(tmp_path):
+    s2 = write_dump(str(tmp_path / 's2-papers-0.jsonl.gz'), S2_RECORDS)
+    openalex = write_dump(str(tmp_path / 'openalex-works-0.jsonl.gz'), OPENALEX_RECORDS, [MALFORMED_LINE])
+    return s2, openalex
+
+
+def test_record_counts_s2():
+    assert record_counts(S2_RECORDS[0]) == ("2308.04079", 812, 95)
+    assert record_counts(S2_RECORDS[1], 's2') == ("1706.03762", 120000, 15000)
+    assert record_counts(S2_RECORDS[2]) is None
+    # Graph API responses use camelCase
+    api_record = {"externalIds": {"ArXiv": "2308.04079"}, "citationCount": 5, "influentialCitationCount": 1}
+    assert record_counts(api_record) == ("2308.04079", 5, 1)
+
+
+def test_record_counts_openalex():
+    assert record_counts(OPENALEX_RECORDS[0]) == ("2003.08934", 9000, None)
+    assert record_counts(OPENALEX_RECORDS[1], 'openalex') == ("2003.08934", 9500, None)
+    assert record_counts(OPENALEX_RECORDS[2]) == ("2003.08934", 12, None)
+    assert record_counts(OPENALEX_RECORDS[3]) == ("2112.10752", 4000, None)
+    assert record_counts(OPENALEX_RECORDS[4]) is None
+
+
+def test_scan_dumps(dumps):
+    wanted = {"2308.04079", "1706.03762", "2003.08934", "2112.10752", "2401.00001", "9999.99999"}
+    stats = {}
+    found = scan_dumps(dumps, wanted, stats=stats)
+
+    assert found == {
+        "2308.04079": (812, 95),
+        "1706.03762": (120000, 15000),
+        "2003.08934": (9500, None),
+        "2112.10752": (4000, None),
+    }
+    assert stats == {'records': len(S2_RECORDS) + len(OPENALEX_RECORDS) + 1, 'malformed': 1}
+
+
+def test_scan_dumps_keeps_only_wanted(dumps):
+    assert scan_dumps(dumps, {"2112.10752"}) == {"2112.10752": (4000, None)}
+
+
+def test_duplicate_keeps_larger_influential_count(tmp_path):
+    path = write_dump(str(tmp_path / 'dup.jsonl.gz'), [
+        {"externalids": {"ArXiv": "2308.04079v2"}, "citationcount": 900, "influentialcitationcount": 80},
+        {"externalids": {"ArXiv": "2308.04079"}, "citationcount": 812, "influentialcitationcount": 95},
+    ])
+    assert scan_dumps([path], {"2308.04079"}) == {"2308.04079": (900, 95)}
+
+
+def test_import_citation_dump(tmp_path, dumps):
+    papers_yaml = tmp_path / 'papers.yaml'
+    papers_yaml.write_text(yaml.safe_dump({
+        'metadata': {'last_updated': '2025-11-16', 'total_papers': 4},
+        'categories': [{'id': 'nerf', 'name': 'Neural Radiance Fields'}],
+        'papers': [
+            {'id': 'gaussian-splatting', 'title': '3D Gaussian Splatting', 'arxiv_id': '2308.04079v1',
+             'year': 2023, 'categories': ['nerf'], 'citation_count': 700, 'influential_citation_count': 90},
+            {'id': 'nerf', 'title': 'NeRF', 'arxiv_id': '2003.08934', 'year': 2020,
+             'categories': ['nerf'], 'citation_count': 8000, 'influential_citation_count': 1500},
+            {'id': 'not-in-dump', 'title': 'Unknown', 'arxiv_id': '2401.00001', 'year': 2024,
+             'categories': ['nerf'], 'citation_count': 3},
+            {'id': 'no-arxiv', 'title': 'Journal only', 'year': 2019, 'categories': ['nerf']},
+        ],
+    }, sort_keys=False), encoding='utf-8')
+
+    tracker = CitationTracker(api_delay=0, http_cache='off')
+    stats = tracker.import_citation_dump(str(papers_yaml), list(dumps))
+
+    assert stats['total'] == 4
+    assert stats['updated'] == 2
+    assert stats['failed'] == 1
+    assert stats['skipped'] == 1
+
+    store = PaperStore(str(papers_yaml))
+    splatting = store.get_paper('gaussian-splatting')
+    assert splatting['citation_count'] == 812
+    assert splatting['influential_citation_count'] == 95
+
+    # Matched only in OpenAlex: the larger duplicate wins, influential count is kept
+    nerf = store.get_paper('nerf')
+    assert nerf['citation_count'] == 9500
+    assert nerf['influential_citation_count'] == 1500
+
+    unknown = store.get_paper('not-in-dump')
+    assert unknown['citation_count'] == 3
+    assert 'citation_last_checked' not in unknown
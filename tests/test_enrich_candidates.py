@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests for enrich_candidates.py against a local Semantic Scholar stand-in.
+
+The stand-in serves POST /paper/batch from http.server on localhost and is
+passed to SemanticScholarEnricher as its API URL, so no request leaves the
+machine:
+
+    python -m pytest tests/test_enrich_candidates.py
+"""
+
+import copy
+import json
+import os
+import socket
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from enrich_candidates import SemanticScholarEnricher  # noqa: E402
+
+
+# arXiv ID (without version) -> Semantic Scholar record
+KNOWN_PAPERS = {
+    "2308.04079": {
+        "venue": "ACM Transactions on Graphics",
+        "publicationVenue": {"name": "ACM Transactions on Graphics"},
+        "year": 2023,
+        "citationCount": 812,
+        "influentialCitationCount": 95,
+        "authors": [{"name": "Bernhard Kerbl", "hIndex": 12},
+                    {"name": "George Drettakis", "hIndex": 48}],
+    },
+    "2003.08934": {
+        "venue": "",
+        "publicationVenue": {"name": "ECCV"},
+        "year": 2020,
+        "citationCount": 9000,
+        "influentialCitationCount": 1500,
+        "authors": [{"name": "Ben Mildenhall", "hIndex": None}],
+    },
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers POST /paper/batch like the Graph API (null for unknown IDs)."""
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        server.requests.append({'path': self.path, 'ids': body['ids']})
+
+        if server.rate_limited > 0:
+            server.rate_limited -= 1
+            self._reply(429, {'message': 'Too Many Requests'}, {'Retry-After': '0'})
+            return
+        if not self.path.startswith('/paper/batch'):
+            self._reply(404, {'error': 'Not found'})
+            return
+
+        records = [KNOWN_PAPERS.get(paper_id.split(':', 1)[-1]) for paper_id in body['ids']]
+        self._reply(200, records)
+
+    def _reply(self, status: int, payload, headers: Dict[str, str] = None):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    """Stand-in server on a free localhost port (rate_limited = 429s to send first)."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.requests = []
+    server.rate_limited = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_enricher(api_url: str, **kwargs) -> SemanticScholarEnricher:
+    return SemanticScholarEnricher(api_url=api_url, api_delay=0, http_cache='off', **kwargs)
+
+
+def candidates() -> List[Dict]:
+    return [
+        {"arxiv_id": "2308.04079v1", "title": "3D Gaussian Splatting for Real-Time Radiance Field Rendering"},
+        {"arxiv_id": "2511.99999v1", "title": "A paper Semantic Scholar has not indexed yet"},
+        {"arxiv_id": "2003.08934v2", "title": "NeRF: Representing Scenes as Neural Radiance Fields"},
+        {"title": "A candidate without an arXiv ID"},
+    ]
+
+
+def test_enrich_attaches_s2(stand_in):
+    enricher = make_enricher(f"http://127.0.0.1:{stand_in.server_port}")
+    papers = list(enricher.enrich(candidates()))
+
+    s2 = papers[0]["s2"]
+    assert s2["venue"] == "ACM Transactions on Graphics"
+    assert s2["citation_count"] == 812
+    assert s2["influential_citation_count"] == 95
+    assert s2["max_author_h_index"] == 48
+    assert s2["author_h_indices"] == [12, 48]
+    # Empty venue falls back to the publication venue; missing h-index counts as 0
+    assert papers[2]["s2"]["venue"] == "ECCV"
+    assert papers[2]["s2"]["max_author_h_index"] == 0
+
+    # One batch request, versions stripped, papers without an ID not sent
+    assert len(stand_in.requests) == 1
+    assert stand_in.requests[0]["path"].startswith("/paper/batch")
+    assert stand_in.requests[0]["ids"] == ["arXiv:2308.04079", "arXiv:2511.99999", "arXiv:2003.08934"]
+
+
+def test_unknown_papers_pass_through_unchanged(stand_in):
+    enricher = make_enricher(f"http://127.0.0.1:{stand_in.server_port}")
+    original = candidates()
+    papers = list(enricher.enrich(copy.deepcopy(original)))
+
+    assert [p.get("arxiv_id") for p in papers] == [p.get("arxiv_id") for p in original]
+    assert papers[1] == original[1]
+    assert papers[3] == original[3]
+
+
+def test_batches_split_by_batch_size(stand_in):
+    enricher = make_enricher(f"http://127.0.0.1:{stand_in.server_port}", batch_size=2)
+    papers = list(enricher.enrich(candidates()))
+
+    assert [len(request["ids"]) for request in stand_in.requests] == [2, 1]
+    assert "s2" in papers[0] and "s2" in papers[2]
+
+
+def test_rate_limited_batch_is_retried(stand_in):
+    stand_in.rate_limited = 2
+    enricher = make_enricher(f"http://127.0.0.1:{stand_in.server_port}")
+    papers = list(enricher.enrich(candidates()))
+
+    assert len(stand_in.requests) == 3
+    assert papers[0]["s2"]["citation_count"] == 812
+
+
+def test_unreachable_api_passes_papers_through():
+    # Reserve a free port, then close it so nothing listens there
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    enricher = make_enricher(f"http://127.0.0.1:{port}")
+    original = candidates()
+    papers = list(enricher.enrich(copy.deepcopy(original)))
+
+    assert papers == original